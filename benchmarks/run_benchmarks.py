@@ -0,0 +1,351 @@
+"""
+Benchmarks of generators, profilers, get_fake_data_for_insertion and execute_insertion (into a local SQLite database)
+on synthetic profiles of configurable width and cardinality. Concurrent writers are measured against a DBAPI wrapping
+SQLite which adds latency to every statement, as a network round trip to a remote database would.
+
+Every case runs in a separate process, so peak RSS is measured per case. Results are written into a JSON file
+and can be compared with a JSON baseline: the run fails if throughput of a case falls by more than the threshold.
+
+    python benchmarks/run_benchmarks.py --rows 200000 --width 50 --output results.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.2
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+from datetime import date, datetime
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlite3
+import sqlalchemy
+from loguru import logger
+from numpy.random import default_rng
+from pandas import Series, to_datetime
+from fake_data_generator.columns_generator import get_columns_info_with_set_generators, get_fake_data_for_insertion
+from fake_data_generator.columns_generator.key_index import KeyIndexWriter
+from fake_data_generator.columns_generator.batch import ColumnData
+from fake_data_generator.columns_generator.sketches import get_column_profiles
+from fake_data_generator.columns_generator.info_for_columns import \
+    get_info_for_categorical_column, get_info_for_continuous_column, get_info_for_string_column, DENSITY_ESTIMATIONS
+from fake_data_generator.sources_formats.helper_functions import \
+    get_create_query, create_table_if_not_exists, execute_insertion
+
+DEFAULT_THRESHOLD = 0.2
+COLUMN_KINDS = ('categorical_string', 'categorical_int', 'continuous_bigint', 'continuous_decimal',
+                'continuous_date', 'continuous_timestamp', 'string', 'unique')
+GENERATOR_COLUMN_KINDS = COLUMN_KINDS + ('string_xeger',)
+
+
+def get_synthetic_column_info_dict(column_kind, cardinality):
+    """
+    Function that returns the profile (dict of get_as_dict) of a synthetic column of the given kind.
+    """
+    rng = default_rng(len(column_kind))
+    frequencies = rng.zipf(1.5, cardinality).astype(float)
+    probabilities = (frequencies / frequencies.sum()).tolist()
+    if column_kind == 'categorical_string':
+        return {'data_type': 'string', 'type': 'CATEGORICAL', 'values': [f'value_{i}' for i in range(cardinality)],
+                'probabilities': probabilities}
+    if column_kind == 'categorical_int':
+        return {'data_type': 'int', 'type': 'CATEGORICAL', 'values': list(range(cardinality)), 'probabilities': probabilities}
+    if column_kind == 'string':
+        return {'data_type': 'string', 'type': 'STRING', 'common_regex': '[A-Z][A-Z]-' + '[0-9]' * 6 + '[a-z]' * 4,
+                'string_copy_of': None, 'lengths': [10, 11, 13], 'length_probabilities': [0.2, 0.3, 0.5]}
+    if column_kind == 'string_xeger':
+        return {'data_type': 'string', 'type': 'STRING', 'common_regex': '[A-Z]{2}-[0-9]{6}[a-z]+', 'string_copy_of': None,
+                'lengths': None, 'length_probabilities': None}
+    if column_kind == 'unique':
+        return {'data_type': 'bigint', 'type': 'UNIQUE', 'method': 'permutation'}
+    data_type, lower_bound, upper_bound = {
+        'continuous_bigint': ('bigint', 0, 10 ** 9),
+        'continuous_decimal': ('decimal(10,2)', -1000, 1000),
+        'continuous_date': ('date', date(2000, 1, 1).toordinal(), date(2030, 1, 1).toordinal()),
+        'continuous_timestamp': ('timestamp', datetime(2000, 1, 1).timestamp(), datetime(2030, 1, 1).timestamp()),
+    }[column_kind]
+    bounds = [lower_bound + (upper_bound - lower_bound) * i / 100 for i in range(101)]
+    interval_probabilities = rng.random(100)
+    return {'data_type': data_type, 'type': 'CONTINUES', 'intervals': list(zip(bounds[:-1], bounds[1:])),
+            'probabilities': (interval_probabilities / interval_probabilities.sum()).tolist(),
+            'date_flag': False}
+
+
+def get_synthetic_profile(width, cardinality):
+    """
+    Function that returns the profile of a synthetic table of width columns of all kinds in turn.
+    """
+    return {f'{COLUMN_KINDS[i % len(COLUMN_KINDS)]}_{i}': get_synthetic_column_info_dict(COLUMN_KINDS[i % len(COLUMN_KINDS)], cardinality)
+            for i in range(width)}
+
+
+def get_synthetic_values(column_kind, number_of_rows, cardinality):
+    """
+    Function that returns Series of synthetic source values (with 5% of nulls) for profilers.
+    """
+    rng = default_rng(0)
+    if column_kind == 'categorical':
+        values = Series(rng.zipf(1.5, number_of_rows) % cardinality).map(lambda x: f'value_{x}')
+    elif column_kind == 'int':
+        values = Series(rng.lognormal(10, 2, number_of_rows).astype('int64'))
+    elif column_kind == 'float':
+        values = Series(rng.normal(0, 100, number_of_rows).round(2))
+    elif column_kind == 'date':
+        values = Series(to_datetime(rng.integers(10000, 20000, number_of_rows), unit='D').date)
+    elif column_kind == 'datetime':
+        values = Series(to_datetime(rng.integers(10 ** 9, 2 * 10 ** 9, number_of_rows), unit='s'))
+    else:
+        values = Series([f'{a}-{b:06d}' for a, b in zip(rng.choice(['AB', 'CD', 'EF'], number_of_rows).tolist(),
+                                                         rng.integers(0, 10 ** 6, number_of_rows).tolist())])
+    values = values.astype(object)
+    values[rng.random(number_of_rows) < 0.05] = None
+    return values
+
+
+def get_peak_rss_in_megabytes():
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / 2 ** 20 if platform.system() == 'Darwin' else peak_rss / 2 ** 10
+
+
+def get_result(number_of_rows, seconds, column_seconds=None):
+    result = {'rows_per_second': number_of_rows / seconds if seconds > 0 else float('inf'),
+              'seconds': seconds,
+              'peak_rss_mb': get_peak_rss_in_megabytes()}
+    if column_seconds is not None:
+        result['column_seconds'] = column_seconds
+    return result
+
+
+def run_generator_case(column_info_dict, number_of_rows, batch_size):
+    column_info = get_columns_info_with_set_generators({'column': column_info_dict})[0]
+    generator = column_info.get_generator()
+    start = time.perf_counter()
+    for batch_start in range(0, number_of_rows, batch_size):
+        generator.send(min(batch_size, number_of_rows - batch_start))
+    return get_result(number_of_rows, time.perf_counter() - start)
+
+
+def run_foreign_key_case(number_of_rows, batch_size, cardinality, skew):
+    with tempfile.TemporaryDirectory() as directory:
+        key_index_path = os.path.join(directory, 'keys')
+        with KeyIndexWriter(key_index_path) as key_index_writer:
+            key_index_writer.add(ColumnData(default_rng(0).permutation(cardinality)))
+        return run_generator_case({'data_type': 'bigint', 'type': 'FOREIGN_KEY', 'key_index_path': key_index_path, 'skew': skew},
+                                  number_of_rows, batch_size)
+
+
+def run_profiler_case(profiler_name, number_of_rows, cardinality):
+    if profiler_name == 'categorical':
+        values = get_synthetic_values('categorical', number_of_rows, cardinality)
+        start = time.perf_counter()
+        get_info_for_categorical_column(values)
+    elif profiler_name == 'string':
+        values = get_synthetic_values('string', number_of_rows, cardinality).dropna()
+        start = time.perf_counter()
+        get_info_for_string_column(values)
+    elif profiler_name == 'sketches':
+        values = get_synthetic_values('int', number_of_rows, cardinality)
+        start = time.perf_counter()
+        get_column_profiles([{'column': values}], {'column': 'bigint'})['column'].get_info_for_continuous_column()
+    else:
+        input_data_type, density_estimation = profiler_name.split('_', 1)
+        values = get_synthetic_values(input_data_type, number_of_rows, cardinality)
+        start = time.perf_counter()
+        get_info_for_continuous_column(values, input_data_type, density_estimation=density_estimation)
+    return get_result(number_of_rows, time.perf_counter() - start)
+
+
+def run_fake_data_for_insertion_case(number_of_rows, batch_size, width, cardinality):
+    columns_info_with_set_generators = get_columns_info_with_set_generators(get_synthetic_profile(width, cardinality))
+    column_seconds = {column_info.get_column_name(): 0.0 for column_info in columns_info_with_set_generators}
+    start = time.perf_counter()
+    for batch_start in range(0, number_of_rows, batch_size):
+        output_size = min(batch_size, number_of_rows - batch_start)
+        for column_info in columns_info_with_set_generators:
+            column_start = time.perf_counter()
+            column_info.get_generator().send(output_size)
+            column_seconds[column_info.get_column_name()] += time.perf_counter() - column_start
+    generation_seconds = time.perf_counter() - start
+
+    columns_info_with_set_generators = get_columns_info_with_set_generators(get_synthetic_profile(width, cardinality))
+    start = time.perf_counter()
+    for batch_start in range(0, number_of_rows, batch_size):
+        get_fake_data_for_insertion(min(batch_size, number_of_rows - batch_start), columns_info_with_set_generators)
+    result = get_result(number_of_rows, time.perf_counter() - start, column_seconds)
+    result['generation_only_seconds'] = generation_seconds
+    return result
+
+
+class CursorWithLatency:
+    """
+    Cursor of sqlite3 sleeping for latency seconds before every statement.
+    """
+    def __init__(self, cursor, latency):
+        self.cursor = cursor
+        self.latency = latency
+
+    def execute(self, *args):
+        time.sleep(self.latency)
+        return self.cursor.execute(*args)
+
+    def executemany(self, *args):
+        time.sleep(self.latency)
+        return self.cursor.executemany(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+class ConnectionWithLatency:
+    def __init__(self, path, latency):
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=60)
+        self.latency = latency
+
+    def cursor(self):
+        return CursorWithLatency(self.connection.cursor(), self.latency)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def get_engine(path, latency=None, pool_size=5):
+    if latency is None:
+        return sqlalchemy.create_engine(f'sqlite:///{path}')
+    return sqlalchemy.create_engine('sqlite://', creator=lambda: ConnectionWithLatency(path, latency),
+                                    poolclass=sqlalchemy.pool.QueuePool, pool_size=pool_size)
+
+
+def run_execute_insertion_case(number_of_rows, batch_size, width, cardinality, loader,
+                               latency=None, number_of_writers=1, use_staging_tables=False):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = get_engine(os.path.join(directory, 'benchmark.sqlite'), latency, pool_size=number_of_writers)
+        rich_columns_info_dict = get_synthetic_profile(width, cardinality)
+        create_table_if_not_exists(engine, dest_table_name_with_schema='main.benchmark',
+                                   create_query=get_create_query('main.benchmark', rich_columns_info_dict))
+        columns_info_with_set_generators = get_columns_info_with_set_generators(rich_columns_info_dict)
+        start = time.perf_counter()
+        execute_insertion(engine, 'main.benchmark', number_of_rows, columns_info_with_set_generators, batch_size,
+                          seed=0, loader=loader, number_of_writers=number_of_writers, use_staging_tables=use_staging_tables)
+        seconds = time.perf_counter() - start
+        engine.dispose()
+    return get_result(number_of_rows, seconds)
+
+
+def get_cases(args):
+    """
+    Function that returns dict of names of cases and tuples of functions running them and their arguments.
+    """
+    cases = {}
+    for column_kind in GENERATOR_COLUMN_KINDS:
+        cases[f'generator.{column_kind}'] = (run_generator_case, (get_synthetic_column_info_dict(column_kind, args.cardinality),
+                                                                  args.rows, args.batch_size))
+    cases['generator.nulls'] = (run_generator_case, ({'data_type': 'string'}, args.rows, args.batch_size))
+    cases['generator.current_timestamp'] = (run_generator_case, ({'data_type': 'timestamp', 'type': 'CURRENT_TIMESTAMP'},
+                                                                 args.rows, args.batch_size))
+    cases['generator.foreign_key'] = (run_foreign_key_case, (args.rows, args.batch_size, args.cardinality, None))
+    cases['generator.foreign_key_skewed'] = (run_foreign_key_case, (args.rows, args.batch_size, args.cardinality, 1.1))
+    profiler_names = ['categorical', 'string', 'sketches'] + [f'{input_data_type}_{density_estimation}'
+                                                             for input_data_type in ('int', 'float', 'date', 'datetime')
+                                                             for density_estimation in DENSITY_ESTIMATIONS]
+    for profiler_name in profiler_names:
+        cases[f'profiler.{profiler_name}'] = (run_profiler_case, (profiler_name, args.rows, args.cardinality))
+    cases['get_fake_data_for_insertion'] = (run_fake_data_for_insertion_case, (args.rows, args.batch_size, args.width, args.cardinality))
+    for loader in ('executemany', 'multi_values'):
+        cases[f'execute_insertion.sqlite.{loader}'] = (run_execute_insertion_case, (args.insertion_rows, args.batch_size,
+                                                                                    args.width, args.cardinality, loader))
+    for number_of_writers, use_staging_tables in ((1, False), (4, False), (4, True)):
+        name = f'execute_insertion.latency.writers_{number_of_writers}' + ('.staging' if use_staging_tables else '')
+        cases[name] = (run_execute_insertion_case, (args.insertion_rows, args.batch_size // 10, args.width, args.cardinality,
+                                                    'executemany', args.latency, number_of_writers, use_staging_tables))
+    return {name: case for name, case in cases.items() if args.only is None or any(pattern in name for pattern in args.only)}
+
+
+def remove_logger_handlers():
+    logger.remove()
+
+
+def run_case_in_new_process(function, arguments):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn'), initializer=remove_logger_handlers) as executor:
+        return executor.submit(function, *arguments).result()
+
+
+def run_benchmarks(args):
+    results = {}
+    for name, (function, arguments) in get_cases(args).items():
+        repeated_results = [run_case_in_new_process(function, arguments) for _ in range(args.repeat)]
+        results[name] = max(repeated_results, key=lambda result: result['rows_per_second'])
+        print(f'{name:45} {results[name]["rows_per_second"]:>14,.0f} rows/s {results[name]["peak_rss_mb"]:>9.1f} MB')
+        if 'column_seconds' in results[name]:
+            slowest_columns = sorted(results[name]['column_seconds'].items(), key=lambda item: -item[1])[:5]
+            for column_name, seconds in slowest_columns:
+                print(f'    {column_name:41} {seconds:>10.3f} s')
+    return results
+
+
+def get_regressions(results, baseline_results, threshold):
+    """
+    Function that returns list of (name of case, baseline rows/sec, current rows/sec) for cases
+    whose throughput fell by more than the threshold (share of the baseline throughput).
+    """
+    regressions = []
+    for name, baseline_result in baseline_results.items():
+        if name not in results:
+            continue
+        if results[name]['rows_per_second'] < baseline_result['rows_per_second'] * (1 - threshold):
+            regressions.append((name, baseline_result['rows_per_second'], results[name]['rows_per_second']))
+    return regressions
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Benchmarks of fake_data_generator.')
+    parser.add_argument('--rows', type=int, default=200000, help='Number of rows generated or profiled by a case')
+    parser.add_argument('--insertion-rows', type=int, default=50000, help='Number of rows inserted into SQLite')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--width', type=int, default=40, help='Number of columns of the synthetic table')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Latency in seconds added to every statement in execute_insertion.latency cases')
+    parser.add_argument('--cardinality', type=int, default=1000, help='Number of distinct values of categorical columns')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs of a case, the best one is reported')
+    parser.add_argument('--only', nargs='*', help='Run only cases whose names contain one of these substrings')
+    parser.add_argument('--output', help='JSON file of results')
+    parser.add_argument('--baseline', help='JSON file of baseline results to compare with')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Maximum allowed fall of throughput as a share of the baseline')
+    parser.add_argument('--save-baseline', help='Write results as a new baseline into this JSON file')
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    logger.remove()
+    params = {name: value for name, value in vars(args).items()
+              if name in ('rows', 'insertion_rows', 'batch_size', 'width', 'cardinality', 'latency', 'repeat')}
+    results = run_benchmarks(args)
+    report = {'params': params, 'python': platform.python_version(), 'results': results}
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            with open(path, 'w') as file:
+                json.dump(report, file, indent=2)
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline, 'r') as file:
+        baseline = json.load(file)
+    if baseline.get('params') != params:
+        print(f'Parameters of the baseline {baseline.get("params")} differ from {params}, comparison may be misleading.')
+    regressions = get_regressions(results, baseline['results'], args.threshold)
+    for name, baseline_rows_per_second, rows_per_second in regressions:
+        print(f'REGRESSION {name}: {rows_per_second:,.0f} rows/s against {baseline_rows_per_second:,.0f} rows/s in the baseline')
+    if not regressions:
+        print(f'No case is slower than the baseline by more than {args.threshold:.0%}.')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,12 @@
 from fake_data_generator.columns_generator.column import \
-    Column, CategoricalColumn, ContinuousColumn, StringColumn, CurrentTimestampColumn
+    Column, CategoricalColumn, ContinuousColumn, StringColumn, CurrentTimestampColumn, ForeignKeyColumn, UniqueColumn
 from fake_data_generator.columns_generator.rich_info import \
     get_rich_column_info, get_columns_info_with_set_generators
 from fake_data_generator.columns_generator.get_fake_data_for_insertion import \
-    get_fake_data_for_insertion
+    get_fake_data_for_insertion, get_fake_batch_for_insertion
+from fake_data_generator.columns_generator.batch import \
+    Batch, ColumnData
+from fake_data_generator.columns_generator.batch_generation import \
+    get_batches_of_fake_data
+from fake_data_generator.columns_generator.sketches import \
+    ColumnProfile, get_column_profiles, merge_column_profiles
@@ -0,0 +1,65 @@
+from numpy import asarray, arange, concatenate, cumsum, searchsorted, minimum, clip, nonzero, where, \
+    ones, float64, int32, int64
+
+
+def get_index_dtype(number_of_values):
+    return int32 if number_of_values < 2 ** 31 else int64
+
+
+def get_alias_table(probabilities):
+    """
+    Function that builds Walker's alias table for sampling of codes 0..k-1 with given probabilities in O(1) per value.
+    Column i of the table keeps code i with probability thresholds[i] and code aliases[i] otherwise.
+
+    The table is built by the sweep variant of Vose's algorithm without a Python loop over values:
+    large columns (scaled probability >= 1) fill small columns in order and the leftover of a large column
+    is topped up by the next large one. In coordinates of cumulative gaps of small columns, small column j
+    goes to the large column g for which it is the first with cumulative gap before it above
+    U[g] = sum over large columns up to g of (scaled probability - 1), so all assignments are found by searchsorted.
+
+    Parameters
+    ----------
+     probabilities: Probabilities of codes (normalized inside)
+
+    Returns
+    -------
+     Array of thresholds (float64) and array of aliases (int32 or int64)
+
+    Examples
+    --------
+    # >>> get_alias_table([0.5, 0.375, 0.125, 0])
+    # (array([0.5, 1. , 0.5, 0. ]), array([1, 1, 0, 0], dtype=int32))
+    """
+    probabilities = asarray(probabilities, dtype=float64)
+    number_of_values = len(probabilities)
+    index_dtype = get_index_dtype(number_of_values)
+    scaled_probabilities = probabilities * (number_of_values / probabilities.sum())
+    thresholds = ones(number_of_values, dtype=float64)
+    aliases = arange(number_of_values, dtype=index_dtype)
+
+    small_indexes = nonzero(scaled_probabilities < 1)[0]
+    large_indexes = nonzero(scaled_probabilities >= 1)[0]
+    if len(small_indexes) == 0 or len(large_indexes) == 0:
+        return thresholds, aliases
+
+    cumulative_gaps = concatenate([[0.0], cumsum(1 - scaled_probabilities[small_indexes])])
+    large_bounds = cumsum(scaled_probabilities[large_indexes] - 1)
+    numbers_of_larges = searchsorted(large_bounds, cumulative_gaps[:-1], side='left')
+    thresholds[small_indexes] = scaled_probabilities[small_indexes]
+    aliases[small_indexes] = large_indexes[minimum(numbers_of_larges, len(large_indexes) - 1)]
+
+    first_small_after_larges = searchsorted(cumulative_gaps[:-1], large_bounds, side='right')
+    leftovers = clip(large_bounds[:-1] + 1 - cumulative_gaps[first_small_after_larges[:-1]], 0, 1)
+    thresholds[large_indexes[:-1]] = leftovers
+    aliases[large_indexes[:-1]] = large_indexes[1:]
+    return thresholds, aliases
+
+
+def get_codes_from_alias_table(thresholds, aliases, output_size, random_generator):
+    """
+    Function that samples output_size codes from the alias table with one uniform random number per code.
+    """
+    number_of_values = len(thresholds)
+    scaled_uniform_sample = random_generator.random(output_size) * number_of_values
+    columns = minimum(scaled_uniform_sample.astype(aliases.dtype), number_of_values - 1)
+    return where(scaled_uniform_sample - columns < thresholds[columns], columns, aliases[columns])
@@ -0,0 +1,144 @@
+from datetime import date, datetime
+from numpy import asarray, array, ones, zeros
+from pandas import Series, DataFrame, isna
+
+
+def get_typed_array(values):
+    """
+    Function that converts list of non-null values of one column into numpy array of the narrowest fitting type.
+    Dates and datetimes are converted into datetime64 arrays, values of different types are kept in an object array.
+    """
+    if len(set(map(type, values))) != 1:
+        return array(values, dtype=object)
+    if isinstance(values[0], datetime):
+        return array(values, dtype='datetime64[us]')
+    if isinstance(values[0], date):
+        return array(values, dtype='datetime64[D]')
+    typed_array = asarray(values)
+    return typed_array if typed_array.dtype.kind in 'biufUM' else array(values, dtype=object)
+
+
+def get_dictionary_and_null_flags(values):
+    null_flags = asarray([value is None or (not isinstance(value, str) and bool(isna(value))) for value in values], dtype=bool)
+    non_null_values = [value for value, is_null in zip(values, null_flags) if not is_null]
+    if not non_null_values:
+        return array([None] * len(values), dtype=object), null_flags
+    placeholder = non_null_values[0]
+    return get_typed_array([placeholder if is_null else value for value, is_null in zip(values, null_flags)]), null_flags
+
+
+class ColumnData:
+    """
+    Typed data of one generated column.
+
+    Parameters
+    ----------
+     values: Numpy array of values or of codes of values if dictionary is specified
+     mask: Boolean numpy array, True marks null values (there are no nulls if it is not specified)
+     dictionary: Numpy array of values referenced by codes
+    """
+    def __init__(self,
+                 values,
+                 mask=None,
+                 dictionary=None):
+        self.values = values
+        self.mask = mask if mask is not None and mask.any() else None
+        self.dictionary = dictionary
+
+    @classmethod
+    def from_series(cls, column_values: Series):
+        mask = column_values.isna().to_numpy()
+        return cls(column_values.to_numpy(), mask)
+
+    @classmethod
+    def nulls(cls, output_size):
+        return cls(zeros(output_size), mask=ones(output_size, dtype=bool))
+
+    def __len__(self):
+        return len(self.values)
+
+    def get_decoded_values(self):
+        return self.dictionary[self.values] if self.dictionary is not None else self.values
+
+    def get_memory_usage(self):
+        return self.values.nbytes + (self.mask.nbytes if self.mask is not None else 0)
+
+    def to_numpy_with_python_nulls(self):
+        decoded_values = self.get_decoded_values()
+        if self.mask is None:
+            return decoded_values
+        decoded_values = decoded_values.astype(object)
+        decoded_values[self.mask] = None
+        return decoded_values
+
+    def to_series(self, name):
+        values = self.to_numpy_with_python_nulls()
+        # object values stay objects with None for nulls (pandas >= 3 infers str dtype with NaN for strings)
+        return Series(values, name=name, dtype=object if values.dtype == object else None)
+
+    def to_list(self, column_data_type=None):
+        decoded_values = self.get_decoded_values()
+        if decoded_values.dtype.kind == 'M':
+            decoded_values = decoded_values.astype('datetime64[D]' if column_data_type == 'date' else 'datetime64[us]')
+        python_values = decoded_values.tolist()
+        if self.mask is None:
+            return python_values
+        return [None if is_null else value for value, is_null in zip(python_values, self.mask.tolist())]
+
+    def to_arrow(self, arrow_data_type):
+        import pyarrow as pa
+        mask = pa.array(self.mask) if self.mask is not None else None
+        if self.dictionary is not None:
+            arrow_dictionary = pa.array(self.dictionary, from_pandas=True).cast(arrow_data_type)
+            return arrow_dictionary.take(pa.array(self.values, mask=self.mask))
+        values = self.values
+        if values.dtype.kind == 'M' and pa.types.is_date(arrow_data_type):
+            values = values.astype('datetime64[D]')
+        return pa.array(values, mask=mask, from_pandas=True).cast(arrow_data_type)
+
+
+class Batch:
+    """
+    Batch of generated data, ordered mapping of column names to ColumnData objects.
+    DataFrame or Python objects are built only by the sinks that need them.
+    Times of generation of the batch and of its columns are kept with the batch, so they are reported
+    by the process inserting it whatever process generated it. row_offset is the number of the first row of the batch
+    in the generated table, it identifies the batch in checkpoints of insertion.
+    """
+    def __init__(self,
+                 column_name_to_column_data: dict,
+                 generation_seconds: float = 0.0,
+                 column_name_to_seconds: dict = None,
+                 row_offset: int = None):
+        self.column_name_to_column_data = column_name_to_column_data
+        self.generation_seconds = generation_seconds
+        self.column_name_to_seconds = column_name_to_seconds or {}
+        self.row_offset = row_offset
+
+    @property
+    def number_of_rows(self):
+        return len(next(iter(self.column_name_to_column_data.values()))) if self.column_name_to_column_data else 0
+
+    def get_column_names(self):
+        return list(self.column_name_to_column_data.keys())
+
+    def get_column_data(self, column_name):
+        return self.column_name_to_column_data[column_name]
+
+    def get_memory_usage(self):
+        return sum(column_data.get_memory_usage() for column_data in self.column_name_to_column_data.values())
+
+    def to_pandas(self):
+        return DataFrame({column_name: column_data.to_series(column_name)
+                          for column_name, column_data in self.column_name_to_column_data.items()},
+                         columns=self.get_column_names())
+
+    def get_rows(self, column_name_to_data_type=None):
+        column_name_to_data_type = column_name_to_data_type or {}
+        return list(zip(*[column_data.to_list(column_name_to_data_type.get(column_name))
+                          for column_name, column_data in self.column_name_to_column_data.items()]))
+
+    def to_arrow(self, arrow_schema):
+        import pyarrow as pa
+        return pa.Table.from_arrays([self.get_column_data(field.name).to_arrow(field.type) for field in arrow_schema],
+                                    schema=arrow_schema)
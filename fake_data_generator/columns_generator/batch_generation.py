@@ -0,0 +1,112 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from numpy.random import SeedSequence
+from fake_data_generator.columns_generator.column import UniqueColumn
+from fake_data_generator.columns_generator.random_state import get_state_for_rows
+from fake_data_generator.columns_generator.rich_info import get_columns_info_with_set_generators
+from fake_data_generator.columns_generator.get_fake_data_for_insertion import get_fake_batch_for_insertion
+
+columns_info_of_worker = None
+
+
+def get_generator_spec(columns_info_with_set_generators):
+    generator_spec = {}
+    for column_info in columns_info_with_set_generators:
+        generator_spec.update(column_info.get_as_dict())
+    return generator_spec
+
+
+def set_random_state_for_batch(columns_info_with_set_generators, seed, row_offset):
+    for column_index, column_info in enumerate(columns_info_with_set_generators):
+        random_generator = column_info.get_random_generator()
+        if random_generator is not None:
+            random_generator.bit_generator.state = get_state_for_rows(random_generator.bit_generator, seed, column_index, row_offset)
+
+
+def set_row_offset_for_batch(columns_info_with_set_generators, row_offset):
+    for column_info in columns_info_with_set_generators:
+        if isinstance(column_info, UniqueColumn):
+            column_info.set_row_offset(row_offset)
+
+
+def get_fake_data_for_batch(output_size, columns_info_with_set_generators, seed, row_offset):
+    """
+    Function that generates the batch of output_size rows starting at row_offset. If seed is specified, random state of
+    every column is set by the seed and row_offset, so the batch does not depend on batches generated before it.
+    """
+    if seed is not None:
+        set_random_state_for_batch(columns_info_with_set_generators, seed, row_offset)
+    set_row_offset_for_batch(columns_info_with_set_generators, row_offset)
+    batch_of_fake_data = get_fake_batch_for_insertion(output_size=output_size,
+                                                      columns_info_with_set_generator=columns_info_with_set_generators)
+    batch_of_fake_data.row_offset = row_offset
+    return batch_of_fake_data
+
+
+def init_worker(generator_spec):
+    global columns_info_of_worker
+    columns_info_of_worker = get_columns_info_with_set_generators(generator_spec)
+
+
+def get_fake_data_for_batch_in_worker(output_size, seed, row_offset):
+    return get_fake_data_for_batch(output_size, columns_info_of_worker, seed, row_offset)
+
+
+def get_batch_sizes(number_of_rows, batch_size):
+    number_of_rows_left = number_of_rows
+    while number_of_rows_left > 0:
+        yield min(batch_size, number_of_rows_left)
+        number_of_rows_left -= batch_size
+
+
+def get_row_offsets_and_batch_sizes(number_of_rows, batch_size, first_row_offset=0, skipped_row_offsets=None):
+    for row_offset in range(first_row_offset, number_of_rows, batch_size):
+        if skipped_row_offsets is None or row_offset not in skipped_row_offsets:
+            yield row_offset, min(batch_size, number_of_rows - row_offset)
+
+
+def get_batches_of_fake_data(number_of_rows,
+                             batch_size,
+                             columns_info_with_set_generators,
+                             number_of_processes: int = None,
+                             seed: int = None,
+                             first_row_offset: int = 0,
+                             skipped_row_offsets: set = None):
+    """
+    Generator yielding batches of fake data.
+
+    Parameters
+    ----------
+     number_of_rows: Total number of rows to generate
+     batch_size: Maximum number of rows in one batch
+     columns_info_with_set_generators: List of Column objects with set generators
+     number_of_processes: Number of processes generating batches in parallel (batches are generated in the current
+     process if it is not specified)
+     seed: Seed from which random state of every batch is derived. Random state of a batch depends only on the seed
+     and the row offset of the batch (see get_state_for_rows), so equal seeds give equal data whatever the number
+     of processes and any batch can be generated again on its own
+     first_row_offset: Offset of the first generated row, a multiple of batch_size (rows before it are not generated)
+     skipped_row_offsets: Set of row offsets of batches which are not generated (e.g. already inserted batches)
+
+    Returns
+    -------
+     Iterator of Batch objects in the order of batches
+    """
+    if number_of_processes is None or number_of_processes <= 1:
+        for row_offset, output_size in get_row_offsets_and_batch_sizes(number_of_rows, batch_size, first_row_offset, skipped_row_offsets):
+            yield get_fake_data_for_batch(output_size, columns_info_with_set_generators, seed, row_offset)
+        return
+
+    if seed is None:
+        seed = SeedSequence().entropy
+    generator_spec = get_generator_spec(columns_info_with_set_generators)
+    with ProcessPoolExecutor(max_workers=number_of_processes,
+                             initializer=init_worker,
+                             initargs=(generator_spec,)) as executor:
+        futures = deque()
+        for row_offset, output_size in get_row_offsets_and_batch_sizes(number_of_rows, batch_size, first_row_offset, skipped_row_offsets):
+            if len(futures) == 2 * number_of_processes:
+                yield futures.popleft().result()
+            futures.append(executor.submit(get_fake_data_for_batch_in_worker, output_size, seed, row_offset))
+        while futures:
+            yield futures.popleft().result()
@@ -1,4 +1,5 @@
 from typing import Generator
+from numpy.random import Generator as RandomGenerator
 from pandas import NaT
 
 
@@ -10,17 +11,22 @@ class Column:
         self.column_name = column_name
         self.data_type = data_type
         self.generator = generator
+        self.random_generator = None
 
     def get_as_dict(self):
         return {self.column_name: {'data_type': self.data_type}}
 
-    def set_generator(self, generator):
+    def set_generator(self, generator, random_generator: RandomGenerator = None):
         next(generator)
         self.generator = generator
+        self.random_generator = random_generator
 
     def get_generator(self):
         return self.generator
 
+    def get_random_generator(self):
+        return self.random_generator
+
     def set_data_type(self, data_type):
         self.data_type = data_type
 
@@ -37,17 +43,19 @@ class CategoricalColumn(Column):
                  data_type: str = None,
                  generator: Generator = None,
                  values: list = None,
-                 probabilities: list = None):
+                 probabilities: list = None,
+                 null_flags=None):
         super().__init__(column_name, data_type, generator)
         self.values = values
         self.probabilities = probabilities
+        self.null_flags = null_flags
 
     def get_as_dict(self):
         super_dict = super().get_as_dict()
-        if self.data_type == 'date':
-            values = list(map(lambda x: x.strftime("%Y-%m-%d") if x is not NaT else None, self.values))
-        elif self.data_type == 'timestamp':
-            values = list(map(lambda x: x.strftime("%Y-%m-%d %H:%M:%S") if x is not NaT else None, self.values))
+        if self.data_type == 'date' and isinstance(self.values, list):
+            values = list(map(lambda x: x.strftime("%Y-%m-%d") if x is not NaT and x is not None else None, self.values))
+        elif self.data_type == 'timestamp' and isinstance(self.values, list):
+            values = list(map(lambda x: x.strftime("%Y-%m-%d %H:%M:%S") if x is not NaT and x is not None else None, self.values))
         else:
             values = self.values
         super_dict[self.column_name].update({
@@ -55,6 +63,8 @@ class CategoricalColumn(Column):
             'values': values,
             'probabilities': self.probabilities
         })
+        if self.null_flags is not None:
+            super_dict[self.column_name]['null_flags'] = self.null_flags
         return super_dict
 
     def set_values(self, values):
@@ -69,6 +79,12 @@ class CategoricalColumn(Column):
     def get_probabilities(self):
         return self.probabilities
 
+    def set_null_flags(self, null_flags):
+        self.null_flags = null_flags
+
+    def get_null_flags(self):
+        return self.null_flags
+
 
 class ContinuousColumn(Column):
     def __init__(self,
@@ -77,11 +93,15 @@ class ContinuousColumn(Column):
                  generator: Generator = None,
                  intervals: list = None,
                  probabilities: list = None,
-                 date_flag: bool = False):
+                 date_flag: bool = False,
+                 density_estimation: str = 'kde',
+                 number_of_bins: int = 100):
         super().__init__(column_name, data_type, generator)
         self.intervals = intervals
         self.probabilities = probabilities
         self.date_flag = date_flag
+        self.density_estimation = density_estimation
+        self.number_of_bins = number_of_bins
 
     def get_as_dict(self):
         super_dict = super().get_as_dict()
@@ -111,6 +131,18 @@ class ContinuousColumn(Column):
     def get_date_flag(self):
         return self.date_flag
 
+    def set_density_estimation(self, density_estimation: str):
+        self.density_estimation = density_estimation
+
+    def get_density_estimation(self):
+        return self.density_estimation
+
+    def set_number_of_bins(self, number_of_bins: int):
+        self.number_of_bins = number_of_bins
+
+    def get_number_of_bins(self):
+        return self.number_of_bins
+
 
 class StringColumn(Column):
     def __init__(self,
@@ -118,10 +150,14 @@ class StringColumn(Column):
                  data_type: str = None,
                  generator: Generator = None,
                  common_regex: str = None,
-                 string_copy_of: str = None):
+                 string_copy_of: str = None,
+                 lengths: list = None,
+                 length_probabilities: list = None):
         super().__init__(column_name, data_type, generator)
         self.common_regex = common_regex
         self.string_copy_of = string_copy_of
+        self.lengths = lengths
+        self.length_probabilities = length_probabilities
 
     def get_as_dict(self):
         super_dict = super().get_as_dict()
@@ -129,6 +165,8 @@ class StringColumn(Column):
             'type': 'STRING',
             'common_regex': self.common_regex,
             'string_copy_of': self.string_copy_of,
+            'lengths': self.lengths,
+            'length_probabilities': self.length_probabilities,
         })
         return super_dict
 
@@ -144,6 +182,18 @@ class StringColumn(Column):
     def get_common_regex(self):
         return self.common_regex
 
+    def set_lengths(self, lengths):
+        self.lengths = lengths
+
+    def get_lengths(self):
+        return self.lengths
+
+    def set_length_probabilities(self, length_probabilities):
+        self.length_probabilities = length_probabilities
+
+    def get_length_probabilities(self):
+        return self.length_probabilities
+
 
 class CurrentTimestampColumn(Column):
     def __init__(self,
@@ -158,3 +208,164 @@ class CurrentTimestampColumn(Column):
             'type': 'CURRENT_TIMESTAMP',
         })
         return super_dict
+
+
+class ForeignKeyColumn(Column):
+    """
+    Column referencing key column of a parent table, its values are sampled from the key index of generated keys
+    of the parent column, so every value exists in the parent table.
+
+    Parameters
+    ----------
+     column_name: Name of the column
+     data_type: Data type of the column
+     generator: Generator of the column
+     referenced_table_name_with_schema: Name of the parent table (used by generate_tables_from_profiles)
+     referenced_column_name: Name of the key column of the parent table
+     key_index_path: Path of the key index file (set by generate_tables_from_profiles)
+     skew: Exponent of Zipf distribution of referenced keys (keys are sampled uniformly if it is None)
+    """
+    def __init__(self,
+                 column_name: str,
+                 data_type: str = None,
+                 generator: Generator = None,
+                 referenced_table_name_with_schema: str = None,
+                 referenced_column_name: str = None,
+                 key_index_path: str = None,
+                 skew: float = None):
+        super().__init__(column_name, data_type, generator)
+        self.referenced_table_name_with_schema = referenced_table_name_with_schema
+        self.referenced_column_name = referenced_column_name
+        self.key_index_path = key_index_path
+        self.skew = skew
+
+    def get_as_dict(self):
+        super_dict = super().get_as_dict()
+        super_dict[self.column_name].update({
+            'type': 'FOREIGN_KEY',
+            'referenced_table_name_with_schema': self.referenced_table_name_with_schema,
+            'referenced_column_name': self.referenced_column_name,
+            'key_index_path': self.key_index_path,
+            'skew': self.skew,
+        })
+        return super_dict
+
+    def set_referenced_table_name_with_schema(self, referenced_table_name_with_schema):
+        self.referenced_table_name_with_schema = referenced_table_name_with_schema
+
+    def get_referenced_table_name_with_schema(self):
+        return self.referenced_table_name_with_schema
+
+    def set_referenced_column_name(self, referenced_column_name):
+        self.referenced_column_name = referenced_column_name
+
+    def get_referenced_column_name(self):
+        return self.referenced_column_name
+
+    def set_key_index_path(self, key_index_path):
+        self.key_index_path = key_index_path
+
+    def get_key_index_path(self):
+        return self.key_index_path
+
+    def set_skew(self, skew):
+        self.skew = skew
+
+    def get_skew(self):
+        return self.skew
+
+
+class UniqueColumn(Column):
+    """
+    Column of unique keys (e.g. primary key). The key of a row depends only on the index of the row,
+    so keys are unique across batches, processes and resumed runs whatever the number of generated keys.
+
+    Parameters
+    ----------
+     column_name: Name of the column
+     data_type: Data type of the column
+     generator: Generator of the column
+     method: 'permutation' (keyed bijective permutation of row indexes over the range of keys, keys look random)
+     or 'sequence' (min_value + stride * row index)
+     number_of_keys: Size of the range of keys for 'permutation' (by default up to the maximum value of the data type)
+     min_value: The smallest key
+     stride: Step of the sequence for 'sequence'
+     permutation_seed: Seed of the permutation for 'permutation'
+     first_row_index: Index of the first generated row, pass the number of already generated rows to resume generation
+    """
+    def __init__(self,
+                 column_name: str,
+                 data_type: str = None,
+                 generator: Generator = None,
+                 method: str = 'permutation',
+                 number_of_keys: int = None,
+                 min_value: int = 0,
+                 stride: int = 1,
+                 permutation_seed: int = 0,
+                 first_row_index: int = 0):
+        super().__init__(column_name, data_type, generator)
+        self.method = method
+        self.number_of_keys = number_of_keys
+        self.min_value = min_value
+        self.stride = stride
+        self.permutation_seed = permutation_seed
+        self.first_row_index = first_row_index
+        self.row_index = first_row_index
+
+    def get_as_dict(self):
+        super_dict = super().get_as_dict()
+        super_dict[self.column_name].update({
+            'type': 'UNIQUE',
+            'method': self.method,
+            'number_of_keys': self.number_of_keys,
+            'min_value': self.min_value,
+            'stride': self.stride,
+            'permutation_seed': self.permutation_seed,
+            'first_row_index': self.first_row_index,
+        })
+        return super_dict
+
+    def set_row_offset(self, row_offset: int):
+        self.row_index = self.first_row_index + row_offset
+
+    def get_next_row_index(self, output_size: int):
+        row_index = self.row_index
+        self.row_index += output_size
+        return row_index
+
+    def set_method(self, method):
+        self.method = method
+
+    def get_method(self):
+        return self.method
+
+    def set_number_of_keys(self, number_of_keys):
+        self.number_of_keys = number_of_keys
+
+    def get_number_of_keys(self):
+        return self.number_of_keys
+
+    def set_min_value(self, min_value):
+        self.min_value = min_value
+
+    def get_min_value(self):
+        return self.min_value
+
+    def set_stride(self, stride):
+        self.stride = stride
+
+    def get_stride(self):
+        return self.stride
+
+    def set_permutation_seed(self, permutation_seed):
+        self.permutation_seed = permutation_seed
+
+    def get_permutation_seed(self):
+        return self.permutation_seed
+
+    def set_first_row_index(self, first_row_index):
+        self.first_row_index = first_row_index
+        self.row_index = first_row_index
+
+    def get_first_row_index(self):
+        return self.first_row_index
@@ -0,0 +1,92 @@
+from numpy import array, arange, asarray, empty, full, uint32
+
+REGEX_SPECIAL_CHARACTERS = set('.^$*+?{}()|\\')
+
+
+def get_characters_of_character_class(character_class):
+    characters = []
+    index = 0
+    while index < len(character_class):
+        char = character_class[index]
+        if char == '\\':
+            if index + 1 == len(character_class) or character_class[index + 1].isalnum():
+                return None
+            char = character_class[index + 1]
+            index += 1
+        if index + 2 < len(character_class) and character_class[index + 1] == '-':
+            range_end = character_class[index + 2]
+            if range_end == '\\':
+                if index + 3 == len(character_class) or character_class[index + 3].isalnum():
+                    return None
+                range_end = character_class[index + 3]
+                index += 1
+            if ord(range_end) < ord(char):
+                return None
+            characters.extend(chr(code) for code in range(ord(char), ord(range_end) + 1))
+            index += 3
+        else:
+            characters.append(char)
+            index += 1
+    return characters
+
+
+def get_alphabets_for_common_regex(common_regex):
+    """
+    Function that compiles a regular expression consisting only of character classes and literal characters
+    into a list of per-position alphabets.
+
+    Parameters
+    ----------
+     common_regex: Regular expression to compile
+
+    Returns
+    -------
+     List of numpy arrays with code points of the characters allowed at each position
+     or None if the regular expression is not a plain sequence of character classes
+
+    Examples
+    --------
+    # >>> get_alphabets_for_common_regex('[0-1][-]')
+    # [array([48, 49], dtype=uint32), array([45], dtype=uint32)]
+    # >>> get_alphabets_for_common_regex('[0-9]+') is None
+    # True
+    """
+    alphabets = []
+    index = 0
+    while index < len(common_regex):
+        char = common_regex[index]
+        if char == '[':
+            class_end = index + 1
+            if common_regex[class_end:class_end + 1] in ('^', ']'):
+                return None
+            while class_end < len(common_regex) and common_regex[class_end] != ']':
+                class_end += 2 if common_regex[class_end] == '\\' else 1
+            if class_end >= len(common_regex):
+                return None
+            characters = get_characters_of_character_class(common_regex[index + 1:class_end])
+            index = class_end + 1
+        elif char == '\\':
+            if index + 1 == len(common_regex) or common_regex[index + 1].isalnum():
+                return None
+            characters = [common_regex[index + 1]]
+            index += 2
+        elif char in REGEX_SPECIAL_CHARACTERS or char in '[]':
+            return None
+        else:
+            characters = [char]
+            index += 1
+        if not characters:
+            return None
+        alphabets.append(array(sorted(set(map(ord, characters))), dtype=uint32))
+    return alphabets
+
+
+def get_fake_strings_from_alphabets(alphabets, output_size, lengths, random_generator):
+    if len(alphabets) == 0:
+        return full(output_size, '', dtype='U1')
+    code_points = empty((output_size, len(alphabets)), dtype=uint32)
+    for position, alphabet in enumerate(alphabets):
+        code_points[:, position] = alphabet[random_generator.integers(len(alphabet), size=output_size)]
+    if lengths is not None:
+        code_points[arange(len(alphabets)) >= asarray(lengths)[:, None]] = 0
+    return code_points.view(f'U{len(alphabets)}').ravel()
@@ -1,43 +1,77 @@
 from datetime import datetime, date, timedelta
-from decimal import Decimal
-from random import uniform
-from rstr import xeger
-from pandas import Series
+from random import Random
 # from pytz import timezone
-from numpy.random import choice
+from numpy import array, asarray, around, full, trunc, datetime64, float64, int64, zeros, concatenate, cumsum, searchsorted, minimum
+from numpy.random import Generator
+from fake_data_generator.columns_generator.batch import ColumnData, get_dictionary_and_null_flags
+from fake_data_generator.columns_generator.compiled_regex import \
+    get_alphabets_for_common_regex, get_fake_strings_from_alphabets
+from fake_data_generator.columns_generator.alias_table import get_alias_table, get_codes_from_alias_table
+from fake_data_generator.columns_generator.key_index import KeyIndex, get_positions_of_keys
+from fake_data_generator.columns_generator.unique_keys import get_unique_keys
+from fake_data_generator.columns_generator.random_state import get_random_generator
 
 
 def get_generator_for_nulls(column_name):
     output_size = yield
     while True:
-        output_size = yield Series([None] * output_size, name=column_name)
+        output_size = yield ColumnData.nulls(output_size)
 
 
-def get_generator_for_categorical_column(column_name, values, probabilities):
+def get_generator_for_categorical_column(column_name, values, probabilities, random_generator: Generator = None,
+                                         null_flags=None):
     output_size = yield
+    random_generator = random_generator or get_random_generator()
+    if null_flags is None:
+        dictionary, null_flags = get_dictionary_and_null_flags(values)
+    else:
+        dictionary, null_flags = asarray(values), asarray(null_flags, dtype=bool)
+    thresholds, aliases = get_alias_table(probabilities)
     while True:
-        fake_sample = choice(a=values, p=probabilities, size=output_size, replace=True)
-        fake_series = Series(fake_sample, name=column_name, dtype=object)
-        output_size = yield fake_series.where(fake_series.notna(), None)
+        codes = get_codes_from_alias_table(thresholds, aliases, output_size, random_generator)
+        output_size = yield ColumnData(codes, mask=null_flags[codes], dictionary=dictionary)
+
+
+def get_generator_for_foreign_key_column(column_name, key_index_path, skew=None, random_generator: Generator = None):
+    output_size = yield
+    random_generator = random_generator or get_random_generator()
+    key_index = KeyIndex(key_index_path)
+    if len(key_index) == 0:
+        raise ValueError(f'Key index {key_index_path} referenced by column {column_name} is empty.')
+    while True:
+        positions = get_positions_of_keys(len(key_index), output_size, random_generator, skew)
+        output_size = yield ColumnData(key_index.get_keys(positions))
+
+
+def get_generator_for_unique_column(column_name, get_next_row_index, data_type, method='permutation', number_of_keys=None,
+                                    min_value=0, stride=1, permutation_seed=0):
+    output_size = yield
+    while True:
+        keys = get_unique_keys(get_next_row_index(output_size), output_size, data_type, method=method, number_of_keys=number_of_keys,
+                               min_value=min_value, stride=stride, permutation_seed=permutation_seed)
+        output_size = yield ColumnData(keys)
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
 
 
 def float_to_int():
-    return int
+    return lambda x: trunc(x).astype(int64)
 
 
 def float_to_decimal(precision):
-    return lambda x: Decimal(str(round(x, precision)))
+    return lambda x: around(x, precision)
 
 
 def float_to_date():
-    return lambda x: date.fromordinal(int(x))
+    return lambda x: (trunc(x).astype(int64) - EPOCH_ORDINAL).astype('datetime64[D]')
 
 
 def float_to_datetime(date_flag: bool = False):
     if date_flag:
-        return lambda x: datetime.fromtimestamp(x).replace(hour=0, minute=0, second=0, microsecond=0)
+        return lambda x: trunc(x).astype(int64).astype('datetime64[s]').astype('datetime64[D]').astype('datetime64[s]')
     else:
-        return lambda x: datetime.fromtimestamp(x)
+        return lambda x: trunc(x).astype(int64).astype('datetime64[s]')
 
 
 CONVERTERS_FROM_FLOAT = {
@@ -48,32 +82,63 @@ CONVERTERS_FROM_FLOAT = {
 }
 
 
+def get_inverse_cdf_of_intervals(lower_bounds, upper_bounds, probabilities):
+    """
+    Function that precomputes piecewise linear inverse CDF of the mixture of uniform distributions on intervals:
+    value for uniform u is lower_bounds[i] + (u - cumulative_probabilities[i]) * interval_widths_to_probabilities[i],
+    where i is the last index with cumulative_probabilities[i] <= u.
+    """
+    norm_probabilities = array(probabilities, dtype=float64)
+    norm_probabilities /= norm_probabilities.sum()
+    cumulative_probabilities = concatenate([[0.0], cumsum(norm_probabilities)[:-1]])
+    interval_widths_to_probabilities = zeros(len(norm_probabilities), dtype=float64)
+    non_zero_probabilities = norm_probabilities > 0
+    interval_widths_to_probabilities[non_zero_probabilities] = \
+        (upper_bounds - lower_bounds)[non_zero_probabilities] / norm_probabilities[non_zero_probabilities]
+    return cumulative_probabilities, interval_widths_to_probabilities
+
+
 def get_generator_for_continuous_column(column_name,
                                         intervals,
                                         probabilities,
                                         output_data_type: str,
-                                        params: dict = None):
+                                        params: dict = None,
+                                        random_generator: Generator = None):
     output_size = yield
     if params is None:
         params = {}
-    multiplier_for_probabilities = 1 / sum(probabilities)
-    norm_probabilities = list(map(lambda p: p * multiplier_for_probabilities, probabilities))
+    random_generator = random_generator or get_random_generator()
+    lower_bounds, upper_bounds = array(intervals, dtype=float64).reshape(-1, 2).T
+    cumulative_probabilities, interval_widths_to_probabilities = get_inverse_cdf_of_intervals(lower_bounds, upper_bounds, probabilities)
     applied_func = CONVERTERS_FROM_FLOAT.get(output_data_type)(**params)
     while True:
-        fake_sample = map(lambda interval_index: applied_func(uniform(intervals[interval_index][0], intervals[interval_index][1])),
-                          choice(a=len(intervals), size=output_size, p=norm_probabilities, replace=True))
-        output_size = yield Series(fake_sample, name=column_name)
+        uniform_sample = random_generator.random(output_size)
+        interval_indexes = minimum(searchsorted(cumulative_probabilities, uniform_sample, side='right') - 1, len(lower_bounds) - 1)
+        fake_sample = lower_bounds[interval_indexes] + \
+            (uniform_sample - cumulative_probabilities[interval_indexes]) * interval_widths_to_probabilities[interval_indexes]
+        output_size = yield ColumnData(applied_func(fake_sample))
 
 
-def get_generator_for_string_column(column_name, common_regex):
+def get_generator_for_string_column(column_name, common_regex, lengths=None, length_probabilities=None,
+                                    random_generator: Generator = None):
     output_size = yield
+    random_generator = random_generator or get_random_generator()
+    alphabets = get_alphabets_for_common_regex(common_regex)
     while True:
-        list_of_fake_strings = [xeger(common_regex) for _ in range(output_size)]
-        output_size = yield Series(list_of_fake_strings, name=column_name)
+        if alphabets is not None:
+            fake_lengths = None
+            if lengths is not None and len(lengths) > 0 and length_probabilities is not None:
+                fake_lengths = random_generator.choice(a=lengths, size=output_size, p=length_probabilities, replace=True)
+            output_size = yield ColumnData(get_fake_strings_from_alphabets(alphabets, output_size, fake_lengths, random_generator))
+        else:
+            from rstr import Rstr
+            xeger = Rstr(Random(int(random_generator.integers(2 ** 63)))).xeger
+            list_of_fake_strings = [xeger(common_regex) for _ in range(output_size)]
+            output_size = yield ColumnData(array(list_of_fake_strings, dtype=object))
 
 
 def get_generator_for_current_dttm_column(column_name):
     output_size = yield
     while True:
-        fake_timestamps = [datetime.now().replace(microsecond=0) + timedelta(hours=3) for _ in range(output_size)]
-        output_size = yield Series(fake_timestamps, name=column_name)
+        fake_timestamp = datetime64(datetime.now().replace(microsecond=0) + timedelta(hours=3), 's')
+        output_size = yield ColumnData(full(output_size, fake_timestamp))
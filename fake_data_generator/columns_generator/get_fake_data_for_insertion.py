@@ -1,11 +1,29 @@
-from loguru import logger
-from pandas import concat, Series
+from time import perf_counter
+from numpy import array
+from pandas import Series
 from fake_data_generator.columns_generator.column import StringColumn
+from fake_data_generator.columns_generator.batch import Batch, ColumnData
 
 
-def get_fake_data_for_insertion(output_size,
-                                columns_info_with_set_generator):
-    list_of_fake_column_data = []
+def get_string_copy_of_column_data(column_data, column_data_type):
+    decoded_values = column_data.get_decoded_values()
+    if column_data_type == 'date' and decoded_values.dtype.kind == 'M':
+        string_values = decoded_values.astype('datetime64[D]').astype(str)
+    elif decoded_values.dtype.kind == 'M':
+        string_values = Series(decoded_values).astype(str).to_numpy()
+    else:
+        string_values = array(list(map(str, column_data.to_numpy_with_python_nulls())), dtype=object)
+    if column_data.mask is not None:
+        string_values = string_values.astype(object)
+        string_values[column_data.mask] = 'None'
+    return ColumnData(string_values)
+
+
+def get_fake_batch_for_insertion(output_size,
+                                 columns_info_with_set_generator):
+    batch_start = perf_counter()
+    column_name_to_column_data = {}
+    column_name_to_seconds = {}
     column_name_to_string_copy_column_name = {column_info.get_string_copy_of(): column_info.get_column_name()
                                               for column_info in columns_info_with_set_generator
                                               if (isinstance(column_info, StringColumn) and column_info.get_string_copy_of() is not None)}
@@ -13,12 +31,23 @@ def get_fake_data_for_insertion(output_size,
         column_name = column_info.get_column_name()
         if column_name in column_name_to_string_copy_column_name.values():
             continue
-        fake_column_data_in_series = column_info.get_generator().send(output_size)
-        logger.info(f'Data for {column_name} was generated.')
+        column_start = perf_counter()
+        fake_column_data = column_info.get_generator().send(output_size)
+        if isinstance(fake_column_data, Series):
+            fake_column_data = ColumnData.from_series(fake_column_data)
+        column_name_to_seconds[column_name] = perf_counter() - column_start
         if column_name in column_name_to_string_copy_column_name.keys():
             string_copy_column_name = column_name_to_string_copy_column_name.get(column_info.get_column_name())
-            list_of_fake_column_data.append(Series(data=map(str, fake_column_data_in_series), name=string_copy_column_name))
-            logger.info(f'Data for {string_copy_column_name} was generated.')
-        list_of_fake_column_data.append(fake_column_data_in_series)
-    df_to_insert = concat(list_of_fake_column_data, axis=1)
-    return df_to_insert
+            column_start = perf_counter()
+            column_name_to_column_data[string_copy_column_name] = get_string_copy_of_column_data(fake_column_data, column_info.get_data_type())
+            column_name_to_seconds[string_copy_column_name] = perf_counter() - column_start
+        column_name_to_column_data[column_name] = fake_column_data
+    return Batch({column_info.get_column_name(): column_name_to_column_data[column_info.get_column_name()]
+                  for column_info in columns_info_with_set_generator},
+                 generation_seconds=perf_counter() - batch_start,
+                 column_name_to_seconds=column_name_to_seconds)
+
+
+def get_fake_data_for_insertion(output_size,
+                                columns_info_with_set_generator):
+    return get_fake_batch_for_insertion(output_size, columns_info_with_set_generator).to_pandas()
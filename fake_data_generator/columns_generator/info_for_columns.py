@@ -1,96 +1,285 @@
-import re
 import math
-from numpy import linspace
-from scipy.stats import gaussian_kde
-from pandas import Timestamp
-
-
-def get_info_for_categorical_column(column_values):
-    normalized_frequencies_of_values = column_values.value_counts(normalize=True, dropna=False)
-    values = normalized_frequencies_of_values.index.tolist()
-    if any(isinstance(value, Timestamp) for value in values):
-        values = list(map(lambda x: x.to_pydatetime() if isinstance(x, Timestamp) else x, values))
-    elif any(isinstance(value, float) for value in values):
-        values = list(map(lambda x: int(x) if not math.isnan(x) else None, values))
+from datetime import datetime
+from numpy import linspace, asarray, zeros, nonzero, unique, bitwise_or, int64, uint8, uint32, float64, \
+    arange, exp, clip, floor, bincount, histogram, quantile, maximum, geomspace, concatenate, argsort, searchsorted
+from numpy.fft import rfft, irfft
+from pandas import Series, Timestamp, to_datetime, to_numeric
+
+
+def get_python_values(values, input_data_type: str):
+    """
+    Function that converts typed values (nullable Int64, float64, datetime64) into a list of Python objects
+    (int, float, date or datetime) with None for nulls.
+    """
+    if input_data_type == 'int':
+        return Series(values, dtype=object).astype('Int64').to_numpy(dtype=object, na_value=None).tolist()
+    null_flags = asarray(values.isna())
+    if input_data_type in ('date', 'datetime'):
+        datetime_index = to_datetime(values)
+        python_values = asarray(datetime_index.date if input_data_type == 'date' else datetime_index.to_pydatetime(), dtype=object)
+    else:
+        python_values = asarray(values, dtype=object).copy()
+    python_values[null_flags] = None
+    return python_values.tolist()
+
+
+def get_info_for_categorical_column_from_frequencies(normalized_frequencies_of_values, input_data_type: str = None):
+    if input_data_type is not None:
+        values = get_python_values(normalized_frequencies_of_values.index, input_data_type)
+    else:
+        values = normalized_frequencies_of_values.index.tolist()
+        if any(isinstance(value, Timestamp) for value in values):
+            values = list(map(lambda x: x.to_pydatetime() if isinstance(x, Timestamp) else x, values))
+        elif any(isinstance(value, float) and not math.isnan(value) for value in values):
+            values = list(map(lambda x: int(x) if not math.isnan(x) else None, values))
+        values = [None if isinstance(value, float) and math.isnan(value) else value for value in values]
     probabilities = normalized_frequencies_of_values.to_list()
     return values, probabilities
 
 
-CONVERTERS_TO_FLOAT = {
-    'int': float,
-    'float': lambda x: x,
-    'date': lambda x: x.toordinal(),
-    'datetime': lambda x: x.timestamp(),
-}
+def get_info_for_categorical_column(column_values, input_data_type: str = None):
+    """
+    Function that returns distinct values of the column (with None for nulls) and their probabilities.
+    Values of typed columns (see get_correct_column_values) are converted into Python objects by input_data_type
+    ('int', 'float', 'date' or 'datetime') once per distinct value.
+    """
+    return get_info_for_categorical_column_from_frequencies(column_values.value_counts(normalize=True, dropna=False), input_data_type)
 
 
-def get_info_for_continuous_column(column_values, input_data_type: str):
-    float_column_values_without_null = column_values.dropna().apply(CONVERTERS_TO_FLOAT[input_data_type])
-    kde = gaussian_kde(float_column_values_without_null.values)
-    x = linspace(min(float_column_values_without_null), max(float_column_values_without_null), num=100)
-    intervals = []
-    probabilities = []
-    for index, value in enumerate(x[:-1]):
-        interval = (value, x[index + 1])
-        probability = kde.integrate_box_1d(*interval)
-        intervals.append(interval)
-        probabilities.append(probability)
-    return intervals, probabilities
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
 
 
-def get_info_for_string_column(strings) -> str:
+def get_float_values(column_values_without_null, input_data_type: str):
+    """
+    Function that converts non-null values into a float64 array: dates are converted into ordinals, datetimes into epoch seconds.
+    Values are converted as whole arrays, typed values (Int64, datetime64) are not copied into Python objects.
+    """
+    if input_data_type == 'date':
+        return to_datetime(column_values_without_null).to_numpy().astype('datetime64[D]').astype(int64).astype(float64) + EPOCH_ORDINAL
+    elif input_data_type == 'datetime':
+        return to_datetime(column_values_without_null).to_numpy().astype('datetime64[us]').astype(int64) / 1e6
+    return to_numeric(column_values_without_null).to_numpy(dtype=float64)
+
+
+DENSITY_ESTIMATIONS = ('kde', 'histogram', 'quantile')
+DEFAULT_NUMBER_OF_BINS = 100
+NUMBER_OF_GRID_CELLS_IN_BIN = 16
+
+
+def get_fft_convolution(values, kernel):
+    size = len(values) + len(kernel) - 1
+    return irfft(rfft(values, size) * rfft(kernel, size), size)
+
+
+def get_binned_kde_probabilities(float_values, bin_edges):
+    """
+    Function that integrates Gaussian KDE (Scott's bandwidth, as scipy.stats.gaussian_kde) over bins.
+    Values are linearly binned on a fine grid and convolved with the kernel by FFT, so the cost is
+    O(n + grid size * log(grid size)) instead of O(n * number of bins).
     """
-    Function that returns common regular expression of given strings.
+    number_of_bins = len(bin_edges) - 1
+    number_of_grid_cells = number_of_bins * NUMBER_OF_GRID_CELLS_IN_BIN
+    min_value, max_value = bin_edges[0], bin_edges[-1]
+    cell_width = (max_value - min_value) / number_of_grid_cells
+    positions = (float_values - min_value) / cell_width - 0.5
+    left_cells = clip(floor(positions), -1, number_of_grid_cells - 1).astype(int64)
+    right_weights = clip(positions - left_cells, 0, 1)
+    grid_counts = bincount(left_cells + 1, weights=1 - right_weights, minlength=number_of_grid_cells + 2) + \
+        bincount(left_cells + 2, weights=right_weights, minlength=number_of_grid_cells + 2)
+    grid_counts[1] += grid_counts[0]
+    grid_counts[number_of_grid_cells] += grid_counts[number_of_grid_cells + 1]
+    grid_counts = grid_counts[1:number_of_grid_cells + 1]
+
+    bandwidth = float_values.std(ddof=1) * len(float_values) ** (-1 / 5) if len(float_values) > 1 else 0.0
+    kernel_radius = min(int(4 * bandwidth / cell_width) + 1, number_of_grid_cells)
+    offsets = arange(-kernel_radius, kernel_radius + 1) * cell_width
+    kernel = exp(-0.5 * (offsets / bandwidth) ** 2) if bandwidth > 0 else (offsets == 0).astype(float64)
+    kernel /= kernel.sum()
+    smoothed_grid_counts = maximum(get_fft_convolution(grid_counts, kernel)[kernel_radius:kernel_radius + number_of_grid_cells], 0)
+    return smoothed_grid_counts.reshape(number_of_bins, NUMBER_OF_GRID_CELLS_IN_BIN).sum(axis=1) / len(float_values)
+
+
+def get_quantile_levels(number_of_bins, number_of_values):
+    """
+    Levels of quantiles bounding the bins: half of the bins have equal probabilities,
+    the other half splits the tails geometrically down to 1 / number_of_values, so extreme values get narrow bins.
+    """
+    number_of_tail_levels = number_of_bins // 4
+    smallest_tail_probability = 1 / max(number_of_values, 2)
+    tail_levels = geomspace(smallest_tail_probability, 1 / (number_of_bins - 2 * number_of_tail_levels), num=number_of_tail_levels) \
+        if number_of_tail_levels > 0 else zeros(0)
+    return unique(concatenate([linspace(0, 1, num=number_of_bins - 2 * number_of_tail_levels + 1), tail_levels, 1 - tail_levels]))
+
+
+def get_info_for_continuous_column(column_values,
+                                   input_data_type: str,
+                                   density_estimation: str = 'kde',
+                                   number_of_bins: int = DEFAULT_NUMBER_OF_BINS):
+    """
+    Function that estimates density of non-null values of the column as probabilities of intervals.
 
     Parameters
     ----------
-     strings: Iterable object returning strings for which common regex should be found
+     column_values: Series of values of the column
+     input_data_type: 'int', 'float', 'date' or 'datetime'
+     density_estimation: 'kde' (Gaussian KDE binned on a fine grid and computed by FFT), 'histogram' (equal-width bins)
+     or 'quantile' (bins with equal numbers of values, better for skewed columns and their tails)
+     number_of_bins: Number of intervals
 
     Returns
     -------
-     String representing common regular expression of specified strings
+     List of intervals (tuples of lower and upper bounds) and list of their probabilities
 
     Examples
     --------
-    # >>> get_common_regex(['123', '32314', '131'])
-    # '[0-9][0-9][0-9][0-9][0-9]'
-    # >>> get_common_regex(['abc', 'a0c', 'xyz'])
-    # '[a-z][a-z0-9][a-z]'
-    # >>> get_common_regex(['1234-2314', '1241-1234', '2514-2141'])
-    '[0-9][0-9][0-9][0-9][-][0-9][0-9][0-9][0-9]'
-    """
-    common_pattern = {}
-    for string in strings:
-        for index, char in enumerate(string):
-            if re.match(r"[0-9]", char):
-                if '0-9' not in common_pattern.get(index, ''):
-                    common_pattern[index] = common_pattern.get(index, '') + '0-9'
-                else:
-                    continue
-            elif re.match(r"[A-Z]", char):
-                if 'A-Z' not in common_pattern.get(index, ''):
-                    common_pattern[index] = common_pattern.get(index, '') + 'A-Z'
-                else:
-                    continue
-            elif re.match(r"[a-z]", char):
-                if 'a-z' not in common_pattern.get(index, ''):
-                    common_pattern[index] = common_pattern.get(index, '') + 'a-z'
-                else:
-                    continue
-            elif re.match(r"[А-Я]", char):
-                if 'А-Я' not in common_pattern.get(index, ''):
-                    common_pattern[index] = common_pattern.get(index, '') + 'А-Я'
-                else:
-                    continue
-            elif re.match(r"[а-я]", char):
-                if 'а-я' not in common_pattern.get(index, ''):
-                    common_pattern[index] = common_pattern.get(index, '') + 'а-я'
-                else:
-                    continue
-            else:
-                if char not in common_pattern.get(index, ''):
-                    common_pattern[index] = common_pattern.get(index, '') + char
+    # >>> get_info_for_continuous_column(Series([1, 2, 2, 3]), 'int', density_estimation='histogram', number_of_bins=2)
+    # ([(1.0, 2.0), (2.0, 3.0)], [0.25, 0.75])
+    """
+    float_values = get_float_values(column_values.dropna(), input_data_type)
+    min_value, max_value = float_values.min(), float_values.max()
+    if min_value == max_value:
+        return [(float(min_value), float(max_value))], [1.0]
+
+    if density_estimation == 'kde':
+        bin_edges = linspace(min_value, max_value, num=number_of_bins + 1)
+        probabilities = get_binned_kde_probabilities(float_values, bin_edges)
+    elif density_estimation == 'histogram':
+        counts, bin_edges = histogram(float_values, bins=number_of_bins)
+        probabilities = counts / len(float_values)
+    elif density_estimation == 'quantile':
+        bin_edges = unique(quantile(float_values, get_quantile_levels(number_of_bins, len(float_values))))
+        counts, bin_edges = histogram(float_values, bins=bin_edges)
+        probabilities = counts / len(float_values)
+    else:
+        raise ValueError(f'Unknown density estimation {density_estimation}, expected one of {DENSITY_ESTIMATIONS}.')
+    return list(zip(bin_edges[:-1].tolist(), bin_edges[1:].tolist())), probabilities.tolist()
+
+
+CHARACTER_CLASSES = [
+    (1, '0-9', ord('0'), ord('9')),
+    (2, 'A-Z', ord('A'), ord('Z')),
+    (4, 'a-z', ord('a'), ord('z')),
+    (8, 'А-Я', ord('А'), ord('Я')),
+    (16, 'а-я', ord('а'), ord('я')),
+]
+CHARACTERS_TO_ESCAPE_IN_CLASS = set('\\]^-[')
+STRINGS_CHUNK_NUMBER_OF_CHARACTERS = 2 ** 22
+
+
+def get_character_classes_info_for_strings_chunk(strings_chunk):
+    code_points = asarray(strings_chunk, dtype=str)
+    max_length = code_points.dtype.itemsize // 4
+    if max_length == 0:
+        return zeros(0, dtype=uint8), set()
+    code_points = code_points.view(uint32).reshape(len(strings_chunk), max_length)
+    class_bits = zeros(code_points.shape, dtype=uint8)
+    for bit, _, first_code_point, last_code_point in CHARACTER_CLASSES:
+        class_bits[(code_points >= first_code_point) & (code_points <= last_code_point)] = bit
+    rows_of_other_characters, positions_of_other_characters = nonzero((class_bits == 0) & (code_points != 0))
+    other_characters = unique(positions_of_other_characters.astype(int64) * 0x110000 +
+                              code_points[rows_of_other_characters, positions_of_other_characters])
+    return bitwise_or.reduce(class_bits, axis=0), set(other_characters.tolist())
+
+
+def get_merged_class_bitmasks(class_bitmasks, other_class_bitmasks):
+    if len(other_class_bitmasks) > len(class_bitmasks):
+        class_bitmasks, other_class_bitmasks = other_class_bitmasks, class_bitmasks
+    class_bitmasks = class_bitmasks.copy()
+    class_bitmasks[:len(other_class_bitmasks)] |= other_class_bitmasks
+    return class_bitmasks
+
+
+def get_row_ranges_of_chunks_of_strings(sorted_string_lengths):
+    """
+    Function that splits strings sorted by length into chunks whose fixed-width arrays (number of strings multiplied by
+    the maximum length) have at most STRINGS_CHUNK_NUMBER_OF_CHARACTERS characters, a longer string forms its own chunk.
+    """
+    widths = maximum(sorted_string_lengths, 1)
+    chunk_start = 0
+    while chunk_start < len(widths):
+        max_number_of_strings = max(1, STRINGS_CHUNK_NUMBER_OF_CHARACTERS // int(widths[chunk_start]))
+        candidate_widths = widths[chunk_start:chunk_start + max_number_of_strings]
+        sizes_of_chunks = arange(1, len(candidate_widths) + 1) * candidate_widths
+        chunk_end = chunk_start + max(1, int(searchsorted(sizes_of_chunks, STRINGS_CHUNK_NUMBER_OF_CHARACTERS, side='right')))
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end
+
+
+def get_character_classes_info_for_strings(strings_values, string_lengths):
+    """
+    Function that returns bitmasks of character classes met at every position of strings and other characters met
+    at every position (see get_common_regex). Strings are processed in chunks of similar lengths (the order of strings
+    does not change the result), so memory does not depend on the number of strings and one long string
+    does not widen arrays of short strings.
+    """
+    order = argsort(asarray(string_lengths), kind='stable')
+    sorted_strings_values, sorted_string_lengths = asarray(strings_values, dtype=object)[order], asarray(string_lengths)[order]
+    class_bitmasks = zeros(0, dtype=uint8)
+    other_characters = set()
+    for chunk_start, chunk_end in get_row_ranges_of_chunks_of_strings(sorted_string_lengths):
+        chunk_class_bitmasks, chunk_other_characters = \
+            get_character_classes_info_for_strings_chunk(sorted_strings_values[chunk_start:chunk_end])
+        class_bitmasks = get_merged_class_bitmasks(class_bitmasks, chunk_class_bitmasks)
+        other_characters |= chunk_other_characters
+    return class_bitmasks, other_characters
+
+
+def get_common_regex(class_bitmasks, other_characters, max_length):
+    """
+    Function that builds common regular expression from per-position character classes of strings.
+
+    Parameters
+    ----------
+     class_bitmasks: Array of bitmasks of character classes (CHARACTER_CLASSES) met at every position
+     other_characters: Set of numbers position * 0x110000 + code point of characters out of character classes
+     max_length: Maximum length of strings, positions after it are not included in the regex
+
+    Returns
+    -------
+     String representing common regular expression
+    """
+    position_to_other_characters = {}
+    for position_and_code_point in sorted(other_characters):
+        position, code_point = divmod(position_and_code_point, 0x110000)
+        char = chr(code_point)
+        position_to_other_characters[position] = position_to_other_characters.get(position, '') + \
+            ('\\' + char if char in CHARACTERS_TO_ESCAPE_IN_CLASS else char)
+
     common_pattern_string = ''
-    for _, symbol_regex in sorted(common_pattern.items()):
-        common_pattern_string += '[' + symbol_regex + ']'
+    for position, class_bitmask in enumerate(class_bitmasks[:max_length].tolist()):
+        symbol_regex = ''.join(class_regex for bit, class_regex, _, _ in CHARACTER_CLASSES if class_bitmask & bit)
+        common_pattern_string += '[' + symbol_regex + position_to_other_characters.get(position, '') + ']'
     return common_pattern_string
+
+
+def get_info_for_string_column(strings):
+    """
+    Function that returns common regular expression of given strings and distribution of their lengths.
+
+    Parameters
+    ----------
+     strings: Series of strings for which common regex should be found
+
+    Returns
+    -------
+     String representing common regular expression of specified strings,
+     list of lengths of specified strings and list of probabilities of these lengths
+
+    Examples
+    --------
+    # >>> get_info_for_string_column(Series(['123', '32314', '131']))
+    # ('[0-9][0-9][0-9][0-9][0-9]', [3, 5], [0.6666666666666666, 0.3333333333333333])
+    # >>> get_info_for_string_column(Series(['abc', 'a0c', 'xyz']))[0]
+    # '[a-z][0-9a-z][a-z]'
+    # >>> get_info_for_string_column(Series(['1234-2314', '1241-1234', '2514-2141']))[0]
+    # '[0-9][0-9][0-9][0-9][\\-][0-9][0-9][0-9][0-9]'
+    """
+    strings = strings.astype(str)
+    string_lengths = strings.str.len()
+    class_bitmasks, other_characters = get_character_classes_info_for_strings(strings.values, string_lengths.values)
+    common_pattern_string = get_common_regex(class_bitmasks, other_characters, string_lengths.max() if len(strings) else 0)
+
+    normalized_frequencies_of_lengths = string_lengths.value_counts(normalize=True).sort_index()
+    lengths = normalized_frequencies_of_lengths.index.tolist()
+    length_probabilities = normalized_frequencies_of_lengths.to_list()
+    return common_pattern_string, lengths, length_probabilities
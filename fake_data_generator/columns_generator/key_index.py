@@ -0,0 +1,137 @@
+import os
+import json
+import shutil
+import struct
+from numpy import array, asarray, memmap, zeros, cumsum, floor, exp, log, minimum, \
+    float64, int64, uint8
+
+KEY_INDEX_MAGIC = b'FDGKEYS1'
+
+
+class KeyIndexWriter:
+    """
+    Writer of the key index of a parent column: file with generated non-null keys which child columns sample from.
+    Numeric and datetime keys are written as one raw array, string keys are written as concatenated UTF-8 bytes
+    followed by offsets of strings. The file ends with JSON footer, its length (uint64) and the magic,
+    so keys are appended batch by batch without keeping them in memory.
+
+    Parameters
+    ----------
+     path: Path of the key index file
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.offsets_file = None
+        self.dtype = None
+        self.number_of_keys = 0
+        self.size_of_data = 0
+
+    def add(self, column_data):
+        keys = column_data.get_decoded_values()
+        if column_data.mask is not None:
+            keys = keys[~column_data.mask]
+        if len(keys) == 0:
+            return
+        if keys.dtype.kind in 'OU':
+            self.add_strings(keys)
+        else:
+            if self.dtype is None:
+                self.dtype = keys.dtype.str
+            keys = keys.astype(self.dtype)
+            self.file.write(keys.tobytes())
+            self.size_of_data += keys.nbytes
+        self.number_of_keys += len(keys)
+
+    def add_strings(self, keys):
+        if self.offsets_file is None:
+            self.dtype = 'utf8'
+            self.offsets_file = open(f'{self.path}.offsets', 'wb')
+        encoded_keys = [str(key).encode('utf-8') for key in keys.tolist()]
+        offsets = self.size_of_data + cumsum([len(encoded_key) for encoded_key in encoded_keys], dtype=int64)
+        self.file.write(b''.join(encoded_keys))
+        self.offsets_file.write(offsets.tobytes())
+        self.size_of_data = int(offsets[-1])
+
+    def close(self):
+        footer = {'dtype': self.dtype, 'number_of_keys': self.number_of_keys, 'size_of_data': self.size_of_data}
+        if self.offsets_file is not None:
+            self.offsets_file.close()
+            self.file.write(zeros(1, dtype=int64).tobytes())
+            with open(f'{self.path}.offsets', 'rb') as offsets_file:
+                shutil.copyfileobj(offsets_file, self.file)
+            os.remove(f'{self.path}.offsets')
+        encoded_footer = json.dumps(footer).encode('utf-8')
+        self.file.write(encoded_footer)
+        self.file.write(struct.pack('<Q', len(encoded_footer)))
+        self.file.write(KEY_INDEX_MAGIC)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class KeyIndex:
+    """
+    Memory-mapped key index written by KeyIndexWriter, keys are read from disk only at sampled positions.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            file.seek(-len(KEY_INDEX_MAGIC) - 8, os.SEEK_END)
+            size_of_footer = struct.unpack('<Q', file.read(8))[0]
+            if file.read(len(KEY_INDEX_MAGIC)) != KEY_INDEX_MAGIC:
+                raise ValueError(f'{path} is not a key index file.')
+            file.seek(-len(KEY_INDEX_MAGIC) - 8 - size_of_footer, os.SEEK_END)
+            footer = json.loads(file.read(size_of_footer).decode('utf-8'))
+        self.dtype = footer['dtype']
+        self.number_of_keys = footer['number_of_keys']
+        self.offsets = None
+        if self.number_of_keys == 0:
+            self.keys = zeros(0)
+        elif self.dtype == 'utf8':
+            self.keys = memmap(path, dtype=uint8, mode='r', shape=(footer['size_of_data'],))
+            self.offsets = memmap(path, dtype=int64, mode='r', offset=footer['size_of_data'],
+                                  shape=(self.number_of_keys + 1,))
+        else:
+            self.keys = memmap(path, dtype=self.dtype, mode='r', shape=(self.number_of_keys,))
+
+    def __len__(self):
+        return self.number_of_keys
+
+    def get_keys(self, positions):
+        if self.offsets is None:
+            return asarray(self.keys[positions])
+        starts, ends = self.offsets[positions], self.offsets[positions + 1]
+        return array([self.keys[start:end].tobytes().decode('utf-8') for start, end in zip(starts.tolist(), ends.tolist())],
+                     dtype=object)
+
+
+def get_positions_of_keys(number_of_keys, output_size, random_generator, skew: float = None):
+    """
+    Function that samples positions of keys in the key index.
+
+    Parameters
+    ----------
+     number_of_keys: Number of keys in the key index
+     output_size: Number of positions to sample
+     random_generator: Numpy random generator
+     skew: Exponent s of Zipf distribution of positions (P(position k) ~ 1 / (k + 1) ** s),
+     keys are sampled uniformly if it is None or 0. Keys generated first are the most frequent ones
+
+    Returns
+    -------
+     Numpy array of positions
+    """
+    if not skew:
+        return random_generator.integers(0, number_of_keys, size=output_size)
+    uniform_sample = random_generator.random(output_size)
+    if skew == 1:
+        ranks = exp(uniform_sample * log(number_of_keys + 1))
+    else:
+        power = 1 - skew
+        ranks = ((float64(number_of_keys + 1) ** power - 1) * uniform_sample + 1) ** (1 / power)
+    return minimum(floor(ranks).astype(int64) - 1, number_of_keys - 1)
@@ -0,0 +1,31 @@
+from numpy import uint64
+from numpy.random import Generator, Philox, SeedSequence
+
+
+def get_random_generator():
+    """
+    Function that returns random generator of a column: numpy Generator over counter-based Philox bit generator,
+    its state can be set to the state of any batch (see get_state_for_rows) without generating batches before it.
+    """
+    return Generator(Philox())
+
+
+def get_state_for_rows(bit_generator, seed, column_index, row_offset):
+    """
+    Function that returns the state of the bit generator of the column for the batch starting at row_offset.
+    Philox is keyed by (seed, column_index) and row_offset is put into the third word of its counter,
+    so every batch has its own stream of 2 ** 128 blocks of random numbers and can be regenerated on its own.
+    The state is set per batch, not per row (generators draw different numbers of random values per row),
+    so values of a row depend on batch_size and only batches of the same batch_size are regenerated equal.
+    Bit generators of other types are seeded with SeedSequence([seed, column_index, row_offset]).
+
+    Examples
+    --------
+    # >>> random_generator = get_random_generator()
+    # >>> random_generator.bit_generator.state = get_state_for_rows(random_generator.bit_generator, 42, 0, 1000)
+    # >>> random_generator.random(3)  # the same numbers whatever rows were generated before
+    """
+    if isinstance(bit_generator, Philox):
+        key = SeedSequence([seed, column_index]).generate_state(2, dtype=uint64)
+        return Philox(counter=row_offset << 128, key=key).state
+    return type(bit_generator)(SeedSequence([seed, column_index, row_offset])).state
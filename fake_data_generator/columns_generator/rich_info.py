@@ -2,7 +2,7 @@ import re
 from datetime import datetime
 from loguru import logger
 from fake_data_generator.columns_generator.column import \
-    Column, CategoricalColumn, ContinuousColumn, StringColumn, CurrentTimestampColumn
+    Column, CategoricalColumn, ContinuousColumn, StringColumn, CurrentTimestampColumn, ForeignKeyColumn, UniqueColumn
 from fake_data_generator.columns_generator.info_for_columns import \
     get_info_for_categorical_column,\
     get_info_for_continuous_column,\
@@ -12,7 +12,10 @@ from fake_data_generator.columns_generator.generators import \
     get_generator_for_categorical_column,\
     get_generator_for_continuous_column, \
     get_generator_for_string_column, \
-    get_generator_for_current_dttm_column
+    get_generator_for_current_dttm_column, \
+    get_generator_for_foreign_key_column, \
+    get_generator_for_unique_column
+from fake_data_generator.columns_generator.random_state import get_random_generator
 
 
 def get_input_data_type(data_type):
@@ -37,11 +40,38 @@ def get_output_data_type(data_type):
         return 'datetime'
 
 
+def get_generator_for_unique_column_info(column_info):
+    return get_generator_for_unique_column(column_name=column_info.get_column_name(),
+                                           get_next_row_index=column_info.get_next_row_index,
+                                           data_type=column_info.get_data_type(),
+                                           method=column_info.get_method(),
+                                           number_of_keys=column_info.get_number_of_keys(),
+                                           min_value=column_info.get_min_value(),
+                                           stride=column_info.get_stride(),
+                                           permutation_seed=column_info.get_permutation_seed())
+
+
 def get_rich_column_info(column_values,
-                         column_info):
+                         column_info,
+                         column_profile=None):
+    """
+    Function that chooses the type of the column and sets its generator by sampled values of the column
+    or by its ColumnProfile (column_values are not used then).
+    """
     column_data_type = column_info.get_data_type()
     column_name = column_info.get_column_name()
-    categorical_column_flag = (isinstance(column_info, CategoricalColumn) or (column_values.nunique() / column_values.count() < 0.2) or column_values.nunique() in [0, 1]) and \
+    random_generator = get_random_generator()
+    if column_profile is not None:
+        number_of_unique_values = column_profile.get_number_of_distinct_values()
+        number_of_non_null_values = column_profile.get_number_of_non_null_values()
+        # values of a truncated summary of heavy hitters are not all values of the column
+        frequencies_are_exact = column_profile.has_exact_frequencies()
+    else:
+        number_of_unique_values = column_values.nunique()
+        number_of_non_null_values = column_values.count()
+        frequencies_are_exact = True
+    categorical_column_flag = (isinstance(column_info, CategoricalColumn) or number_of_unique_values in [0, 1] or
+                               (frequencies_are_exact and number_of_unique_values / number_of_non_null_values < 0.2)) and \
         'decimal' not in column_data_type and type(column_info) in [Column, CategoricalColumn]
 
     if categorical_column_flag:
@@ -49,12 +79,25 @@ def get_rich_column_info(column_values,
         if not isinstance(column_info, CategoricalColumn):
             column_info = CategoricalColumn(column_name=column_name, data_type=column_data_type)
         if column_info.get_values() is None or column_info.get_probabilities() is None:
-            values, probabilities = get_info_for_categorical_column(column_values)
+            values, probabilities = column_profile.get_info_for_categorical_column() if column_profile is not None \
+                else get_info_for_categorical_column(column_values, get_input_data_type(column_data_type))
             column_info.set_values(values)
             column_info.set_probabilities(probabilities)
         generator = get_generator_for_categorical_column(column_name=column_name,
                                                          values=column_info.get_values(),
-                                                         probabilities=column_info.get_probabilities())
+                                                         probabilities=column_info.get_probabilities(),
+                                                         random_generator=random_generator)
+
+    elif isinstance(column_info, ForeignKeyColumn):
+        logger.info(f'Column "{column_name}" — FOREIGN KEY COLUMN')
+        generator = get_generator_for_foreign_key_column(column_name=column_name,
+                                                         key_index_path=column_info.get_key_index_path(),
+                                                         skew=column_info.get_skew(),
+                                                         random_generator=random_generator)
+
+    elif isinstance(column_info, UniqueColumn):
+        logger.info(f'Column "{column_name}" — UNIQUE COLUMN')
+        generator = get_generator_for_unique_column_info(column_info)
 
     elif column_data_type == 'string':
         logger.info(f'Column "{column_name}" — STRING NON CATEGORICAL COLUMN')
@@ -63,17 +106,23 @@ def get_rich_column_info(column_values,
         if not isinstance(column_info, StringColumn):
             column_info = StringColumn(column_name=column_name, data_type=column_data_type)
         if column_info.get_common_regex() is None:
-            common_regex = get_info_for_string_column(column_values.dropna())
+            common_regex, lengths, length_probabilities = column_profile.get_info_for_string_column() if column_profile is not None \
+                else get_info_for_string_column(column_values.dropna())
             column_info.set_common_regex(common_regex)
+            column_info.set_lengths(lengths)
+            column_info.set_length_probabilities(length_probabilities)
         generator = get_generator_for_string_column(column_name=column_name,
-                                                    common_regex=column_info.get_common_regex())
+                                                    common_regex=column_info.get_common_regex(),
+                                                    lengths=column_info.get_lengths(),
+                                                    length_probabilities=column_info.get_length_probabilities(),
+                                                    random_generator=random_generator)
 
     elif isinstance(column_info, CurrentTimestampColumn):
         logger.info(f'Column "{column_name}" — CURRENT_TIMESTAMP COLUMN')
         generator = get_generator_for_current_dttm_column(column_name=column_name)
 
     else:
-        logger.info(f'Column "{column_values.name}" — CONTINUOUS {column_data_type.upper()} COLUMN')
+        logger.info(f'Column "{column_name}" — CONTINUOUS {column_data_type.upper()} COLUMN')
         if not isinstance(column_info, ContinuousColumn):
             column_info = ContinuousColumn(column_name=column_name, data_type=column_data_type)
 
@@ -84,21 +133,27 @@ def get_rich_column_info(column_values,
         if column_info.get_date_flag():
             params = {'date_flag': True}
 
-        if column_info.get_intervals() is None or column_info.get_probabilities():
-            if column_values.nunique() == 1 and 'decimal' in column_data_type:
+        if column_info.get_intervals() is None or column_info.get_probabilities() is None:
+            if number_of_unique_values == 1 and 'decimal' in column_data_type:
                 column_info.set_generator(get_generator_for_nulls(column_name))
                 return column_info
-            intervals, probabilities = get_info_for_continuous_column(column_values=column_values,
-                                                                      input_data_type=get_input_data_type(column_data_type))
+            if column_profile is not None:
+                intervals, probabilities = column_profile.get_info_for_continuous_column()
+            else:
+                intervals, probabilities = get_info_for_continuous_column(column_values=column_values,
+                                                                          input_data_type=get_input_data_type(column_data_type),
+                                                                          density_estimation=column_info.get_density_estimation(),
+                                                                          number_of_bins=column_info.get_number_of_bins())
             column_info.set_intervals(intervals)
             column_info.set_probabilities(probabilities)
         generator = get_generator_for_continuous_column(column_name=column_name,
                                                         intervals=column_info.get_intervals(),
                                                         probabilities=column_info.get_probabilities(),
                                                         output_data_type=get_output_data_type(column_data_type),
-                                                        params=params)
+                                                        params=params,
+                                                        random_generator=random_generator)
 
-    column_info.set_generator(generator)
+    column_info.set_generator(generator, random_generator)
     return column_info
 
 
@@ -107,9 +162,12 @@ def get_columns_info_with_set_generators(rich_columns_info_dict):
     for column_name, column_info_dict in rich_columns_info_dict.items():
         column_type = column_info_dict.get('type')
         column_data_type = column_info_dict.get('data_type')
+        random_generator = get_random_generator()
         generator = None
         if column_type == 'CATEGORICAL':
-            if column_data_type == 'date':
+            if not isinstance(column_info_dict.get('values'), list):
+                values = column_info_dict.get('values')
+            elif column_data_type == 'date':
                 values = list(map(lambda x: datetime.strptime(x, "%Y-%m-%d").date() if isinstance(x, str) else x,
                                   column_info_dict['values']))
             elif column_data_type == 'timestamp':
@@ -118,13 +176,25 @@ def get_columns_info_with_set_generators(rich_columns_info_dict):
             else:
                 values = column_info_dict.get('values')
             probabilities = column_info_dict.get('probabilities')
+            column_info = CategoricalColumn(column_name=column_name,
+                                            data_type=column_data_type,
+                                            values=values,
+                                            probabilities=probabilities,
+                                            null_flags=column_info_dict.get('null_flags'))
             generator = get_generator_for_categorical_column(column_name=column_name,
                                                              values=values,
-                                                             probabilities=probabilities)
+                                                             probabilities=probabilities,
+                                                             random_generator=random_generator,
+                                                             null_flags=column_info_dict.get('null_flags'))
 
         elif column_type == 'CONTINUES':
             intervals = column_info_dict.get('intervals')
             probabilities = column_info_dict.get('probabilities')
+            column_info = ContinuousColumn(column_name=column_name,
+                                           data_type=column_data_type,
+                                           intervals=intervals,
+                                           probabilities=probabilities,
+                                           date_flag=column_info_dict.get('date_flag', False))
             if intervals is None or probabilities is None:
                 generator = get_generator_for_nulls(column_name)
             else:
@@ -139,23 +209,56 @@ def get_columns_info_with_set_generators(rich_columns_info_dict):
                                                                 intervals=intervals,
                                                                 probabilities=probabilities,
                                                                 output_data_type=get_output_data_type(column_data_type),
-                                                                params=params)
+                                                                params=params,
+                                                                random_generator=random_generator)
         elif column_type == 'STRING':
-            if column_info_dict.get('string_copy_of') is not None:
-                column_info = StringColumn(column_name=column_name,
-                                           data_type=column_data_type,
-                                           string_copy_of=column_info_dict.get('string_copy_of'))
+            column_info = StringColumn(column_name=column_name,
+                                       data_type=column_data_type,
+                                       common_regex=column_info_dict.get('common_regex'),
+                                       string_copy_of=column_info_dict.get('string_copy_of'),
+                                       lengths=column_info_dict.get('lengths'),
+                                       length_probabilities=column_info_dict.get('length_probabilities'))
+            if column_info.get_string_copy_of() is not None:
                 columns_info_with_set_generators.append(column_info)
                 continue
-            common_regex = column_info_dict.get('common_regex')
             generator = get_generator_for_string_column(column_name=column_name,
-                                                        common_regex=common_regex)
+                                                        common_regex=column_info.get_common_regex(),
+                                                        lengths=column_info.get_lengths(),
+                                                        length_probabilities=column_info.get_length_probabilities(),
+                                                        random_generator=random_generator)
 
         elif column_type == 'CURRENT_TIMESTAMP':
+            column_info = CurrentTimestampColumn(column_name=column_name, data_type=column_data_type)
             generator = get_generator_for_current_dttm_column(column_name=column_name)
 
-        column_info = Column(column_name=column_name, data_type=column_data_type)
-        column_info.set_generator(generator)
+        elif column_type == 'UNIQUE':
+            column_info = UniqueColumn(column_name=column_name,
+                                       data_type=column_data_type,
+                                       method=column_info_dict.get('method', 'permutation'),
+                                       number_of_keys=column_info_dict.get('number_of_keys'),
+                                       min_value=column_info_dict.get('min_value', 0),
+                                       stride=column_info_dict.get('stride', 1),
+                                       permutation_seed=column_info_dict.get('permutation_seed', 0),
+                                       first_row_index=column_info_dict.get('first_row_index', 0))
+            generator = get_generator_for_unique_column_info(column_info)
+
+        elif column_type == 'FOREIGN_KEY':
+            column_info = ForeignKeyColumn(column_name=column_name,
+                                           data_type=column_data_type,
+                                           referenced_table_name_with_schema=column_info_dict.get('referenced_table_name_with_schema'),
+                                           referenced_column_name=column_info_dict.get('referenced_column_name'),
+                                           key_index_path=column_info_dict.get('key_index_path'),
+                                           skew=column_info_dict.get('skew'))
+            generator = get_generator_for_foreign_key_column(column_name=column_name,
+                                                             key_index_path=column_info.get_key_index_path(),
+                                                             skew=column_info.get_skew(),
+                                                             random_generator=random_generator)
+
+        else:
+            column_info = Column(column_name=column_name, data_type=column_data_type)
+            generator = get_generator_for_nulls(column_name)
+
+        column_info.set_generator(generator, random_generator)
         columns_info_with_set_generators.append(column_info)
 
     return columns_info_with_set_generators
@@ -0,0 +1,288 @@
+from numpy import zeros, concatenate, argmin, diff, histogram, bincount, unique, \
+    maximum, floor, log2, where, exp2, count_nonzero, log, uint8, uint64, int64, float64
+from pandas import Series
+from pandas.util import hash_array
+from fake_data_generator.columns_generator.rich_info import get_input_data_type
+from fake_data_generator.columns_generator.info_for_columns import \
+    get_float_values, get_character_classes_info_for_strings, get_merged_class_bitmasks, get_common_regex, \
+    get_info_for_categorical_column_from_frequencies
+
+HYPER_LOG_LOG_PRECISION = 12
+MAX_NUMBER_OF_HEAVY_HITTERS = 10000
+MAX_NUMBER_OF_HISTOGRAM_BINS = 100
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch of the number of distinct values. Two sketches are merged by maximum of their registers.
+
+    Parameters
+    ----------
+     precision: Number of bits of a hash choosing a register, relative error is about 1.04 / sqrt(2 ** precision)
+    """
+    def __init__(self, precision: int = HYPER_LOG_LOG_PRECISION):
+        self.precision = precision
+        self.registers = zeros(1 << precision, dtype=uint8)
+
+    def update(self, hashes):
+        hashes = hashes.astype(uint64)
+        indexes = (hashes >> uint64(64 - self.precision)).astype(int64)
+        remaining_bits = (hashes << uint64(self.precision)) | uint64(1 << (self.precision - 1))
+        high_bits = (remaining_bits >> uint64(32)).astype(float64)
+        low_bits = (remaining_bits & uint64(0xFFFFFFFF)).astype(float64)
+        bit_lengths = where(high_bits > 0,
+                            33 + floor(log2(maximum(high_bits, 1))),
+                            1 + floor(log2(maximum(low_bits, 1))))
+        ranks = (65 - bit_lengths).astype(uint8)
+        maximum.at(self.registers, indexes, ranks)
+
+    def merge(self, other):
+        self.registers = maximum(self.registers, other.registers)
+        return self
+
+    def count(self):
+        number_of_registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / number_of_registers)
+        estimate = alpha * number_of_registers ** 2 / exp2(-self.registers.astype(float64)).sum()
+        number_of_empty_registers = number_of_registers - count_nonzero(self.registers)
+        if estimate <= 2.5 * number_of_registers and number_of_empty_registers > 0:
+            estimate = number_of_registers * log(number_of_registers / number_of_empty_registers)
+        return int(round(estimate))
+
+
+class HeavyHitters:
+    """
+    Misra-Gries summary of the most frequent values. Counts are exact while the number of distinct values
+    does not exceed max_number_of_values, otherwise the summary is truncated: it keeps the values with frequency above
+    n / max_number_of_values with counts reduced by at most n / max_number_of_values.
+    Two summaries are merged by adding counts and reducing the result to max_number_of_values.
+    """
+    def __init__(self, max_number_of_values: int = MAX_NUMBER_OF_HEAVY_HITTERS):
+        self.max_number_of_values = max_number_of_values
+        self.counts = Series(dtype=float64)
+        self.is_truncated = False
+
+    def update(self, counts_of_values: Series):
+        self.counts = self.counts.add(counts_of_values.astype(float64), fill_value=0) if len(self.counts) else counts_of_values.astype(float64)
+        if len(self.counts) > self.max_number_of_values:
+            threshold = self.counts.nlargest(self.max_number_of_values + 1).iloc[-1]
+            self.counts = self.counts - threshold
+            self.counts = self.counts[self.counts > 0]
+            self.is_truncated = True
+
+    def merge(self, other):
+        self.update(other.counts)
+        self.is_truncated = self.is_truncated or other.is_truncated
+        return self
+
+    def get_counts(self):
+        return self.counts
+
+
+class StreamingHistogram:
+    """
+    Streaming histogram of Ben-Haim and Tom-Tov: at most max_number_of_bins centroids with counts,
+    the closest centroids are merged when there are too many of them.
+    """
+    def __init__(self, max_number_of_bins: int = MAX_NUMBER_OF_HISTOGRAM_BINS):
+        self.max_number_of_bins = max_number_of_bins
+        self.centroids = zeros(0, dtype=float64)
+        self.counts = zeros(0, dtype=float64)
+        self.min_value = None
+        self.max_value = None
+
+    def add_bins(self, centroids, counts):
+        centroids = concatenate([self.centroids, centroids])
+        counts = concatenate([self.counts, counts])
+        unique_centroids, inverse_indexes = unique(centroids, return_inverse=True)
+        counts = bincount(inverse_indexes.ravel(), weights=counts, minlength=len(unique_centroids))
+        centroids = unique_centroids
+        while len(centroids) > self.max_number_of_bins:
+            index = int(argmin(diff(centroids)))
+            merged_count = counts[index] + counts[index + 1]
+            merged_centroid = (centroids[index] * counts[index] + centroids[index + 1] * counts[index + 1]) / merged_count
+            centroids = concatenate([centroids[:index], [merged_centroid], centroids[index + 2:]])
+            counts = concatenate([counts[:index], [merged_count], counts[index + 2:]])
+        self.centroids, self.counts = centroids, counts
+
+    def update(self, float_values):
+        if len(float_values) == 0:
+            return
+        self.min_value = float_values.min() if self.min_value is None else min(self.min_value, float_values.min())
+        self.max_value = float_values.max() if self.max_value is None else max(self.max_value, float_values.max())
+        unique_values, counts = unique(float_values, return_counts=True)
+        if len(unique_values) <= self.max_number_of_bins:
+            self.add_bins(unique_values, counts.astype(float64))
+            return
+        counts, bin_edges = histogram(float_values, bins=self.max_number_of_bins)
+        sums, _ = histogram(float_values, bins=bin_edges, weights=float_values)
+        non_empty_bins = counts > 0
+        self.add_bins(sums[non_empty_bins] / counts[non_empty_bins], counts[non_empty_bins].astype(float64))
+
+    def merge(self, other):
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+            self.add_bins(other.centroids, other.counts)
+        return self
+
+    def get_intervals_and_probabilities(self):
+        """
+        Intervals between midpoints of neighbouring centroids (the first and the last are bounded by minimum and
+        maximum) with probabilities equal to normalized counts of centroids.
+        """
+        if len(self.centroids) == 0:
+            return None, None
+        bounds = concatenate([[self.min_value], (self.centroids[:-1] + self.centroids[1:]) / 2, [self.max_value]])
+        probabilities = self.counts / self.counts.sum()
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist())), probabilities.tolist()
+
+
+class StringStatistics:
+    """
+    Character classes met at every position of strings and counts of lengths of strings.
+    """
+    def __init__(self):
+        self.class_bitmasks = zeros(0, dtype=uint8)
+        self.other_characters = set()
+        self.length_counts = Series(dtype=float64)
+
+    def update(self, strings: Series):
+        strings = strings.astype(str)
+        string_lengths = strings.str.len()
+        chunk_class_bitmasks, chunk_other_characters = get_character_classes_info_for_strings(strings.values, string_lengths.values)
+        self.class_bitmasks = get_merged_class_bitmasks(self.class_bitmasks, chunk_class_bitmasks)
+        self.other_characters |= chunk_other_characters
+        self.length_counts = self.length_counts.add(string_lengths.value_counts().astype(float64), fill_value=0)
+
+    def merge(self, other):
+        self.class_bitmasks = get_merged_class_bitmasks(self.class_bitmasks, other.class_bitmasks)
+        self.other_characters |= other.other_characters
+        self.length_counts = self.length_counts.add(other.length_counts, fill_value=0)
+        return self
+
+    def get_info_for_string_column(self):
+        length_counts = self.length_counts.sort_index()
+        max_length = int(length_counts.index.max()) if len(length_counts) else 0
+        common_regex = get_common_regex(self.class_bitmasks, self.other_characters, max_length)
+        return common_regex, [int(length) for length in length_counts.index], (length_counts / length_counts.sum()).tolist()
+
+
+class ColumnProfile:
+    """
+    Mergeable profile of one column built from chunks of its values: number of rows and nulls,
+    HyperLogLog distinct count, heavy hitters, streaming histogram (for numbers, dates and timestamps)
+    and character classes with lengths (for strings). Memory usage does not depend on the number of rows.
+
+    Parameters
+    ----------
+     data_type: Data type of the column in the source table
+    """
+    def __init__(self,
+                 data_type: str,
+                 hyper_log_log_precision: int = HYPER_LOG_LOG_PRECISION,
+                 max_number_of_heavy_hitters: int = MAX_NUMBER_OF_HEAVY_HITTERS,
+                 max_number_of_histogram_bins: int = MAX_NUMBER_OF_HISTOGRAM_BINS):
+        self.data_type = data_type
+        self.input_data_type = get_input_data_type(data_type)
+        self.number_of_rows = 0
+        self.number_of_nulls = 0
+        self.hyper_log_log = HyperLogLog(hyper_log_log_precision)
+        self.heavy_hitters = HeavyHitters(max_number_of_heavy_hitters)
+        self.histogram = StreamingHistogram(max_number_of_histogram_bins) if self.input_data_type is not None else None
+        self.string_statistics = StringStatistics() if data_type == 'string' else None
+
+    def update(self, column_values: Series):
+        column_values_without_null = column_values.dropna()
+        self.number_of_rows += len(column_values)
+        self.number_of_nulls += len(column_values) - len(column_values_without_null)
+        if len(column_values_without_null) == 0:
+            return
+        if self.input_data_type is not None:
+            float_values = get_float_values(column_values_without_null, self.input_data_type)
+            self.hyper_log_log.update(hash_array(float_values))
+            self.histogram.update(float_values)
+        else:
+            self.hyper_log_log.update(hash_array(column_values_without_null.astype(str).to_numpy(dtype=object)))
+        self.heavy_hitters.update(column_values_without_null.value_counts())
+        if self.string_statistics is not None:
+            self.string_statistics.update(column_values_without_null)
+
+    def merge(self, other):
+        self.number_of_rows += other.number_of_rows
+        self.number_of_nulls += other.number_of_nulls
+        self.hyper_log_log.merge(other.hyper_log_log)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        if self.histogram is not None:
+            self.histogram.merge(other.histogram)
+        if self.string_statistics is not None:
+            self.string_statistics.merge(other.string_statistics)
+        return self
+
+    def get_number_of_non_null_values(self):
+        return self.number_of_rows - self.number_of_nulls
+
+    def get_number_of_distinct_values(self):
+        if self.get_number_of_non_null_values() == 0:
+            return 0
+        return max(1, min(self.hyper_log_log.count(), self.get_number_of_non_null_values()))
+
+    def has_exact_frequencies(self):
+        return not self.heavy_hitters.is_truncated
+
+    def get_info_for_categorical_column(self):
+        """
+        Method that returns values of heavy hitters (with None for nulls) and their probabilities relative to the number
+        of rows. Rows not counted by a truncated summary are spread evenly over its values, as every count is reduced
+        by the same amount.
+        """
+        counts = self.heavy_hitters.get_counts()
+        number_of_uncounted_values = self.get_number_of_non_null_values() - counts.sum()
+        if len(counts) and number_of_uncounted_values > 0:
+            counts = counts + number_of_uncounted_values / len(counts)
+        if self.number_of_nulls > 0:
+            counts = concatenate_counts_with_nulls(counts, self.number_of_nulls)
+        return get_info_for_categorical_column_from_frequencies((counts / self.number_of_rows).sort_values(ascending=False),
+                                                                self.input_data_type)
+
+    def get_info_for_continuous_column(self):
+        return self.histogram.get_intervals_and_probabilities()
+
+    def get_info_for_string_column(self):
+        return self.string_statistics.get_info_for_string_column()
+
+
+def concatenate_counts_with_nulls(counts, number_of_nulls):
+    return Series(counts.tolist() + [float(number_of_nulls)], index=counts.index.tolist() + [None], dtype=float64)
+
+
+def get_column_profiles(chunks_of_column_values, column_name_to_data_type):
+    """
+    Function that builds profiles of columns from chunks of their values.
+
+    Parameters
+    ----------
+     chunks_of_column_values: Iterator of dicts (or DataFrames) mapping column names to Series of values
+     column_name_to_data_type: Dict of column names and their data types in the source table
+
+    Returns
+    -------
+     Dict of column names and ColumnProfile objects
+    """
+    column_name_to_profile = {column_name: ColumnProfile(data_type) for column_name, data_type in column_name_to_data_type.items()}
+    for chunk_of_column_values in chunks_of_column_values:
+        for column_name, column_profile in column_name_to_profile.items():
+            column_profile.update(chunk_of_column_values[column_name])
+    return column_name_to_profile
+
+
+def merge_column_profiles(column_name_to_profile, other_column_name_to_profile):
+    """
+    Function that merges profiles of the same columns built from different parts of a table (partitions, chunks).
+    """
+    for column_name, column_profile in other_column_name_to_profile.items():
+        if column_name in column_name_to_profile:
+            column_name_to_profile[column_name].merge(column_profile)
+        else:
+            column_name_to_profile[column_name] = column_profile
+    return column_name_to_profile
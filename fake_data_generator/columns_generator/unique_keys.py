@@ -0,0 +1,128 @@
+from numpy import arange, asarray, array, uint64, int64
+from numpy.random import SeedSequence
+
+UNIQUE_KEY_METHODS = ('permutation', 'sequence')
+NUMBER_OF_FEISTEL_ROUNDS = 4
+MAX_VALUES_OF_INTEGER_TYPES = {
+    'tinyint': 2 ** 7 - 1,
+    'smallint': 2 ** 15 - 1,
+    'int': 2 ** 31 - 1,
+    'integer': 2 ** 31 - 1,
+    'bigint': 2 ** 63 - 1,
+}
+
+
+def get_default_number_of_keys(data_type, min_value):
+    """
+    Function that returns the number of keys from min_value up to the maximum value of the integer data type
+    (or up to 2 ** 63 - 1 for other data types).
+    """
+    max_value = MAX_VALUES_OF_INTEGER_TYPES.get(data_type, MAX_VALUES_OF_INTEGER_TYPES['bigint'])
+    return max_value - min_value + 1
+
+
+def get_default_number_of_keys_of_sequence(data_type, min_value, stride):
+    """
+    Function that returns the number of keys min_value + stride * row index within the range of the integer data type
+    (or of bigint for other data types).
+    """
+    max_value = MAX_VALUES_OF_INTEGER_TYPES.get(data_type, MAX_VALUES_OF_INTEGER_TYPES['bigint'])
+    if stride > 0:
+        return max(0, (max_value - min_value) // stride + 1)
+    return max(0, (min_value + max_value + 1) // -stride + 1)
+
+
+def get_feistel_round_keys(permutation_seed):
+    return SeedSequence(permutation_seed).generate_state(NUMBER_OF_FEISTEL_ROUNDS, dtype=uint64)
+
+
+def get_feistel_round_function(right_halves, round_key, half_mask):
+    mixed_values = (right_halves ^ round_key) * uint64(0x9E3779B97F4A7C15)
+    mixed_values ^= mixed_values >> uint64(32)
+    mixed_values *= uint64(0xBF58476D1CE4E5B9)
+    mixed_values ^= mixed_values >> uint64(29)
+    return mixed_values & half_mask
+
+
+def get_feistel_permutation(values, number_of_half_bits, round_keys):
+    half_mask = uint64((1 << number_of_half_bits) - 1)
+    left_halves, right_halves = values >> uint64(number_of_half_bits), values & half_mask
+    for round_key in round_keys:
+        left_halves, right_halves = right_halves, left_halves ^ get_feistel_round_function(right_halves, round_key, half_mask)
+    return (left_halves << uint64(number_of_half_bits)) | right_halves
+
+
+def get_permuted_indexes(row_indexes, number_of_keys, permutation_seed=0):
+    """
+    Function that maps row indexes from [0, number_of_keys) to distinct indexes from the same range by the keyed
+    bijective permutation: balanced Feistel network over the smallest domain of 2 ** (2 * h) values containing the range,
+    values falling out of the range are permuted again (cycle walking) until they are inside it.
+
+    Parameters
+    ----------
+     row_indexes: Numpy array of row indexes
+     number_of_keys: Size of the range of keys (at most 2 ** 64)
+     permutation_seed: Seed of keys of Feistel rounds, the permutation is the same for the same seed
+
+    Returns
+    -------
+     Numpy array of permuted indexes (uint64)
+
+    Examples
+    --------
+    # >>> sorted(get_permuted_indexes(numpy.arange(10), 10).tolist())
+    # [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    """
+    number_of_half_bits = max(1, -(-max(1, int(number_of_keys - 1).bit_length()) // 2))
+    round_keys = get_feistel_round_keys(permutation_seed)
+    permuted_indexes = get_feistel_permutation(asarray(row_indexes, dtype=uint64), number_of_half_bits, round_keys)
+    out_of_range = permuted_indexes >= uint64(number_of_keys)
+    while out_of_range.any():
+        permuted_indexes[out_of_range] = get_feistel_permutation(permuted_indexes[out_of_range], number_of_half_bits, round_keys)
+        out_of_range[out_of_range] = permuted_indexes[out_of_range] >= uint64(number_of_keys)
+    return permuted_indexes
+
+
+def get_unique_keys(first_row_index, output_size, data_type, method='permutation', number_of_keys=None,
+                    min_value=0, stride=1, permutation_seed=0):
+    """
+    Function that returns keys of rows first_row_index, ..., first_row_index + output_size - 1.
+    A key depends only on the index of its row, so keys are unique across batches, processes and resumed runs
+    without keeping issued keys in memory.
+
+    Parameters
+    ----------
+     first_row_index: Index of the first row of the batch
+     output_size: Number of rows in the batch
+     data_type: Data type of the column (keys of string columns are converted into strings)
+     method: 'permutation' – min_value + keyed permutation of the row index over [0, number_of_keys),
+     'sequence' – min_value + stride * row index
+     number_of_keys: Size of the range of keys, by default the range up to the maximum value of the data type
+     (for 'sequence' – the number of keys of the sequence within the range of the data type)
+     min_value: The smallest key
+     stride: Step of the sequence for 'sequence'
+     permutation_seed: Seed of the permutation for 'permutation'
+
+    Returns
+    -------
+     Numpy array of keys
+    """
+    if method not in UNIQUE_KEY_METHODS:
+        raise ValueError(f'Unknown method of unique keys {method}, expected one of {UNIQUE_KEY_METHODS}.')
+    row_indexes = arange(first_row_index, first_row_index + output_size, dtype=uint64)
+    if method == 'permutation':
+        number_of_keys = number_of_keys or get_default_number_of_keys(data_type, min_value)
+        if first_row_index + output_size > number_of_keys:
+            raise ValueError(f'All {number_of_keys} unique keys were used, increase number_of_keys.')
+        keys = get_permuted_indexes(row_indexes, number_of_keys, permutation_seed).astype(int64) + min_value
+    else:
+        if stride == 0:
+            raise ValueError('Stride of the sequence of unique keys must not be 0.')
+        max_number_of_keys = get_default_number_of_keys_of_sequence(data_type, min_value, stride)
+        number_of_keys = min(number_of_keys, max_number_of_keys) if number_of_keys else max_number_of_keys
+        if first_row_index + output_size > number_of_keys:
+            raise ValueError(f'All {number_of_keys} unique keys were used, increase number_of_keys.')
+        keys = row_indexes.astype(int64) * stride + min_value
+    if data_type == 'string':
+        return array(keys.astype(str), dtype=object)
+    return keys
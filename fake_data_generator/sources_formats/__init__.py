@@ -1,3 +1,11 @@
 from fake_data_generator.sources_formats.generate_fake_table import generate_fake_table
 from fake_data_generator.sources_formats.generate_table_profile import generate_table_profile
 from fake_data_generator.sources_formats.generate_table_from_profile import generate_table_from_profile
+from fake_data_generator.sources_formats.generate_tables_from_profiles import generate_tables_from_profiles
+from fake_data_generator.sources_formats.generate_tables_from_manifest import generate_tables_from_manifest
+from fake_data_generator.sources_formats.async_generation import \
+    generate_table_from_profile_async, generate_tables_from_profiles_async
+from fake_data_generator.sources_formats.sinks import ParquetSink, ArrowSink, CsvSink
+from fake_data_generator.sources_formats.profile_cache import ProfileCache
+from fake_data_generator.sources_formats.metrics import InsertionCallback, LoggingCallback, TimingCallback, ProfilingCallback
+from fake_data_generator.sources_formats.backends import register_backend
@@ -0,0 +1,197 @@
+import asyncio
+from time import perf_counter
+from loguru import logger
+from fake_data_generator.columns_generator import get_batches_of_fake_data, get_columns_info_with_set_generators
+from fake_data_generator.columns_generator.key_index import KeyIndexWriter
+from fake_data_generator.sources_formats.backends import get_backend_function
+from fake_data_generator.sources_formats.metrics import InsertionMetrics, BatchMetrics, get_callbacks
+from fake_data_generator.sources_formats.helper_functions import get_create_query, get_batches_with_indexed_keys
+from fake_data_generator.sources_formats.generate_table_from_profile import get_rich_columns_info_dict_of_profile
+from fake_data_generator.sources_formats.generate_tables_from_profiles import \
+    get_foreign_key_columns, get_tables_in_order_of_references, get_tables_with_key_index_paths, get_params_of_table
+
+
+async def execute_insertion_async(async_engine,
+                                  dest_table_name_with_schema,
+                                  number_of_rows_to_insert,
+                                  columns_info_with_set_generators,
+                                  batch_size,
+                                  number_of_processes: int = None,
+                                  seed: int = None,
+                                  queue_size: int = 2,
+                                  transaction_size: int = None,
+                                  key_index_paths: dict = None,
+                                  callbacks: list = None,
+                                  executor=None):
+    """
+    Coroutine that generates fake data batch by batch and inserts it into the table through the AsyncEngine.
+    Batches (and their rows prepared for insertion) are generated in the executor and put into a queue of queue_size batches,
+    while the event loop awaits insertion of the previous ones, so it is free to serve other coroutines.
+
+    Parameters
+    ----------
+     async_engine: SQLAlchemy AsyncEngine
+     executor: Executor in which batches are generated (default executor of the event loop if it is not specified).
+     Batches are still generated by number_of_processes processes if it is specified, the executor only waits for them
+     other parameters: see execute_insertion
+
+    Returns
+    -------
+     Number of inserted rows
+    """
+    loop = asyncio.get_running_loop()
+    callbacks = get_callbacks(callbacks)
+    metrics = InsertionMetrics(dest_table_name_with_schema, number_of_rows_to_insert)
+    for callback in callbacks:
+        callback.on_start(metrics)
+
+    batches_of_fake_data = get_batches_of_fake_data(number_of_rows=number_of_rows_to_insert,
+                                                    batch_size=batch_size,
+                                                    columns_info_with_set_generators=columns_info_with_set_generators,
+                                                    number_of_processes=number_of_processes,
+                                                    seed=seed)
+    key_index_writers = {column_name: KeyIndexWriter(key_index_path) for column_name, key_index_path in (key_index_paths or {}).items()}
+    if key_index_writers:
+        batches_of_fake_data = get_batches_with_indexed_keys(batches_of_fake_data, key_index_writers)
+    batch_queue = asyncio.Queue(maxsize=queue_size)
+    generation = None
+
+    def get_next_batch_with_rows(opened_loader):
+        batch_of_fake_data = next(batches_of_fake_data, None)
+        return None if batch_of_fake_data is None else (batch_of_fake_data, opened_loader.get_rows(batch_of_fake_data))
+
+    async def produce(opened_loader):
+        nonlocal generation
+        try:
+            while True:
+                generation = loop.run_in_executor(executor, get_next_batch_with_rows, opened_loader)
+                batch_with_rows = await asyncio.shield(generation)
+                await batch_queue.put(batch_with_rows)
+                if batch_with_rows is None:
+                    return
+        except Exception as error:
+            await batch_queue.put(error)
+
+    get_async_loader = get_backend_function(async_engine, 'get_async_loader')
+    try:
+        async with get_async_loader(async_engine, dest_table_name_with_schema, columns_info_with_set_generators,
+                                    transaction_size=transaction_size) as opened_loader:
+            producer = asyncio.create_task(produce(opened_loader))
+            try:
+                while True:
+                    batch_with_rows = await batch_queue.get()
+                    if batch_with_rows is None:
+                        break
+                    if isinstance(batch_with_rows, Exception):
+                        raise batch_with_rows
+                    batch_of_fake_data, rows = batch_with_rows
+                    write_start = perf_counter()
+                    await opened_loader.insert(batch_of_fake_data, rows)
+                    batch_metrics = BatchMetrics(number_of_rows=batch_of_fake_data.number_of_rows,
+                                                 number_of_bytes=batch_of_fake_data.get_memory_usage(),
+                                                 generation_seconds=batch_of_fake_data.generation_seconds,
+                                                 write_seconds=perf_counter() - write_start,
+                                                 column_name_to_seconds=batch_of_fake_data.column_name_to_seconds)
+                    metrics.add_batch(batch_metrics)
+                    for callback in callbacks:
+                        callback.on_batch_inserted(metrics, batch_metrics)
+            finally:
+                producer.cancel()
+                # the batch being generated in the executor is awaited, so the generator is not closed while it runs
+                if generation is not None:
+                    await asyncio.wait([generation])
+    finally:
+        batches_of_fake_data.close()
+        for key_index_writer in key_index_writers.values():
+            key_index_writer.close()
+    metrics.finish()
+    for callback in callbacks:
+        callback.on_finish(metrics)
+    return metrics.number_of_rows_inserted
+
+
+async def generate_table_from_profile_async(async_engine,
+                                            source_table_profile_path: str,
+                                            dest_table_name_with_schema: str,
+                                            number_of_rows_to_insert: int,
+                                            columns_info=None,
+                                            batch_size=100,
+                                            number_of_processes: int = None,
+                                            seed: int = None,
+                                            queue_size: int = 2,
+                                            transaction_size: int = None,
+                                            key_index_paths: dict = None,
+                                            callbacks: list = None,
+                                            executor=None):
+    """
+    Asyncio variant of generate_table_from_profile working with SQLAlchemy AsyncEngine (see execute_insertion_async).
+
+    Examples
+    --------
+    # >>> async_engine = create_async_engine('sqlite+aiosqlite:///test.db')
+    # >>> await generate_table_from_profile_async(async_engine, 'test.table_name.json', 'main.gen_table_name', 100000,
+    # ...                                         batch_size=10000)
+    """
+    loop = asyncio.get_running_loop()
+    rich_columns_info_dict = await loop.run_in_executor(executor, get_rich_columns_info_dict_of_profile,
+                                                        source_table_profile_path, columns_info)
+    await get_backend_function(async_engine, 'execute_query_async')(async_engine, get_create_query(dest_table_name_with_schema,
+                                                                                                   rich_columns_info_dict))
+    columns_info_with_set_generators = await loop.run_in_executor(executor, get_columns_info_with_set_generators, rich_columns_info_dict)
+    return await execute_insertion_async(async_engine, dest_table_name_with_schema, number_of_rows_to_insert,
+                                         columns_info_with_set_generators, batch_size,
+                                         number_of_processes=number_of_processes, seed=seed, queue_size=queue_size,
+                                         transaction_size=transaction_size, key_index_paths=key_index_paths,
+                                         callbacks=callbacks, executor=executor)
+
+
+async def generate_tables_from_profiles_async(async_engine,
+                                              tables: list,
+                                              key_index_directory: str,
+                                              seed: int = None,
+                                              max_concurrency: int = 4,
+                                              **insertion_params):
+    """
+    Asyncio variant of generate_tables_from_profiles: at most max_concurrency tables are generated at the same time
+    on one event loop, a table starts as soon as all tables referenced by it are generated.
+    Tables get the same seeds as in generate_tables_from_profiles, so equal seeds give equal data.
+
+    Parameters
+    ----------
+     async_engine: SQLAlchemy AsyncEngine
+     tables: List of dicts with parameters of generate_table_from_profile_async for every table
+     key_index_directory: Directory of key index files (created if it does not exist)
+     seed: Seed from which seeds of tables are derived
+     max_concurrency: Maximum number of tables generated at the same time
+     insertion_params: Parameters of generate_table_from_profile_async common for all tables
+
+    Returns
+    -------
+     Dict of names of tables and numbers of inserted rows
+    """
+    tables, table_name_to_key_column_names = get_tables_with_key_index_paths(tables, key_index_directory)
+    ordered_tables = get_tables_in_order_of_references(tables)
+    table_name_to_generation = {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def generate_table(table, table_index):
+        for column_info in get_foreign_key_columns(table):
+            referenced_generation = table_name_to_generation.get(column_info.get_referenced_table_name_with_schema())
+            if referenced_generation is not None:
+                await asyncio.shield(referenced_generation)
+        async with semaphore:
+            logger.info(f'Start generating table {table["dest_table_name_with_schema"]}.')
+            return await generate_table_from_profile_async(async_engine, **get_params_of_table(table, table_index, insertion_params, seed,
+                                                                                               key_index_directory,
+                                                                                               table_name_to_key_column_names))
+
+    for table_index, table in enumerate(ordered_tables):
+        table_name_to_generation[table['dest_table_name_with_schema']] = asyncio.ensure_future(generate_table(table, table_index))
+    try:
+        await asyncio.gather(*table_name_to_generation.values())
+    except BaseException:
+        for generation in table_name_to_generation.values():
+            generation.cancel()
+        await asyncio.gather(*table_name_to_generation.values(), return_exceptions=True)
+        raise
+    return {table_name: generation.result() for table_name, generation in table_name_to_generation.items()}
@@ -0,0 +1,69 @@
+from importlib import import_module
+
+BACKEND_MODULES_FOR_CONNECTION_TYPES = {
+    'sqlalchemy.engine.base.Engine': 'fake_data_generator.sources_formats.sqlalchemy_backend',
+    'sqlalchemy.ext.asyncio.engine.AsyncEngine': 'fake_data_generator.sources_formats.sqlalchemy_async_backend',
+    'pyspark.sql.session.SparkSession': 'fake_data_generator.sources_formats.spark_backend',
+    'fake_data_generator.sources_formats.sinks.Sink': 'fake_data_generator.sources_formats.sinks',
+}
+
+
+def get_full_name_of_type(connection_type):
+    return f'{connection_type.__module__}.{connection_type.__qualname__}'
+
+
+def register_backend(connection_type_name: str, backend_module_name: str):
+    """
+    Function that registers the backend module for connections of the type (and of its subclasses).
+    The module is imported only when a connection of the type is used for the first time. It can define functions
+    get_query_result_in_df, execute_query, get_sample_of_table, get_column_profiles_of_table, get_loader,
+    execute_insertion_on_executors, create_staging_table, merge_staging_tables and drop_staging_tables
+    with the same parameters as the functions of sqlalchemy_backend and spark_backend
+    (and execute_query_async and get_async_loader as sqlalchemy_async_backend for the asyncio API).
+
+    Parameters
+    ----------
+     connection_type_name: Full name of the class of connections (module and qualified name of the class)
+     backend_module_name: Full name of the backend module
+
+    Examples
+    --------
+    # >>> register_backend('my_package.connections.MyConnection', 'my_package.my_backend')
+    """
+    BACKEND_MODULES_FOR_CONNECTION_TYPES[connection_type_name] = backend_module_name
+
+
+def get_backend(conn):
+    """
+    Function that returns the backend module for the connection. The backend is chosen by the names of the class
+    of the connection and of its base classes, so libraries of other backends are not imported to check the type.
+
+    Parameters
+    ----------
+     conn: SQLAlchemy engine, Spark session, file sink or connection of a registered backend
+
+    Returns
+    -------
+     Backend module
+    """
+    for connection_type in type(conn).__mro__:
+        backend_module_name = BACKEND_MODULES_FOR_CONNECTION_TYPES.get(get_full_name_of_type(connection_type))
+        if backend_module_name is not None:
+            return import_module(backend_module_name)
+    raise TypeError(f'Connection of type {get_full_name_of_type(type(conn))} is not supported, '
+                    f'expected one of {list(BACKEND_MODULES_FOR_CONNECTION_TYPES.keys())}.')
+
+
+def get_backend_function(conn, function_name):
+    """
+    Function that returns the function of the backend of the connection, it raises TypeError if the backend does not have it
+    (e.g. file sinks cannot be sampled).
+    """
+    backend = get_backend(conn)
+    if not hasattr(backend, function_name):
+        raise TypeError(f'Connection of type {get_full_name_of_type(type(conn))} does not support {function_name}.')
+    return getattr(backend, function_name)
+
+
+def has_backend_function(conn, function_name):
+    return hasattr(get_backend(conn), function_name)
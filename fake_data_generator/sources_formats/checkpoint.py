@@ -0,0 +1,139 @@
+import os
+import json
+import hashlib
+from threading import Lock
+from loguru import logger
+from numpy import asarray, ndarray, generic
+from numpy.random import SeedSequence
+
+
+def update_hash_of_object(hash_object, obj):
+    if isinstance(obj, dict):
+        hash_object.update(b'{')
+        for key in sorted(obj, key=str):
+            update_hash_of_object(hash_object, str(key))
+            update_hash_of_object(hash_object, obj[key])
+        hash_object.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        hash_object.update(b'[')
+        for item in obj:
+            update_hash_of_object(hash_object, item)
+        hash_object.update(b']')
+    elif isinstance(obj, ndarray) or hasattr(obj, '__array__') and not isinstance(obj, generic):
+        array = asarray(obj)
+        if array.dtype.kind == 'O':
+            update_hash_of_object(hash_object, array.tolist())
+        else:
+            hash_object.update(f'array({array.dtype.str},{array.shape})'.encode())
+            hash_object.update(array.tobytes())
+    else:
+        value = obj.item() if isinstance(obj, generic) else obj
+        hash_object.update(json.dumps(value, default=str).encode())
+        hash_object.update(b',')
+
+
+def get_hash_of_generator_spec(generator_spec):
+    """
+    Function that returns hash of the content of the generator spec: arrays (memory-mapped arrays and lazily decoded
+    strings of binary profiles too) are hashed by all their values, not by their text representation.
+    """
+    hash_object = hashlib.sha256()
+    update_hash_of_object(hash_object, generator_spec)
+    return hash_object.hexdigest()
+
+
+class Checkpoint:
+    """
+    Progress of insertion of fake data into the table kept in a small JSON state file.
+    Batches are identified by row offsets of their first rows. The file holds the offset of the first row
+    which is not committed and offsets of batches committed after it (writers commit batches out of order),
+    it is replaced atomically after every commit of the loader.
+    The file also holds the hash of the generator spec (profiles of columns), so the insertion is not resumed with changed
+    profiles or columns_info, which would mix rows of two different datasets in one table.
+    Insertion restarted with the same checkpoint generates and inserts only batches which were not committed,
+    and as random state of every batch depends only on the seed and its row offset, the table gets the same data
+    as after an uninterrupted insertion. Rows depend on batch_size too, so it is saved and checked with the seed.
+    The state file is removed after all rows are inserted.
+
+    Parameters
+    ----------
+     checkpoint_path: Path of the state file
+     dest_table_name_with_schema: Name of the table with schema in which rows are inserted
+     number_of_rows_to_insert: Number of rows to insert
+     batch_size: Maximum number of rows in one batch
+     generator_spec: Generator spec of columns (see get_generator_spec), only its hash is saved
+     seed: Seed of generation, if it is not specified the seed saved in the state file is used
+     (or a new random seed is saved in it)
+    """
+    def __init__(self,
+                 checkpoint_path: str,
+                 dest_table_name_with_schema: str,
+                 number_of_rows_to_insert: int,
+                 batch_size: int,
+                 generator_spec: dict,
+                 seed: int = None):
+        self.checkpoint_path = checkpoint_path
+        self.params = {'dest_table_name_with_schema': dest_table_name_with_schema,
+                       'number_of_rows_to_insert': number_of_rows_to_insert,
+                       'batch_size': batch_size,
+                       'generator_spec_hash': get_hash_of_generator_spec(generator_spec)}
+        self.seed = seed
+        self.first_uncommitted_row_offset = 0
+        self.committed_row_offsets = set()
+        self.lock = Lock()
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as file:
+                state = json.load(file)
+            for name, value in self.params.items():
+                if state.get(name) != value:
+                    raise ValueError(f'Checkpoint {checkpoint_path} was saved for {name}={state.get(name)!r}, not {value!r}.')
+            if seed is not None and seed != state['seed']:
+                raise ValueError(f'Checkpoint {checkpoint_path} was saved for seed={state["seed"]!r}, not {seed!r}.')
+            self.seed = state['seed']
+            self.first_uncommitted_row_offset = state['first_uncommitted_row_offset']
+            self.committed_row_offsets = set(state['committed_row_offsets'])
+            logger.info(f'Insertion into {dest_table_name_with_schema} is resumed from checkpoint {checkpoint_path}, '
+                        f'{self.get_number_of_rows_committed()} of {number_of_rows_to_insert} rows were committed.')
+        elif self.seed is None:
+            self.seed = int(SeedSequence().entropy)
+
+    def get_seed(self):
+        return self.seed
+
+    def get_first_uncommitted_row_offset(self):
+        return self.first_uncommitted_row_offset
+
+    def get_committed_row_offsets(self):
+        return set(self.committed_row_offsets)
+
+    def get_size_of_batch(self, row_offset):
+        return min(self.params['batch_size'], self.params['number_of_rows_to_insert'] - row_offset)
+
+    def get_number_of_rows_committed(self):
+        return self.first_uncommitted_row_offset + sum(map(self.get_size_of_batch, self.committed_row_offsets))
+
+    def is_committed(self, row_offset):
+        return row_offset < self.first_uncommitted_row_offset or row_offset in self.committed_row_offsets
+
+    def add_committed_row_offsets(self, row_offsets):
+        with self.lock:
+            self.committed_row_offsets.update(row_offsets)
+            while self.first_uncommitted_row_offset in self.committed_row_offsets:
+                self.committed_row_offsets.remove(self.first_uncommitted_row_offset)
+                self.first_uncommitted_row_offset += self.get_size_of_batch(self.first_uncommitted_row_offset)
+            self.save()
+
+    def save(self):
+        temporary_path = f'{self.checkpoint_path}.tmp'
+        with open(temporary_path, 'w') as file:
+            json.dump({**self.params,
+                       'seed': self.seed,
+                       'first_uncommitted_row_offset': self.first_uncommitted_row_offset,
+                       'committed_row_offsets': sorted(self.committed_row_offsets)}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def remove(self):
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
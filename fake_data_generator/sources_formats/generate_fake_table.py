@@ -9,8 +9,40 @@ def generate_fake_table(conn,
                         number_of_rows_from_which_to_create_pattern: int,
                         columns_info: list = None,
                         columns_to_include: list = None,
-                        batch_size=100):
+                        batch_size=100,
+                        number_of_processes: int = None,
+                        seed: int = None,
+                        use_pipeline: bool = False,
+                        queue_size: int = 2,
+                        queue_max_memory: int = None,
+                        number_of_writers: int = 1,
+                        loader=None,
+                        transaction_size: int = None,
+                        use_spark_executors: bool = False,
+                        number_of_partitions: int = None,
+                        sink=None,
+                        sampling_strategy: str = 'order_by_random',
+                        sample_fraction: float = None,
+                        stratify_by: str = None,
+                        use_sketches: bool = False,
+                        profile_cache=None,
+                        callbacks: list = None,
+                        use_staging_tables: bool = False,
+                        max_retries: int = 0,
+                        retry_backoff: float = 1.0,
+                        checkpoint_path: str = None):
     rich_columns_info = get_rich_columns_info(conn, source_table_name_with_schema,
-                                              number_of_rows_from_which_to_create_pattern, columns_info, columns_to_include)
-    create_table_if_not_exists(conn, source_table_name_with_schema, dest_table_name_with_schema, columns_to_include)
-    execute_insertion(conn, dest_table_name_with_schema, number_of_rows_to_insert, rich_columns_info, batch_size)
+                                              number_of_rows_from_which_to_create_pattern, columns_info, columns_to_include,
+                                              sampling_strategy=sampling_strategy, sample_fraction=sample_fraction,
+                                              stratify_by=stratify_by, seed=seed, use_sketches=use_sketches,
+                                              profile_cache=profile_cache)
+    dest_conn = sink if sink is not None else conn
+    create_table_if_not_exists(dest_conn, source_table_name_with_schema, dest_table_name_with_schema, columns_to_include)
+    return execute_insertion(dest_conn, dest_table_name_with_schema, number_of_rows_to_insert, rich_columns_info, batch_size,
+                             number_of_processes=number_of_processes, seed=seed,
+                             use_pipeline=use_pipeline, queue_size=queue_size, queue_max_memory=queue_max_memory,
+                             number_of_writers=number_of_writers, loader=loader, transaction_size=transaction_size,
+                             use_spark_executors=use_spark_executors, number_of_partitions=number_of_partitions,
+                             callbacks=callbacks,
+                             use_staging_tables=use_staging_tables, max_retries=max_retries, retry_backoff=retry_backoff,
+                             checkpoint_path=checkpoint_path)
@@ -1,21 +1,54 @@
-import json
 from fake_data_generator.columns_generator import get_columns_info_with_set_generators
+from fake_data_generator.sources_formats.profile_files import read_table_profile
 from fake_data_generator.sources_formats.helper_functions import \
     get_create_query, create_table_if_not_exists, execute_insertion
 
 
+def get_rich_columns_info_dict_of_profile(source_table_profile_path, columns_info=None):
+    """
+    Function that reads the profile of the table and overrides profiles of its columns by columns_info
+    (data type of the profile is kept for a column of columns_info without data type).
+    """
+    rich_columns_info_dict = read_table_profile(source_table_profile_path)
+    for column_info in columns_info or []:
+        column_info_dict = column_info.get_as_dict()
+        column_name = column_info.get_column_name()
+        if column_info.get_data_type() is None and column_name in rich_columns_info_dict:
+            column_info_dict[column_name]['data_type'] = rich_columns_info_dict[column_name].get('data_type')
+        rich_columns_info_dict.update(column_info_dict)
+    return rich_columns_info_dict
+
+
 def generate_table_from_profile(conn,
                                 source_table_profile_path: str,
                                 dest_table_name_with_schema: str,
                                 number_of_rows_to_insert: int,
                                 columns_info=None,
-                                batch_size=100):
-    with open(source_table_profile_path, 'r') as file:
-        rich_columns_info_dict = json.load(file)
-
-    for column_info in columns_info or []:
-        rich_columns_info_dict.update(column_info.get_as_dict())
-
+                                batch_size=100,
+                                number_of_processes: int = None,
+                                seed: int = None,
+                                use_pipeline: bool = False,
+                                queue_size: int = 2,
+                                queue_max_memory: int = None,
+                                number_of_writers: int = 1,
+                                loader=None,
+                                transaction_size: int = None,
+                                use_spark_executors: bool = False,
+                                number_of_partitions: int = None,
+                                key_index_paths: dict = None,
+                                callbacks: list = None,
+                                use_staging_tables: bool = False,
+                                max_retries: int = 0,
+                                retry_backoff: float = 1.0,
+                                checkpoint_path: str = None):
+    rich_columns_info_dict = get_rich_columns_info_dict_of_profile(source_table_profile_path, columns_info)
     create_table_if_not_exists(conn, dest_table_name_with_schema=dest_table_name_with_schema, create_query=get_create_query(dest_table_name_with_schema, rich_columns_info_dict))
     columns_info_with_set_generators = get_columns_info_with_set_generators(rich_columns_info_dict)
-    execute_insertion(conn, dest_table_name_with_schema, number_of_rows_to_insert, columns_info_with_set_generators, batch_size)
+    return execute_insertion(conn, dest_table_name_with_schema, number_of_rows_to_insert, columns_info_with_set_generators, batch_size,
+                             number_of_processes=number_of_processes, seed=seed,
+                             use_pipeline=use_pipeline, queue_size=queue_size, queue_max_memory=queue_max_memory,
+                             number_of_writers=number_of_writers, loader=loader, transaction_size=transaction_size,
+                             use_spark_executors=use_spark_executors, number_of_partitions=number_of_partitions,
+                             key_index_paths=key_index_paths, callbacks=callbacks,
+                             use_staging_tables=use_staging_tables, max_retries=max_retries, retry_backoff=retry_backoff,
+                             checkpoint_path=checkpoint_path)
@@ -1,6 +1,6 @@
-import json
 from loguru import logger
 from fake_data_generator.sources_formats.helper_functions import get_rich_columns_info
+from fake_data_generator.sources_formats.profile_files import write_table_profile
 
 
 def generate_table_profile(conn,
@@ -8,17 +8,29 @@ def generate_table_profile(conn,
                            output_table_profile_path: str,
                            number_of_rows_from_which_to_create_pattern: int,
                            columns_info: list = None,
-                           columns_to_include: list = None):
+                           columns_to_include: list = None,
+                           sampling_strategy: str = 'order_by_random',
+                           sample_fraction: float = None,
+                           stratify_by: str = None,
+                           seed: int = None,
+                           use_sketches: bool = False,
+                           profile_cache=None,
+                           profile_format: str = 'json'):
     rich_columns_info = get_rich_columns_info(conn,
                                               source_table_name_with_schema,
                                               number_of_rows_from_which_to_create_pattern,
                                               columns_info,
-                                              columns_to_include)
+                                              columns_to_include,
+                                              sampling_strategy=sampling_strategy,
+                                              sample_fraction=sample_fraction,
+                                              stratify_by=stratify_by,
+                                              seed=seed,
+                                              use_sketches=use_sketches,
+                                              profile_cache=profile_cache)
 
     dict_to_dump = {}
     for column_info in rich_columns_info:
         dict_to_dump.update(column_info.get_as_dict())
 
-    with open(output_table_profile_path, 'w') as file:
-        json.dump(dict_to_dump, file)
+    write_table_profile(output_table_profile_path, dict_to_dump, profile_format=profile_format)
     logger.info(f'Profile was loaded into {output_table_profile_path}.')
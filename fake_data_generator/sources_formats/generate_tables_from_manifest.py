@@ -0,0 +1,320 @@
+import os
+import json
+import time
+import hashlib
+from threading import Condition, Lock
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+from fake_data_generator.columns_generator import \
+    Column, CategoricalColumn, ContinuousColumn, StringColumn, CurrentTimestampColumn, ForeignKeyColumn, UniqueColumn
+from fake_data_generator.sources_formats.metrics import InsertionCallback, LoggingCallback, TimingCallback
+from fake_data_generator.sources_formats.generate_table_profile import generate_table_profile
+from fake_data_generator.sources_formats.generate_table_from_profile import generate_table_from_profile
+from fake_data_generator.sources_formats.generate_tables_from_profiles import \
+    get_foreign_key_columns, get_tables_in_order_of_references, get_tables_with_key_index_paths, get_params_of_table
+
+COLUMN_CLASSES_OF_TYPES = {
+    'CATEGORICAL': CategoricalColumn,
+    'CONTINUES': ContinuousColumn,
+    'STRING': StringColumn,
+    'CURRENT_TIMESTAMP': CurrentTimestampColumn,
+    'FOREIGN_KEY': ForeignKeyColumn,
+    'UNIQUE': UniqueColumn,
+}
+PROFILING_PARAMS = ('number_of_rows_from_which_to_create_pattern', 'columns_to_include', 'sampling_strategy', 'sample_fraction',
+                    'stratify_by', 'use_sketches', 'profile_format')
+
+
+class ResourceLimiter:
+    """
+    Limiter of workers and memory shared by tables generated at the same time. A table waits until its workers and memory
+    are available, requests bigger than the limits are reduced to the limits, so such a table is generated alone.
+    After abort() waiting tables are not started.
+
+    Parameters
+    ----------
+     max_workers: Maximum total number of workers (processes generating batches and threads writing them)
+     max_memory: Maximum total memory in bytes of generated batches waiting for insertion (not limited if not specified)
+    """
+    def __init__(self, max_workers: int, max_memory: int = None):
+        self.max_workers = max_workers
+        self.max_memory = max_memory
+        self.number_of_free_workers = max_workers
+        self.free_memory = max_memory
+        self.aborted = False
+        self.condition = Condition()
+
+    def get_request(self, number_of_workers, memory):
+        return min(number_of_workers, self.max_workers), min(memory, self.max_memory) if self.max_memory is not None else 0
+
+    def acquire(self, number_of_workers, memory=0):
+        number_of_workers, memory = self.get_request(number_of_workers, memory)
+        with self.condition:
+            self.condition.wait_for(lambda: self.aborted or (self.number_of_free_workers >= number_of_workers and
+                                                             (self.max_memory is None or self.free_memory >= memory)))
+            if self.aborted:
+                return False
+            self.number_of_free_workers -= number_of_workers
+            if self.max_memory is not None:
+                self.free_memory -= memory
+            return True
+
+    def release(self, number_of_workers, memory=0):
+        number_of_workers, memory = self.get_request(number_of_workers, memory)
+        with self.condition:
+            self.number_of_free_workers += number_of_workers
+            if self.max_memory is not None:
+                self.free_memory += memory
+            self.condition.notify_all()
+
+    def abort(self):
+        with self.condition:
+            self.aborted = True
+            self.condition.notify_all()
+
+
+class TableGenerationCancelled(RuntimeError):
+    pass
+
+
+class SynchronizedCallback(InsertionCallback):
+    """
+    Callback shared by tables generated at the same time, calls of the wrapped callback are serialized by the lock of the job
+    (execute_insertion serializes calls of its callbacks only within one table).
+    """
+    def __init__(self, callback: InsertionCallback, lock: Lock):
+        self.callback = callback
+        self.lock = lock
+
+    def on_start(self, metrics):
+        with self.lock:
+            self.callback.on_start(metrics)
+
+    def on_batch_inserted(self, metrics, batch_metrics):
+        with self.lock:
+            self.callback.on_batch_inserted(metrics, batch_metrics)
+
+    def on_finish(self, metrics):
+        with self.lock:
+            self.callback.on_finish(metrics)
+
+
+def get_callbacks_of_table(callbacks, lock):
+    """
+    Function that returns callbacks of one table: InsertionCallback objects are shared by all tables and synchronized
+    by the lock, other items (e.g. callback classes) are called to create a callback for every table.
+    """
+    if callbacks is None:
+        return [LoggingCallback()]
+    return [SynchronizedCallback(callback, lock) if isinstance(callback, InsertionCallback) else callback()
+            for callback in callbacks]
+
+
+def read_manifest(manifest):
+    if isinstance(manifest, dict):
+        return manifest
+    with open(manifest) as file:
+        return json.load(file)
+
+
+def get_columns_info_of_manifest(column_name_to_column_info_dict):
+    """
+    Function that converts overrides of columns of the manifest (dicts in the format of profiles, type and data_type
+    are optional) into Column objects.
+    """
+    return [COLUMN_CLASSES_OF_TYPES.get(column_info_dict.get('type'), Column)(
+                column_name=column_name, **{key: value for key, value in column_info_dict.items() if key != 'type'})
+            for column_name, column_info_dict in (column_name_to_column_info_dict or {}).items()]
+
+
+def get_profile_path(profile_directory, source_table_name_with_schema, profiling_params, columns_info):
+    key = json.dumps({'params': profiling_params,
+                      'columns_info': [column_info.get_as_dict() for column_info in columns_info]}, sort_keys=True, default=str)
+    extension = 'bin' if profiling_params.get('profile_format') == 'binary' else 'json'
+    return os.path.join(profile_directory, f'{source_table_name_with_schema}.{hashlib.sha1(key.encode()).hexdigest()[:8]}.{extension}')
+
+
+def get_number_of_workers(table_params):
+    return (table_params.get('number_of_processes') or 1) + table_params.get('number_of_writers', 1)
+
+
+def get_summary_lines(table_name_to_summary, wall_seconds):
+    lines = [f'{"table":<40} {"rows":>12} {"seconds":>9} {"rows/s":>10} {"MB":>9} {"profiling":>9} {"waiting":>9}']
+    for table_name, summary in table_name_to_summary.items():
+        lines.append(f'{table_name:<40} {summary["number_of_rows_inserted"]:>12} {summary["elapsed_seconds"]:>9.1f} '
+                     f'{summary["rows_per_second"]:>10.0f} {summary["number_of_bytes"] / 2 ** 20:>9.1f} '
+                     f'{summary["profiling_seconds"]:>9.1f} {summary["waiting_seconds"]:>9.1f}')
+    total_seconds = sum(summary['elapsed_seconds'] for summary in table_name_to_summary.values())
+    lines.append(f'Wall time {wall_seconds:.1f} s, sum of times of tables {total_seconds:.1f} s.')
+    return lines
+
+
+def generate_tables_from_manifest(conn,
+                                  manifest,
+                                  max_workers: int = None,
+                                  max_memory: int = None,
+                                  summary_path: str = None,
+                                  profile_cache=None,
+                                  callbacks: list = None):
+    """
+    Function that runs the job described by the manifest: profiles source tables and generates all tables
+    keeping referential integrity between them (see generate_tables_from_profiles).
+
+    Every distinct source table (with the same profiling parameters and overrides) is described and sampled once
+    and source tables are profiled in parallel by max_workers threads, profiles are written into profile_directory.
+    Then tables are generated at the same time as long as they fit into the limits shared by all tables:
+    a table needs (number_of_processes or 1) + number_of_writers workers and queue_max_memory bytes of memory
+    (max_memory * its workers / max_workers by default), a table starts as soon as tables referenced by it are generated
+    and its resources are free. At the end the summary of every table is logged and written into summary_path.
+
+    Parameters
+    ----------
+     conn: Connection to the database (Spark session or SQLAlchemy engine)
+     manifest: Dict or path of JSON file with keys:
+      - tables: list of dicts with dest_table_name_with_schema, number_of_rows_to_insert and either
+        source_table_profile_path or source_table_name_with_schema with parameters of profiling
+        (number_of_rows_from_which_to_create_pattern, columns_to_include, sampling_strategy, ...);
+        columns_info is a dict of overrides of columns in the format of profiles, other keys are parameters
+        of generate_table_from_profile
+      - defaults: parameters common for all tables (overridden by parameters of tables)
+      - key_index_directory, profile_directory: directories of key indexes and of profiles ('keys' and 'profiles' by default)
+      - seed, max_workers, max_memory, summary_path: see parameters of the function
+     max_workers: Maximum number of workers used at the same time (the value of the manifest or the number of CPUs if not specified)
+     max_memory: Maximum memory in bytes of generated batches waiting for insertion of all tables (not limited if not specified)
+     summary_path: Path of JSON file into which summaries of tables are written
+     profile_cache: ProfileCache used by profiling of source tables
+     callbacks: Callbacks of insertion: InsertionCallback objects are shared by all tables (their calls are serialized),
+     callback classes or functions without arguments create a callback for every table (default LoggingCallback for every table)
+
+    Returns
+    -------
+     Dict of names of tables and their summaries (see InsertionMetrics.get_summary) with profiling and waiting seconds
+
+    Examples
+    --------
+    # >>> generate_tables_from_manifest(engine, {
+    # ...     'seed': 42,
+    # ...     'defaults': {'batch_size': 10000, 'number_of_writers': 2},
+    # ...     'tables': [{'source_table_name_with_schema': 'prod.customers',
+    # ...                 'number_of_rows_from_which_to_create_pattern': 100000,
+    # ...                 'dest_table_name_with_schema': 'test.customers',
+    # ...                 'number_of_rows_to_insert': 1000000},
+    # ...                {'source_table_profile_path': 'orders.json',
+    # ...                 'dest_table_name_with_schema': 'test.orders',
+    # ...                 'number_of_rows_to_insert': 10000000,
+    # ...                 'columns_info': {'customer_id': {'type': 'FOREIGN_KEY',
+    # ...                                                  'referenced_table_name_with_schema': 'test.customers',
+    # ...                                                  'referenced_column_name': 'id'}}}]},
+    # ...     max_workers=16, max_memory=4 * 2 ** 30, summary_path='summary.json')
+    """
+    manifest = read_manifest(manifest)
+    job_start = time.perf_counter()
+    max_workers = max_workers or manifest.get('max_workers') or os.cpu_count() or 1
+    max_memory = max_memory if max_memory is not None else manifest.get('max_memory')
+    summary_path = summary_path or manifest.get('summary_path')
+    seed = manifest.get('seed')
+    profile_directory = manifest.get('profile_directory', 'profiles')
+    defaults = manifest.get('defaults') or {}
+    if not manifest.get('tables'):
+        raise ValueError('Manifest has no tables to generate.')
+
+    tables = []
+    profile_path_to_profiling = {}
+    table_name_to_profile_path = {}
+    for table_in_manifest in manifest['tables']:
+        table_params = {**defaults, **table_in_manifest}
+        columns_info = get_columns_info_of_manifest(table_params.pop('columns_info', None))
+        profiling_params = {name: table_params.pop(name) for name in PROFILING_PARAMS if name in table_params}
+        source_table_name_with_schema = table_params.pop('source_table_name_with_schema', None)
+        if table_params.get('source_table_profile_path') is None and source_table_name_with_schema is None:
+            raise ValueError(f'Neither source_table_profile_path nor source_table_name_with_schema is specified '
+                             f'for table {table_params.get("dest_table_name_with_schema")}.')
+        if table_params.get('source_table_profile_path') is None:
+            columns_info_to_profile = [column_info for column_info in columns_info if not isinstance(column_info, ForeignKeyColumn)]
+            profile_path = get_profile_path(profile_directory, source_table_name_with_schema, profiling_params, columns_info_to_profile)
+            profile_path_to_profiling[profile_path] = (source_table_name_with_schema, profiling_params, columns_info_to_profile)
+            table_params['source_table_profile_path'] = profile_path
+            table_name_to_profile_path[table_params['dest_table_name_with_schema']] = profile_path
+            columns_info = [column_info for column_info in columns_info if isinstance(column_info, ForeignKeyColumn)]
+        tables.append({**table_params, 'columns_info': columns_info})
+
+    profile_path_to_seconds = {}
+
+    def profile_source_table(profile_path):
+        source_table_name_with_schema, profiling_params, columns_info_to_profile = profile_path_to_profiling[profile_path]
+        profiling_start = time.perf_counter()
+        generate_table_profile(conn, source_table_name_with_schema, profile_path,
+                               profiling_params.get('number_of_rows_from_which_to_create_pattern'),
+                               columns_info=columns_info_to_profile, seed=seed, profile_cache=profile_cache,
+                               **{name: value for name, value in profiling_params.items()
+                                  if name != 'number_of_rows_from_which_to_create_pattern'})
+        profile_path_to_seconds[profile_path] = time.perf_counter() - profiling_start
+
+    if profile_path_to_profiling:
+        os.makedirs(profile_directory, exist_ok=True)
+        logger.info(f'Start profiling {len(profile_path_to_profiling)} source tables for {len(table_name_to_profile_path)} tables.')
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(profile_path_to_profiling))) as executor:
+            list(executor.map(profile_source_table, profile_path_to_profiling))
+
+    key_index_directory = manifest.get('key_index_directory', 'keys')
+    tables, table_name_to_key_column_names = get_tables_with_key_index_paths(tables, key_index_directory)
+    resource_limiter = ResourceLimiter(max_workers, max_memory)
+    timing = TimingCallback()
+    lock_for_callbacks = Lock()
+    table_name_to_waiting_seconds = {}
+    table_name_to_generation = {}
+
+    def generate_table(table, table_index):
+        try:
+            generate_table_when_resources_are_free(table, table_index)
+        except BaseException:
+            resource_limiter.abort()
+            raise
+
+    def generate_table_when_resources_are_free(table, table_index):
+        dest_table_name_with_schema = table['dest_table_name_with_schema']
+        waiting_start = time.perf_counter()
+        for column_info in get_foreign_key_columns(table):
+            referenced_generation = table_name_to_generation.get(column_info.get_referenced_table_name_with_schema())
+            if referenced_generation is not None:
+                referenced_generation.result()
+        callbacks_of_table = get_callbacks_of_table(callbacks, lock_for_callbacks) + [SynchronizedCallback(timing, lock_for_callbacks)]
+        table_params = get_params_of_table(table, table_index, {'callbacks': callbacks_of_table}, seed,
+                                           key_index_directory, table_name_to_key_column_names)
+        number_of_workers = get_number_of_workers(table_params)
+        if table_params.get('queue_max_memory') is None and max_memory is not None:
+            table_params['queue_max_memory'] = max_memory * min(number_of_workers, max_workers) // max_workers
+        memory = table_params.get('queue_max_memory') or 0
+        if not resource_limiter.acquire(number_of_workers, memory):
+            raise TableGenerationCancelled(f'Generation of {dest_table_name_with_schema} was cancelled '
+                                           f'because generation of another table failed.')
+        table_name_to_waiting_seconds[dest_table_name_with_schema] = time.perf_counter() - waiting_start
+        try:
+            logger.info(f'Start generating table {dest_table_name_with_schema}.')
+            generate_table_from_profile(conn, **{**table_params, 'use_pipeline': True})
+        finally:
+            resource_limiter.release(number_of_workers, memory)
+
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        for table_index, table in enumerate(get_tables_in_order_of_references(tables)):
+            table_name_to_generation[table['dest_table_name_with_schema']] = executor.submit(generate_table, table, table_index)
+    # the error of the first failed table is raised rather than errors of tables cancelled because of it
+    for generation in table_name_to_generation.values():
+        if not isinstance(generation.exception(), TableGenerationCancelled):
+            generation.result()
+    for generation in table_name_to_generation.values():
+        generation.result()
+
+    table_name_to_summary = {}
+    for table in tables:
+        dest_table_name_with_schema = table['dest_table_name_with_schema']
+        summary = dict(timing.get_summaries()[dest_table_name_with_schema])
+        summary['profiling_seconds'] = profile_path_to_seconds.get(table_name_to_profile_path.get(dest_table_name_with_schema), 0.0)
+        summary['waiting_seconds'] = table_name_to_waiting_seconds[dest_table_name_with_schema]
+        table_name_to_summary[dest_table_name_with_schema] = summary
+    wall_seconds = time.perf_counter() - job_start
+    logger.info('Summary of generated tables:\n' + '\n'.join(get_summary_lines(table_name_to_summary, wall_seconds)))
+    if summary_path is not None:
+        with open(summary_path, 'w') as file:
+            json.dump({'wall_seconds': wall_seconds, 'tables': table_name_to_summary}, file, indent=2)
+    return table_name_to_summary
@@ -0,0 +1,130 @@
+import os
+from copy import copy
+from loguru import logger
+from numpy.random import SeedSequence
+from fake_data_generator.columns_generator import ForeignKeyColumn
+from fake_data_generator.sources_formats.generate_table_from_profile import generate_table_from_profile
+
+
+def get_foreign_key_columns(table):
+    return [column_info for column_info in table.get('columns_info') or [] if isinstance(column_info, ForeignKeyColumn)]
+
+
+def get_tables_in_order_of_references(tables):
+    """
+    Function that sorts tables so that every parent table goes before the tables referencing it.
+    """
+    table_names = [table['dest_table_name_with_schema'] for table in tables]
+    name_to_parent_names = {table['dest_table_name_with_schema']: {column_info.get_referenced_table_name_with_schema()
+                                                                   for column_info in get_foreign_key_columns(table)
+                                                                   if column_info.get_referenced_table_name_with_schema() in table_names}
+                            for table in tables}
+    ordered_tables = []
+    ordered_table_names = set()
+    while len(ordered_tables) < len(tables):
+        next_tables = [table for table in tables if table['dest_table_name_with_schema'] not in ordered_table_names
+                       and name_to_parent_names[table['dest_table_name_with_schema']] <= ordered_table_names]
+        if not next_tables:
+            raise ValueError(f'References between tables {sorted(set(table_names) - ordered_table_names)} form a cycle.')
+        ordered_tables.extend(next_tables)
+        ordered_table_names.update(table['dest_table_name_with_schema'] for table in next_tables)
+    return ordered_tables
+
+
+def get_key_index_path(key_index_directory, table_name_with_schema, column_name):
+    return os.path.join(key_index_directory, f'{table_name_with_schema}.{column_name}.keys')
+
+
+def get_tables_with_key_index_paths(tables, key_index_directory):
+    """
+    Function that returns copies of tables whose ForeignKeyColumn objects referencing generated tables are copies
+    with paths of key indexes of the referenced tables, dicts of tables and columns passed by the caller are not changed.
+
+    Returns
+    -------
+     List of copies of tables and dict of names of referenced tables and sets of their key columns whose keys have to be indexed
+    """
+    os.makedirs(key_index_directory, exist_ok=True)
+    table_names = {table['dest_table_name_with_schema'] for table in tables}
+    table_name_to_key_column_names = {}
+    tables_with_key_index_paths = []
+    for table in tables:
+        if get_foreign_key_columns(table):
+            table = {**table, 'columns_info': [copy(column_info) if isinstance(column_info, ForeignKeyColumn) else column_info
+                                               for column_info in table['columns_info']]}
+        for column_info in get_foreign_key_columns(table):
+            referenced_table_name_with_schema = column_info.get_referenced_table_name_with_schema()
+            if referenced_table_name_with_schema in table_names:
+                column_info.set_key_index_path(get_key_index_path(key_index_directory, referenced_table_name_with_schema,
+                                                                  column_info.get_referenced_column_name()))
+                table_name_to_key_column_names.setdefault(referenced_table_name_with_schema, set()).add(column_info.get_referenced_column_name())
+            elif column_info.get_key_index_path() is None:
+                raise ValueError(f'Table {referenced_table_name_with_schema} referenced by column {column_info.get_column_name()} '
+                                 f'is not among generated tables and key index path of the column is not specified.')
+        tables_with_key_index_paths.append(table)
+    return tables_with_key_index_paths, table_name_to_key_column_names
+
+
+def get_params_of_table(table, table_index, insertion_params, seed, key_index_directory, table_name_to_key_column_names):
+    """
+    Function that returns parameters of generation of the table: common parameters overridden by parameters of the table,
+    the seed of the table derived from seed and the index of the table in the order of references, paths of its key indexes.
+    """
+    dest_table_name_with_schema = table['dest_table_name_with_schema']
+    key_index_paths = {column_name: get_key_index_path(key_index_directory, dest_table_name_with_schema, column_name)
+                       for column_name in sorted(table_name_to_key_column_names.get(dest_table_name_with_schema, []))}
+    return {**insertion_params, **table,
+            'seed': None if seed is None else int(SeedSequence([seed, table_index]).generate_state(1)[0]),
+            'key_index_paths': key_index_paths}
+
+
+def generate_tables_from_profiles(conn,
+                                  tables: list,
+                                  key_index_directory: str,
+                                  seed: int = None,
+                                  **insertion_params):
+    """
+    Function that generates several tables from their profiles keeping referential integrity between them.
+    Child columns are declared in columns_info of the child table as ForeignKeyColumn with the name of the parent table
+    and its key column. Parent tables are generated first and their generated keys are written into key indexes
+    (memory-mapped files in key_index_directory), child batches sample referenced keys from them,
+    so no joins or updates are needed after generation.
+
+    Parameters
+    ----------
+     conn: Connection to the database (Spark session or SQLAlchemy engine)
+     tables: List of dicts with parameters of generate_table_from_profile for every table: source_table_profile_path,
+     dest_table_name_with_schema, number_of_rows_to_insert and optional columns_info and parameters of insertion
+     key_index_directory: Directory of key index files (created if it does not exist)
+     seed: Seed from which seeds of tables are derived
+     insertion_params: Parameters of generate_table_from_profile common for all tables (batch_size, number_of_processes,
+     loader, ...), parameters in dicts of tables override them
+
+    Returns
+    -------
+     Dict of names of tables and numbers of inserted rows
+
+    Examples
+    --------
+    # >>> generate_tables_from_profiles(engine,
+    # ...                               tables=[{'source_table_profile_path': 'customers.json',
+    # ...                                        'dest_table_name_with_schema': 'test.customers',
+    # ...                                        'number_of_rows_to_insert': 1000},
+    # ...                                       {'source_table_profile_path': 'orders.json',
+    # ...                                        'dest_table_name_with_schema': 'test.orders',
+    # ...                                        'number_of_rows_to_insert': 100000,
+    # ...                                        'columns_info': [ForeignKeyColumn('customer_id',
+    # ...                                                                          referenced_table_name_with_schema='test.customers',
+    # ...                                                                          referenced_column_name='id',
+    # ...                                                                          skew=1.1)]}],
+    # ...                               key_index_directory='keys',
+    # ...                               batch_size=10000)
+    """
+    tables, table_name_to_key_column_names = get_tables_with_key_index_paths(tables, key_index_directory)
+    table_name_to_number_of_rows_inserted = {}
+    for table_index, table in enumerate(get_tables_in_order_of_references(tables)):
+        logger.info(f'Start generating table {table["dest_table_name_with_schema"]}.')
+        table_name_to_number_of_rows_inserted[table['dest_table_name_with_schema']] = \
+            generate_table_from_profile(conn, **get_params_of_table(table, table_index, insertion_params, seed,
+                                                                    key_index_directory, table_name_to_key_column_names))
+    return table_name_to_number_of_rows_inserted
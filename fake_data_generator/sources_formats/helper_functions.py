@@ -1,15 +1,22 @@
-import pandas as pd
-import sqlalchemy
-import re
 from copy import deepcopy
+from uuid import uuid4
+from time import perf_counter
+from threading import Lock
 from loguru import logger
-from pandas import concat, to_datetime, Series
-from pyspark.sql.types import StructType, StructField, StringType, IntegerType, DateType, TimestampType, DecimalType
-from fake_data_generator.columns_generator import get_rich_column_info, get_fake_data_for_insertion, Column
-
-
-def get_string_for_column_names(columns_to_include):
-    return ','.join(map(lambda x: '`' + x + '`', columns_to_include)) if columns_to_include is not None else '*'
+from numpy import trunc, float64
+from pandas import to_datetime, to_numeric, Series
+from fake_data_generator.columns_generator import \
+    get_rich_column_info, get_batches_of_fake_data, Column, get_column_profiles, \
+    get_columns_info_with_set_generators
+from fake_data_generator.columns_generator.batch_generation import get_generator_spec
+from fake_data_generator.columns_generator.key_index import KeyIndexWriter
+from fake_data_generator.sources_formats.backends import get_backend_function, has_backend_function
+from fake_data_generator.sources_formats.pipeline import execute_pipelined_insertion
+from fake_data_generator.sources_formats.profile_cache import get_fingerprint_of_column_info
+from fake_data_generator.sources_formats.metrics import InsertionMetrics, BatchMetrics, get_callbacks
+from fake_data_generator.sources_formats.checkpoint import Checkpoint
+from fake_data_generator.sources_formats.sampling import \
+    get_string_for_column_names, get_sample_of_table, RESERVOIR_CHUNK_SIZE
 
 
 def get_create_query(dest_table_name_with_schema, rich_columns_info_dict):
@@ -17,75 +24,150 @@ def get_create_query(dest_table_name_with_schema, rich_columns_info_dict):
     return f"CREATE TABLE IF NOT EXISTS {dest_table_name_with_schema} ({str_for_column_names_and_types});"
 
 
-def get_inferred_data_type(column_data_type):
-    if column_data_type == 'string':
-        return StringType()
-    elif 'int' in column_data_type:
-        return IntegerType()
-    elif 'decimal' in column_data_type:
-        precision, scale = re.search(r'decimal\((\d+),(\d+)\)', column_data_type).groups()
-        return DecimalType(int(precision), int(scale))
-    elif column_data_type == 'timestamp':
-        return TimestampType()
-    elif column_data_type == 'date':
-        return DateType()
-    else:
-        return StringType()
-
-
 def get_correct_column_values(column_values: Series,
                               column_data_type: str):
-    number_of_nulls = column_values.isnull().sum()
+    """
+    Function that converts sampled values of the column into a typed array keeping the order of rows:
+    nullable Int64 for integers, float64 for decimals, datetime64 for dates (truncated to days) and timestamps.
+    Values of other columns are returned as they are.
+    """
     if 'int' in column_data_type:
-        correct_column_values = concat([column_values.dropna().astype(int), Series([None] * number_of_nulls, dtype=object)])
-        correct_column_values.name = column_values.name
-        return correct_column_values
+        try:
+            return column_values.astype('Int64')
+        except (TypeError, ValueError):
+            return trunc(to_numeric(column_values)).astype('Int64')
     elif 'decimal' in column_data_type:
-        correct_column_values = concat([column_values.dropna().astype(float), Series([None] * number_of_nulls, dtype=float)])
-        correct_column_values.name = column_values.name
-        return correct_column_values
+        return to_numeric(column_values).astype(float64)
     elif column_data_type == 'date':
-        return to_datetime(column_values).dt.date
+        return to_datetime(column_values).dt.normalize()
     elif column_data_type == 'timestamp':
-        return column_values.apply(lambda x: x.to_pydatetime())
+        return to_datetime(column_values)
     else:
         return column_values
 
 
+def get_column_profiles_of_chunks(chunks_of_rows, column_name_to_data_type):
+    return get_column_profiles(({column_name: get_correct_column_values(chunk_of_rows[column_name], data_type)
+                                 for column_name, data_type in column_name_to_data_type.items()}
+                                for chunk_of_rows in chunks_of_rows),
+                               column_name_to_data_type)
+
+
+def get_column_profiles_of_table(conn,
+                                 source_table_name_with_schema: str,
+                                 number_of_rows_from_which_to_create_pattern: int,
+                                 column_name_to_data_type: dict,
+                                 columns_to_include: list = None,
+                                 sampling_strategy: str = 'order_by_random',
+                                 sample_fraction: float = None,
+                                 stratify_by: str = None,
+                                 seed: int = None):
+    """
+    Function that builds mergeable profiles (see ColumnProfile) of columns of the table.
+    If number_of_rows_from_which_to_create_pattern is None the whole table is profiled chunk by chunk
+    (partitions are profiled in parallel on Spark executors and their profiles are merged),
+    otherwise the profiles are built from the sample of rows.
+    """
+    if number_of_rows_from_which_to_create_pattern is not None:
+        table_data_in_df = get_sample_of_table(conn, source_table_name_with_schema, number_of_rows_from_which_to_create_pattern,
+                                               columns_to_include=columns_to_include,
+                                               sampling_strategy=sampling_strategy,
+                                               sample_fraction=sample_fraction,
+                                               stratify_by=stratify_by,
+                                               seed=seed)
+        chunks_of_rows = (table_data_in_df.iloc[chunk_start:chunk_start + RESERVOIR_CHUNK_SIZE]
+                          for chunk_start in range(0, table_data_in_df.shape[0], RESERVOIR_CHUNK_SIZE))
+        return get_column_profiles_of_chunks(chunks_of_rows, column_name_to_data_type)
+    return get_backend_function(conn, 'get_column_profiles_of_table')(conn, source_table_name_with_schema,
+                                                                      column_name_to_data_type, columns_to_include)
+
+
 def get_rich_columns_info(conn,
                           source_table_name_with_schema: str,
                           number_of_rows_from_which_to_create_pattern: int,
                           columns_info: list = None,
-                          columns_to_include: list = None):
+                          columns_to_include: list = None,
+                          sampling_strategy: str = 'order_by_random',
+                          sample_fraction: float = None,
+                          stratify_by: str = None,
+                          seed: int = None,
+                          use_sketches: bool = False,
+                          profile_cache=None):
     describe_query = f"DESCRIBE {source_table_name_with_schema};"
-    if isinstance(conn, sqlalchemy.engine.base.Engine):
-        with conn.begin() as c:
-            describe_data_in_df = pd.read_sql_query(describe_query, c).rename(columns={'name': 'col_name', 'type': 'data_type'})
-    else:
-        describe_data_in_df = conn.sql(describe_query).toPandas().rename(columns={'name': 'col_name', 'type': 'data_type'})
-
-    logger.info(f'Start making select-query from table {source_table_name_with_schema}.')
-    limit_clause = f"LIMIT {number_of_rows_from_which_to_create_pattern}" if number_of_rows_from_which_to_create_pattern is not None else ''
-    select_query = f"SELECT {get_string_for_column_names(columns_to_include)} " \
-                   f"FROM {source_table_name_with_schema} " \
-                   f"ORDER BY RANDOM() {limit_clause};"
-    if isinstance(conn, sqlalchemy.engine.base.Engine):
-        with conn.begin() as c:
-            table_data_in_df = pd.read_sql_query(select_query, c)
-    else:
-        table_data_in_df = conn.sql(select_query).toPandas()
-    logger.info(f'Select-query result was read into Dataframe. Number of rows fetched is {table_data_in_df.shape[0]}.')
+    describe_data_in_df = get_backend_function(conn, 'get_query_result_in_df')(conn, describe_query) \
+        .rename(columns={'name': 'col_name', 'type': 'data_type'})
+
+    column_name_to_data_type = {row['col_name']: row['data_type'] for _, row in describe_data_in_df.iterrows()
+                                if (columns_to_include is None or row['col_name'] in columns_to_include)
+                                and row['col_name'] and not row['col_name'].startswith('#')}
 
     column_name_to_column_info_in_dict = {column_info.get_column_name(): column_info for column_info in deepcopy(columns_info) or []}
+    cached_column_profiles = {}
+    if profile_cache is not None:
+        sampling_params = {'number_of_rows': number_of_rows_from_which_to_create_pattern,
+                           'sampling_strategy': sampling_strategy,
+                           'sample_fraction': sample_fraction,
+                           'stratify_by': stratify_by,
+                           'use_sketches': use_sketches}
+        column_name_to_fingerprint = {column_name: get_fingerprint_of_column_info(column_name_to_column_info_in_dict.get(column_name))
+                                      for column_name in column_name_to_data_type}
+        cached_column_profiles = profile_cache.get_column_profiles(source_table_name_with_schema, sampling_params,
+                                                                   column_name_to_data_type, column_name_to_fingerprint)
+        logger.info(f'Profiles of {len(cached_column_profiles)} of {len(column_name_to_data_type)} columns '
+                    f'of {source_table_name_with_schema} were taken from cache.')
+    column_name_to_data_type_to_profile = {column_name: column_data_type for column_name, column_data_type in column_name_to_data_type.items()
+                                           if column_name not in cached_column_profiles}
+    columns_to_select = list(column_name_to_data_type_to_profile.keys()) if cached_column_profiles else columns_to_include
+
+    column_name_to_profile = None
+    if column_name_to_data_type_to_profile and use_sketches:
+        logger.info(f'Start profiling table {source_table_name_with_schema} with sketches.')
+        column_name_to_profile = get_column_profiles_of_table(conn, source_table_name_with_schema,
+                                                              number_of_rows_from_which_to_create_pattern,
+                                                              column_name_to_data_type_to_profile,
+                                                              columns_to_include=columns_to_select,
+                                                              sampling_strategy=sampling_strategy,
+                                                              sample_fraction=sample_fraction,
+                                                              stratify_by=stratify_by,
+                                                              seed=seed)
+        logger.info(f'Profiles of columns were built.')
+    elif column_name_to_data_type_to_profile:
+        logger.info(f'Start making select-query from table {source_table_name_with_schema} ({sampling_strategy} sampling).')
+        table_data_in_df = get_sample_of_table(conn, source_table_name_with_schema, number_of_rows_from_which_to_create_pattern,
+                                               columns_to_include=columns_to_select,
+                                               sampling_strategy=sampling_strategy,
+                                               sample_fraction=sample_fraction,
+                                               stratify_by=stratify_by,
+                                               seed=seed)
+        logger.info(f'Select-query result was read into Dataframe. Number of rows fetched is {table_data_in_df.shape[0]}.')
+
     rich_columns_info = []
-    for _, row in describe_data_in_df.iterrows():
-        if columns_to_include is None or row['col_name'] in columns_to_include:
-            column_info = column_name_to_column_info_in_dict.get(row['col_name'], Column(column_name=row['col_name']))
-            column_info.set_data_type(row['data_type'])
-            correct_column_values = get_correct_column_values(column_values=table_data_in_df[column_info.get_column_name()],
-                                                              column_data_type=row['data_type'])
-            rich_columns_info.append(get_rich_column_info(column_values=correct_column_values,
-                                                          column_info=column_info))
+    for column_name, column_data_type in column_name_to_data_type.items():
+        if column_name in cached_column_profiles:
+            rich_columns_info.extend(get_columns_info_with_set_generators({column_name: cached_column_profiles[column_name]}))
+            continue
+        column_info = column_name_to_column_info_in_dict.get(column_name, Column(column_name=column_name))
+        column_info.set_data_type(column_data_type)
+        if column_name_to_profile is not None:
+            rich_columns_info.append(get_rich_column_info(column_values=None,
+                                                          column_info=column_info,
+                                                          column_profile=column_name_to_profile[column_name]))
+            continue
+        correct_column_values = get_correct_column_values(column_values=table_data_in_df[column_name],
+                                                          column_data_type=column_data_type)
+        rich_columns_info.append(get_rich_column_info(column_values=correct_column_values,
+                                                      column_info=column_info))
+
+    if profile_cache is not None and column_name_to_data_type_to_profile:
+        column_profiles = {}
+        for column_info in rich_columns_info:
+            column_profile = column_info.get_as_dict()[column_info.get_column_name()]
+            # columns without type have user-defined generators which cannot be restored from cache
+            if 'type' in column_profile:
+                column_profiles[column_info.get_column_name()] = column_profile
+        profile_cache.put_column_profiles(source_table_name_with_schema, sampling_params, column_name_to_data_type,
+                                          column_name_to_fingerprint, column_profiles,
+                                          list(column_name_to_data_type_to_profile.keys()))
     return rich_columns_info
 
 
@@ -98,40 +180,164 @@ def create_table_if_not_exists(conn,
         create_query = f'CREATE TABLE IF NOT EXISTS {dest_table_name_with_schema} AS ' \
                        f'SELECT {get_string_for_column_names(columns_to_include)} ' \
                        f'FROM {source_table_name_with_schema} WHERE 1<>1;'
-    if isinstance(conn, sqlalchemy.engine.base.Engine):
-        with conn.begin() as c:
-            c.execute(create_query)
-    else:
-        conn.sql(create_query)
+    get_backend_function(conn, 'execute_query')(conn, create_query)
+
+
+def get_batches_with_indexed_keys(batches_of_fake_data, key_index_writers):
+    """
+    Generator passing batches of fake data through and appending generated keys of parent columns to their key indexes.
+    """
+    for batch_of_fake_data in batches_of_fake_data:
+        for column_name, key_index_writer in key_index_writers.items():
+            key_index_writer.add(batch_of_fake_data.get_column_data(column_name))
+        yield batch_of_fake_data
 
 
 def execute_insertion(conn,
                       dest_table_name_with_schema,
                       number_of_rows_to_insert,
                       columns_info_with_set_generators,
-                      batch_size):
-    schema = None
-    if not isinstance(conn, sqlalchemy.engine.base.Engine):
-        schema = StructType([StructField(column_info.get_column_name(), get_inferred_data_type(column_info.get_data_type()), True)
-                             for column_info in columns_info_with_set_generators])
-
-    number_of_rows_left_to_insert = number_of_rows_to_insert
-    while number_of_rows_left_to_insert != 0:
-        logger.info(f'-----------Start generating batch of fake data-----------')
-        fake_data_in_df = get_fake_data_for_insertion(output_size=min(batch_size, number_of_rows_left_to_insert),
-                                                      columns_info_with_set_generator=columns_info_with_set_generators)
-        logger.info(f'--------Finished generating batch of fake data-----------')
-
-        logger.info(f'Start inserting generated fake data into {dest_table_name_with_schema} table.')
-        if isinstance(conn, sqlalchemy.engine.base.Engine):
-            fake_data_in_df.to_sql(con=conn,
-                                   name=dest_table_name_with_schema.split('.')[1],
-                                   schema=dest_table_name_with_schema.split('.')[0],
-                                   if_exists='append',
-                                   index=False)
+                      batch_size,
+                      number_of_processes: int = None,
+                      seed: int = None,
+                      use_pipeline: bool = False,
+                      queue_size: int = 2,
+                      queue_max_memory: int = None,
+                      number_of_writers: int = 1,
+                      loader=None,
+                      transaction_size: int = None,
+                      use_spark_executors: bool = False,
+                      number_of_partitions: int = None,
+                      key_index_paths: dict = None,
+                      callbacks: list = None,
+                      use_staging_tables: bool = False,
+                      max_retries: int = 0,
+                      retry_backoff: float = 1.0,
+                      checkpoint_path: str = None):
+    """
+    Function that generates fake data batch by batch and inserts it into the table.
+    With number_of_writers > 1 batches are inserted in parallel by writer threads, each writer has its own connection
+    (from the pool of the engine) and, if use_staging_tables is True, its own staging table. Staging tables are merged
+    into the table with one INSERT ... SELECT after all batches are written and dropped.
+    If checkpoint_path is specified, committed batches are recorded in the state file (see Checkpoint) and insertion
+    restarted with the same parameters inserts only the rest of batches, which get the same data.
+
+    Returns
+    -------
+     Number of inserted rows
+    """
+    checkpoint = None
+    if checkpoint_path is not None:
+        if use_staging_tables:
+            raise ValueError('Checkpoint cannot be used with staging tables, they are dropped if insertion fails.')
+        if use_spark_executors:
+            logger.warning(f'Data of {dest_table_name_with_schema} is generated on Spark executors in one job, checkpoint is not used.')
+        else:
+            checkpoint = Checkpoint(checkpoint_path, dest_table_name_with_schema, number_of_rows_to_insert, batch_size,
+                                    get_generator_spec(columns_info_with_set_generators), seed=seed)
+            seed = checkpoint.get_seed()
+    callbacks = get_callbacks(callbacks)
+    metrics = InsertionMetrics(dest_table_name_with_schema,
+                               number_of_rows_to_insert - (checkpoint.get_number_of_rows_committed() if checkpoint is not None else 0))
+    lock_for_metrics = Lock()
+    for callback in callbacks:
+        callback.on_start(metrics)
+
+    if use_spark_executors and key_index_paths:
+        logger.warning(f'Keys of {dest_table_name_with_schema} are indexed on the driver, so its data is not generated on Spark executors.')
+        use_spark_executors = False
+    if use_spark_executors and not has_backend_function(conn, 'execute_insertion_on_executors'):
+        logger.warning(f'Connection of type {type(conn).__name__} cannot generate data on executors, it is generated by this process.')
+        use_spark_executors = False
+    if use_spark_executors:
+        execute_insertion_on_executors = get_backend_function(conn, 'execute_insertion_on_executors')
+        execute_insertion_on_executors(conn, dest_table_name_with_schema, number_of_rows_to_insert,
+                                       columns_info_with_set_generators, batch_size,
+                                       seed=seed, number_of_partitions=number_of_partitions)
+        metrics.add_batch(BatchMetrics(number_of_rows_to_insert, 0, 0.0, metrics.get_elapsed_seconds()))
+        metrics.finish()
+        for callback in callbacks:
+            callback.on_finish(metrics)
+        return metrics.number_of_rows_inserted
+
+    first_row_offset, skipped_row_offsets = 0, None
+    # committed batches of a table with indexed keys are generated again, so its key indexes get all keys
+    if checkpoint is not None and not key_index_paths:
+        first_row_offset, skipped_row_offsets = checkpoint.get_first_uncommitted_row_offset(), checkpoint.get_committed_row_offsets()
+    batches_of_fake_data = get_batches_of_fake_data(number_of_rows=number_of_rows_to_insert,
+                                                    batch_size=batch_size,
+                                                    columns_info_with_set_generators=columns_info_with_set_generators,
+                                                    number_of_processes=number_of_processes,
+                                                    seed=seed,
+                                                    first_row_offset=first_row_offset,
+                                                    skipped_row_offsets=skipped_row_offsets)
+    key_index_writers = {column_name: KeyIndexWriter(key_index_path) for column_name, key_index_path in (key_index_paths or {}).items()}
+    if key_index_writers:
+        batches_of_fake_data = get_batches_with_indexed_keys(batches_of_fake_data, key_index_writers)
+    if checkpoint is not None and key_index_paths:
+        batches_of_fake_data = (batch_of_fake_data for batch_of_fake_data in batches_of_fake_data
+                                if not checkpoint.is_committed(batch_of_fake_data.row_offset))
+
+    if use_staging_tables and not has_backend_function(conn, 'merge_staging_tables'):
+        logger.warning(f'Connection of type {type(conn).__name__} does not support staging tables, rows are inserted directly.')
+        use_staging_tables = False
+    staging_table_names_with_schema = []
+    lock_for_staging_tables = Lock()
+    staging_table_prefix = f'{dest_table_name_with_schema}_staging_{uuid4().hex[:8]}'
+
+    def get_loader_for_dest_table():
+        table_name_with_schema = dest_table_name_with_schema
+        if use_staging_tables:
+            with lock_for_staging_tables:
+                table_name_with_schema = f'{staging_table_prefix}_{len(staging_table_names_with_schema)}'
+                staging_table_names_with_schema.append(table_name_with_schema)
+            get_backend_function(conn, 'create_staging_table')(conn, dest_table_name_with_schema, table_name_with_schema)
+        table_loader = get_backend_function(conn, 'get_loader')(conn, table_name_with_schema, columns_info_with_set_generators,
+                                                                loader=loader, transaction_size=transaction_size,
+                                                                max_retries=max_retries, retry_backoff=retry_backoff,
+                                                                number_of_writers=number_of_writers)
+        if checkpoint is not None:
+            if not hasattr(table_loader, 'set_on_commit'):
+                raise ValueError(f'Loader {type(table_loader).__name__} does not report committed batches, checkpoint cannot be used.')
+            table_loader.set_on_commit(checkpoint.add_committed_row_offsets)
+        return table_loader
+
+    def insert_batch(opened_loader, batch_of_fake_data):
+        write_start = perf_counter()
+        opened_loader.insert(batch_of_fake_data)
+        batch_metrics = BatchMetrics(number_of_rows=batch_of_fake_data.number_of_rows,
+                                     number_of_bytes=batch_of_fake_data.get_memory_usage(),
+                                     generation_seconds=batch_of_fake_data.generation_seconds,
+                                     write_seconds=perf_counter() - write_start,
+                                     column_name_to_seconds=batch_of_fake_data.column_name_to_seconds)
+        with lock_for_metrics:
+            metrics.add_batch(batch_metrics)
+            for callback in callbacks:
+                callback.on_batch_inserted(metrics, batch_metrics)
+
+    try:
+        if use_pipeline or number_of_writers > 1:
+            execute_pipelined_insertion(batches_of_fake_data=batches_of_fake_data,
+                                        get_loader=get_loader_for_dest_table,
+                                        insert_batch=insert_batch,
+                                        number_of_writers=number_of_writers,
+                                        queue_size=queue_size,
+                                        queue_max_memory=queue_max_memory)
         else:
-            fake_data_in_df_spark = conn.createDataFrame(fake_data_in_df, schema=schema)
-            fake_data_in_df_spark.write.format('hive').mode('append').saveAsTable(dest_table_name_with_schema)
-        number_of_rows_left_to_insert -= min(batch_size, number_of_rows_left_to_insert)
-        logger.info(f'Insertion of fake data into {dest_table_name_with_schema} was finished.\n'
-                    f'\tNumber of rows left to insert: {number_of_rows_left_to_insert}')
+            with get_loader_for_dest_table() as opened_loader:
+                for batch_of_fake_data in batches_of_fake_data:
+                    insert_batch(opened_loader, batch_of_fake_data)
+        if staging_table_names_with_schema:
+            merge_staging_tables = get_backend_function(conn, 'merge_staging_tables')
+            merge_staging_tables(conn, dest_table_name_with_schema, staging_table_names_with_schema, metrics.number_of_rows_inserted)
+        if checkpoint is not None:
+            checkpoint.remove()
+    finally:
+        for key_index_writer in key_index_writers.values():
+            key_index_writer.close()
+        if staging_table_names_with_schema:
+            get_backend_function(conn, 'drop_staging_tables')(conn, staging_table_names_with_schema)
+    metrics.finish()
+    for callback in callbacks:
+        callback.on_finish(metrics)
+    return metrics.number_of_rows_inserted
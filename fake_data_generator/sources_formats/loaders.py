@@ -0,0 +1,249 @@
+import time
+import sqlalchemy
+from io import StringIO
+from loguru import logger
+
+
+def is_retriable_error(error, dialect):
+    """
+    Function that checks if the error is transient: OperationalError of SQLAlchemy or of the DBAPI module of the dialect
+    (lost connection, timeout, locked database, deadlock) or any DBAPI error which invalidated the connection.
+    """
+    if isinstance(error, sqlalchemy.exc.DBAPIError):
+        return error.connection_invalidated or isinstance(error, sqlalchemy.exc.OperationalError)
+    dbapi = getattr(dialect, 'loaded_dbapi', None) or getattr(dialect, 'dbapi', None)
+    return dbapi is not None and isinstance(error, getattr(dbapi, 'OperationalError', ()))
+
+
+class Loader:
+    """
+    Loader inserting batches of fake data into a table through a SQLAlchemy engine.
+    Rows are inserted with executemany of a single-row INSERT and committed every transaction_size rows
+    (after every batch if transaction_size is not specified).
+    If inserting a batch fails with a transient error, the transaction is rolled back, the connection is replaced
+    and all batches of the transaction are inserted again after a pause of retry_backoff * 2 ** attempt seconds,
+    so every batch is committed exactly once (batches of the transaction are kept in memory only if max_retries > 0).
+    on_commit (see set_on_commit) is called with row offsets of batches of every committed transaction.
+    """
+    def __init__(self,
+                 conn,
+                 dest_table_name_with_schema: str,
+                 columns_info_with_set_generators: list = None,
+                 transaction_size: int = None,
+                 rows_per_statement: int = 1000,
+                 max_retries: int = 0,
+                 retry_backoff: float = 1.0):
+        self.conn = conn
+        self.column_name_to_data_type = {column_info.get_column_name(): column_info.get_data_type()
+                                         for column_info in columns_info_with_set_generators or []}
+        self.schema_name, self.table_name = dest_table_name_with_schema.split('.')
+        self.transaction_size = transaction_size
+        self.rows_per_statement = rows_per_statement
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.connection = None
+        self.transaction = None
+        self.row_offsets_in_transaction = []
+        self.batches_in_transaction = []
+        self.number_of_rows_in_transaction = 0
+        self.number_of_rows_committed = 0
+        self.on_commit = None
+
+    def set_on_commit(self, on_commit):
+        self.on_commit = on_commit
+
+    def __enter__(self):
+        self.connection = self.conn.connect()
+        self.transaction = self.connection.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.insert_with_retries(batch_of_fake_data=None, commit_after=self.commit_transaction)
+            else:
+                self.transaction.rollback()
+        finally:
+            self.connection.close()
+
+    def commit_transaction(self):
+        self.transaction.commit()
+        self.number_of_rows_committed += self.number_of_rows_in_transaction
+        if self.on_commit is not None:
+            self.on_commit(self.row_offsets_in_transaction)
+        self.row_offsets_in_transaction = []
+        self.batches_in_transaction = []
+        self.number_of_rows_in_transaction = 0
+
+    def commit(self):
+        self.commit_transaction()
+        self.transaction = self.connection.begin()
+
+    def reconnect(self):
+        try:
+            self.transaction.rollback()
+        except sqlalchemy.exc.SQLAlchemyError:
+            pass
+        self.connection.close()
+        self.connection = self.conn.connect()
+        self.transaction = self.connection.begin()
+
+    def insert_with_retries(self, batch_of_fake_data, commit_after=None):
+        """
+        Method that inserts the batch (already added to the transaction) and calls commit_after.
+        On retry the transaction is started on a new connection and all its batches are inserted again.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                if attempt == 0:
+                    batches_to_insert = [batch_of_fake_data] if batch_of_fake_data is not None else []
+                else:
+                    self.reconnect()
+                    batches_to_insert = self.batches_in_transaction
+                for batch_to_insert in batches_to_insert:
+                    self.insert_rows(batch_to_insert)
+                if commit_after is not None:
+                    commit_after()
+                return
+            except Exception as error:
+                if attempt == self.max_retries or not is_retriable_error(error, self.conn.dialect):
+                    raise
+                pause = self.retry_backoff * 2 ** attempt
+                logger.warning(f'Insertion into {self.schema_name}.{self.table_name} failed ({type(error).__name__}: {getattr(error, "orig", error)}), '
+                               f'{self.number_of_rows_in_transaction} rows of the transaction will be inserted again in {pause:.1f} s '
+                               f'(retry {attempt + 1} of {self.max_retries}).')
+                time.sleep(pause)
+
+    def get_table(self, column_names):
+        return sqlalchemy.table(self.table_name, *map(sqlalchemy.column, column_names), schema=self.schema_name)
+
+    def insert(self, batch_of_fake_data):
+        self.row_offsets_in_transaction.append(batch_of_fake_data.row_offset)
+        if self.max_retries > 0:
+            self.batches_in_transaction.append(batch_of_fake_data)
+        self.number_of_rows_in_transaction += batch_of_fake_data.number_of_rows
+        transaction_is_full = self.transaction_size is None or self.number_of_rows_in_transaction >= self.transaction_size
+        self.insert_with_retries(batch_of_fake_data, commit_after=self.commit if transaction_is_full else None)
+
+    def insert_rows(self, batch_of_fake_data):
+        column_names = batch_of_fake_data.get_column_names()
+        rows = [dict(zip(column_names, row)) for row in batch_of_fake_data.get_rows(self.column_name_to_data_type)]
+        if rows:
+            self.connection.execute(self.get_table(column_names).insert(), rows)
+
+
+class SQLiteLoader(Loader):
+    """
+    Loader inserting rows into SQLite with executemany of a single-row INSERT committed every default_transaction_size rows
+    if transaction_size is not specified (SQLite syncs its journal on every commit, so committing every small batch
+    takes most of the time of insertion, while transactions of bounded size keep bounded number of batches in memory
+    for retries).
+    """
+    default_transaction_size = 100000
+
+    def __init__(self, *args, transaction_size: int = None, **kwargs):
+        super().__init__(*args, transaction_size=transaction_size if transaction_size is not None else self.default_transaction_size,
+                         **kwargs)
+
+
+class MultiRowValuesLoader(Loader):
+    """
+    Loader inserting rows with INSERT statements having multi-row VALUES clause of rows_per_statement rows.
+    """
+    max_parameters_per_statement = 2000
+
+    def insert_rows(self, batch_of_fake_data):
+        column_names = batch_of_fake_data.get_column_names()
+        table = self.get_table(column_names)
+        rows = [dict(zip(column_names, row)) for row in batch_of_fake_data.get_rows(self.column_name_to_data_type)]
+        rows_per_statement = max(1, min(self.rows_per_statement, self.max_parameters_per_statement // max(1, len(column_names))))
+        for start in range(0, len(rows), rows_per_statement):
+            self.connection.execute(table.insert().values(rows[start:start + rows_per_statement]))
+
+
+def get_csv_field_for_copy(value):
+    return '' if value is None else '"' + str(value).replace('"', '""') + '"'
+
+
+def get_csv_for_copy(rows):
+    """
+    Function that writes rows as CSV for COPY FROM in CSV format with its default NULL: nulls are unquoted empty fields
+    and all other values are quoted, so empty strings and strings looking like null markers (e.g. \\N) stay strings.
+    """
+    return ''.join(','.join(map(get_csv_field_for_copy, row)) + '\n' for row in rows)
+
+
+class PostgresCopyLoader(Loader):
+    """
+    Loader inserting rows with PostgreSQL COPY FROM STDIN of an in-memory CSV buffer (works with psycopg2 and psycopg).
+    """
+    def insert_rows(self, batch_of_fake_data):
+        quote = self.connection.dialect.identifier_preparer.quote
+        copy_query = f"COPY {quote(self.schema_name)}.{quote(self.table_name)} " \
+                     f"({', '.join(map(quote, batch_of_fake_data.get_column_names()))}) FROM STDIN WITH (FORMAT csv)"
+        buffer = StringIO(get_csv_for_copy(batch_of_fake_data.get_rows(self.column_name_to_data_type)))
+        cursor = self.connection.connection.dbapi_connection.cursor()
+        try:
+            if hasattr(cursor, 'copy_expert'):
+                cursor.copy_expert(copy_query, buffer)
+            else:
+                with cursor.copy(copy_query) as copy:
+                    copy.write(buffer.getvalue())
+        finally:
+            cursor.close()
+
+
+LOADERS = {
+    'executemany': Loader,
+    'multi_values': MultiRowValuesLoader,
+    'copy': PostgresCopyLoader,
+}
+
+DEFAULT_LOADERS_FOR_DIALECTS = {
+    'postgresql': PostgresCopyLoader,
+    'sqlite': SQLiteLoader,
+    'mysql': MultiRowValuesLoader,
+    'mariadb': MultiRowValuesLoader,
+    'mssql': MultiRowValuesLoader,
+}
+
+
+def get_loader(conn,
+               dest_table_name_with_schema: str,
+               columns_info_with_set_generators: list,
+               loader=None,
+               transaction_size: int = None,
+               max_retries: int = 0,
+               retry_backoff: float = 1.0,
+               number_of_writers: int = 1):
+    """
+    Function that returns loader for the SQLAlchemy engine.
+
+    Parameters
+    ----------
+     conn: SQLAlchemy engine
+     dest_table_name_with_schema: Name of the table with schema in which rows will be inserted
+     columns_info_with_set_generators: List of Column objects of the table
+     loader: Name of the loader ('executemany', 'multi_values' or 'copy') or Loader subclass used for SQLAlchemy engine.
+     If it is not specified, loader is selected by the dialect of the engine (for SQLite with one writer the transaction
+     is committed every SQLiteLoader.default_transaction_size rows, several writers commit every batch as SQLite lets only
+     one of them hold a transaction)
+     transaction_size: Number of rows after which transaction is committed
+     max_retries: Number of retries of a transaction failed with a transient error
+     retry_backoff: Pause in seconds before the first retry, it is doubled before every next retry
+     number_of_writers: Number of writers inserting into the table at the same time
+
+    Returns
+    -------
+     Loader object that should be used as a context manager
+    """
+    if loader is None:
+        loader_class = DEFAULT_LOADERS_FOR_DIALECTS.get(conn.dialect.name, MultiRowValuesLoader)
+        if loader_class is SQLiteLoader and number_of_writers > 1:
+            loader_class = Loader
+    elif isinstance(loader, str):
+        loader_class = LOADERS[loader]
+    else:
+        loader_class = loader
+    return loader_class(conn, dest_table_name_with_schema, columns_info_with_set_generators, transaction_size=transaction_size,
+                        max_retries=max_retries, retry_backoff=retry_backoff)
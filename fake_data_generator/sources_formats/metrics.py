@@ -0,0 +1,220 @@
+import json
+import time
+import cProfile
+import pstats
+from io import StringIO
+from loguru import logger
+from numpy import percentile
+
+
+class BatchMetrics:
+    """
+    Metrics of one inserted batch.
+
+    Parameters
+    ----------
+     number_of_rows: Number of rows in the batch
+     number_of_bytes: Size of generated data of the batch in bytes (memory usage of its arrays)
+     generation_seconds: Time of generation of the batch (in the process which generated it)
+     write_seconds: Time of insertion of the batch
+     column_name_to_seconds: Dict of column names and times of generation of their data
+    """
+    def __init__(self,
+                 number_of_rows: int,
+                 number_of_bytes: int,
+                 generation_seconds: float,
+                 write_seconds: float,
+                 column_name_to_seconds: dict = None):
+        self.number_of_rows = number_of_rows
+        self.number_of_bytes = number_of_bytes
+        self.generation_seconds = generation_seconds
+        self.write_seconds = write_seconds
+        self.column_name_to_seconds = column_name_to_seconds or {}
+
+
+class InsertionMetrics:
+    """
+    Metrics of generation and insertion of rows into one table accumulated batch by batch.
+    """
+    def __init__(self, table_name: str, number_of_rows_to_insert: int):
+        self.table_name = table_name
+        self.number_of_rows_to_insert = number_of_rows_to_insert
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        self.number_of_batches = 0
+        self.number_of_rows_inserted = 0
+        self.number_of_bytes = 0
+        self.generation_seconds = 0.0
+        self.write_seconds = 0.0
+        self.column_name_to_seconds = {}
+
+    def add_batch(self, batch_metrics: BatchMetrics):
+        self.number_of_batches += 1
+        self.number_of_rows_inserted += batch_metrics.number_of_rows
+        self.number_of_bytes += batch_metrics.number_of_bytes
+        self.generation_seconds += batch_metrics.generation_seconds
+        self.write_seconds += batch_metrics.write_seconds
+        for column_name, seconds in batch_metrics.column_name_to_seconds.items():
+            self.column_name_to_seconds[column_name] = self.column_name_to_seconds.get(column_name, 0.0) + seconds
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    def get_elapsed_seconds(self):
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def get_rows_per_second(self):
+        elapsed_seconds = self.get_elapsed_seconds()
+        return self.number_of_rows_inserted / elapsed_seconds if elapsed_seconds > 0 else 0.0
+
+    def get_eta_seconds(self):
+        rows_per_second = self.get_rows_per_second()
+        if rows_per_second == 0:
+            return None
+        return (self.number_of_rows_to_insert - self.number_of_rows_inserted) / rows_per_second
+
+    def get_summary(self):
+        return {
+            'table_name': self.table_name,
+            'number_of_rows_inserted': self.number_of_rows_inserted,
+            'number_of_batches': self.number_of_batches,
+            'number_of_bytes': self.number_of_bytes,
+            'elapsed_seconds': self.get_elapsed_seconds(),
+            'rows_per_second': self.get_rows_per_second(),
+            'generation_seconds': self.generation_seconds,
+            'write_seconds': self.write_seconds,
+            'column_name_to_seconds': dict(sorted(self.column_name_to_seconds.items(), key=lambda item: -item[1])),
+        }
+
+
+class InsertionCallback:
+    """
+    Base class of callbacks receiving metrics of insertion of fake data, its methods do nothing.
+    Methods are called under a lock, so a callback does not have to be thread-safe when batches are written by several writers.
+    """
+    def on_start(self, metrics: InsertionMetrics):
+        pass
+
+    def on_batch_inserted(self, metrics: InsertionMetrics, batch_metrics: BatchMetrics):
+        pass
+
+    def on_finish(self, metrics: InsertionMetrics):
+        pass
+
+
+class LoggingCallback(InsertionCallback):
+    """
+    Callback logging progress of insertion (rows/sec and ETA) at most once in log_interval seconds and the summary at the end.
+
+    Parameters
+    ----------
+     verbose: If True, every batch with times of generation of its columns is logged
+     log_interval: Minimum number of seconds between two progress lines
+    """
+    def __init__(self, verbose: bool = False, log_interval: float = 10.0):
+        self.verbose = verbose
+        self.log_interval = log_interval
+        self.logged_at = None
+
+    def on_start(self, metrics):
+        self.logged_at = time.perf_counter()
+        logger.info(f'Start generating {metrics.number_of_rows_to_insert} rows and inserting them into {metrics.table_name} table.')
+
+    def on_batch_inserted(self, metrics, batch_metrics):
+        if self.verbose:
+            for column_name, seconds in batch_metrics.column_name_to_seconds.items():
+                logger.info(f'Data for {column_name} was generated in {seconds:.4f} s.')
+            logger.info(f'Batch of {batch_metrics.number_of_rows} rows was generated in {batch_metrics.generation_seconds:.3f} s '
+                        f'and inserted in {batch_metrics.write_seconds:.3f} s.')
+        elif time.perf_counter() - self.logged_at < self.log_interval:
+            return
+        self.logged_at = time.perf_counter()
+        eta_seconds = metrics.get_eta_seconds()
+        logger.info(f'{metrics.table_name}: {metrics.number_of_rows_inserted} of {metrics.number_of_rows_to_insert} rows inserted, '
+                    f'{metrics.get_rows_per_second():.0f} rows/s'
+                    + (f', ETA {eta_seconds:.0f} s.' if eta_seconds is not None else '.'))
+
+    def on_finish(self, metrics):
+        logger.info(f'Insertion of {metrics.number_of_rows_inserted} rows into {metrics.table_name} was finished '
+                    f'in {metrics.get_elapsed_seconds():.1f} s ({metrics.get_rows_per_second():.0f} rows/s, '
+                    f'generation {metrics.generation_seconds:.1f} s, writing {metrics.write_seconds:.1f} s, '
+                    f'{metrics.number_of_bytes / 2 ** 20:.1f} MB).')
+
+
+class TimingCallback(InsertionCallback):
+    """
+    Callback collecting the summary of every table (see InsertionMetrics.get_summary) with percentiles
+    of latencies of generation and writing of batches.
+
+    Parameters
+    ----------
+     output_path: Path of JSON file into which summaries are written at the end of insertion into every table
+    """
+    def __init__(self, output_path: str = None):
+        self.output_path = output_path
+        self.table_name_to_latencies = {}
+        self.table_name_to_summary = {}
+
+    def on_start(self, metrics):
+        self.table_name_to_latencies[metrics.table_name] = ([], [])
+
+    def on_batch_inserted(self, metrics, batch_metrics):
+        generation_latencies, write_latencies = self.table_name_to_latencies[metrics.table_name]
+        generation_latencies.append(batch_metrics.generation_seconds)
+        write_latencies.append(batch_metrics.write_seconds)
+
+    def on_finish(self, metrics):
+        summary = metrics.get_summary()
+        for latency_name, latencies in zip(('generation_latency', 'write_latency'), self.table_name_to_latencies.pop(metrics.table_name)):
+            if latencies:
+                summary[latency_name] = {'p50': float(percentile(latencies, 50)),
+                                         'p95': float(percentile(latencies, 95)),
+                                         'max': float(max(latencies))}
+        self.table_name_to_summary[metrics.table_name] = summary
+        if self.output_path is not None:
+            with open(self.output_path, 'w') as file:
+                json.dump(self.table_name_to_summary, file, indent=2)
+
+    def get_summaries(self):
+        return self.table_name_to_summary
+
+
+class ProfilingCallback(InsertionCallback):
+    """
+    Callback running cProfile in the thread calling execute_insertion from the start to the end of insertion into a table.
+    Statistics are saved into output_path (readable by pstats or snakeviz) and the top functions are logged.
+
+    Parameters
+    ----------
+     output_path: Path of the file of statistics (statistics are only logged if it is not specified)
+     number_of_functions: Number of functions with the biggest cumulative time in the logged summary
+    """
+    def __init__(self, output_path: str = None, number_of_functions: int = 20):
+        self.output_path = output_path
+        self.number_of_functions = number_of_functions
+        self.table_name_to_profile = {}
+
+    def on_start(self, metrics):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as error:
+            # since Python 3.12 only one profiler can be active at a time, e.g. while another table is profiled
+            logger.warning(f'Insertion into {metrics.table_name} is not profiled: {error}.')
+            return
+        self.table_name_to_profile[metrics.table_name] = profile
+
+    def on_finish(self, metrics):
+        profile = self.table_name_to_profile.pop(metrics.table_name, None)
+        if profile is None:
+            return
+        profile.disable()
+        if self.output_path is not None:
+            profile.dump_stats(self.output_path)
+        summary = StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(self.number_of_functions)
+        logger.info(f'Profile of insertion into {metrics.table_name}:\n{summary.getvalue()}')
+
+
+def get_callbacks(callbacks):
+    return [LoggingCallback()] if callbacks is None else list(callbacks)
@@ -0,0 +1,113 @@
+from collections import deque
+from threading import Condition, Thread
+
+
+class BatchQueue:
+    """
+    Queue of batches bounded both by the number of batches and by their total memory usage.
+    A batch bigger than max_memory is still accepted when the queue is empty, so generation can not get stuck.
+    """
+    def __init__(self,
+                 max_size: int,
+                 max_memory: int = None):
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.batches = deque()
+        self.memory = 0
+        self.finished = False
+        self.error = None
+        self.condition = Condition()
+
+    def has_room_for(self, batch_memory):
+        if len(self.batches) >= self.max_size:
+            return False
+        return self.max_memory is None or not self.batches or self.memory + batch_memory <= self.max_memory
+
+    def put(self, batch):
+        batch_memory = batch.get_memory_usage() if self.max_memory is not None else 0
+        with self.condition:
+            self.condition.wait_for(lambda: self.error is not None or self.has_room_for(batch_memory))
+            if self.error is not None:
+                return False
+            self.batches.append((batch, batch_memory))
+            self.memory += batch_memory
+            self.condition.notify_all()
+            return True
+
+    def get(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.error is not None or self.batches or self.finished)
+            if self.error is not None or not self.batches:
+                return None
+            batch, batch_memory = self.batches.popleft()
+            self.memory -= batch_memory
+            self.condition.notify_all()
+            return batch
+
+    def finish(self):
+        with self.condition:
+            self.finished = True
+            self.condition.notify_all()
+
+    def abort(self, error):
+        with self.condition:
+            if self.error is None:
+                self.error = error
+            self.condition.notify_all()
+
+
+def execute_pipelined_insertion(batches_of_fake_data,
+                                get_loader,
+                                insert_batch,
+                                number_of_writers: int = 1,
+                                queue_size: int = 2,
+                                queue_max_memory: int = None):
+    """
+    Function that generates batches in a producer thread while writer threads insert already generated ones.
+
+    Parameters
+    ----------
+     batches_of_fake_data: Iterator of Batch objects to insert
+     get_loader: Function returning loader context manager, every writer thread opens its own loader
+     insert_batch: Function inserting one batch with the opened loader, it is called from writer threads
+     number_of_writers: Number of writer threads draining the queue
+     queue_size: Maximum number of generated batches waiting for insertion
+     queue_max_memory: Maximum total memory in bytes of generated batches waiting for insertion
+
+    The first error raised by the producer or by any writer stops the other threads and is raised again.
+    """
+    batch_queue = BatchQueue(max_size=queue_size, max_memory=queue_max_memory)
+
+    def produce():
+        try:
+            for batch in batches_of_fake_data:
+                if not batch_queue.put(batch):
+                    break
+        except BaseException as error:
+            batch_queue.abort(error)
+        finally:
+            if hasattr(batches_of_fake_data, 'close'):
+                batches_of_fake_data.close()
+            batch_queue.finish()
+
+    def write():
+        try:
+            with get_loader() as opened_loader:
+                while True:
+                    batch = batch_queue.get()
+                    if batch is None:
+                        break
+                    insert_batch(opened_loader, batch)
+                if batch_queue.error is not None:
+                    raise batch_queue.error
+        except BaseException as error:
+            batch_queue.abort(error)
+
+    threads = [Thread(target=produce, name='fake-data-producer')] + \
+              [Thread(target=write, name=f'fake-data-writer-{writer_index}') for writer_index in range(number_of_writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if batch_queue.error is not None:
+        raise batch_queue.error
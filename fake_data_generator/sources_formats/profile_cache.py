@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import hashlib
+from loguru import logger
+
+
+def get_hash_of_object(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_fingerprint_of_column_info(column_info):
+    """
+    Function that returns hash of all attributes of the Column object passed by user except its generator,
+    it is None if the column is not overridden.
+    """
+    if column_info is None:
+        return None
+    attributes = {name: value for name, value in vars(column_info).items() if name not in ('generator', 'random_generator')}
+    return get_hash_of_object([type(column_info).__name__, attributes])
+
+
+class ProfileCache:
+    """
+    On-disk cache of profiles of source tables. An entry is a JSON file keyed by the table name and the parameters
+    of sampling, it stores profiles of columns together with their data types (from DESCRIBE), fingerprints of
+    overrides from columns_info and the time of profiling. A column profile is reused while its data type and
+    override are the same and it is not older than ttl, only the other columns are profiled again.
+    DESCRIBE output is checked column by column rather than by one hash of it, so a changed type of one column
+    does not invalidate profiles of the other columns.
+
+    Parameters
+    ----------
+     directory: Directory of cache files (created if it does not exist)
+     ttl: Time in seconds during which a profile of a column is valid (profiles do not expire if it is None)
+     max_size: Maximum total size of cache files in bytes, least recently used entries are deleted when it is exceeded
+    """
+    def __init__(self,
+                 directory: str,
+                 ttl: float = None,
+                 max_size: int = None):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def get_entry_path(self, source_table_name_with_schema, sampling_params):
+        key = get_hash_of_object([source_table_name_with_schema, sampling_params])[:32]
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get_column_profiles(self,
+                            source_table_name_with_schema: str,
+                            sampling_params: dict,
+                            column_name_to_data_type: dict,
+                            column_name_to_fingerprint: dict):
+        """
+        Function that returns dict of column names and profiles (dicts of get_as_dict) of columns
+        which are still valid for the given data types and overrides.
+        """
+        entry_path = self.get_entry_path(source_table_name_with_schema, sampling_params)
+        if not os.path.exists(entry_path):
+            return {}
+        try:
+            with open(entry_path, 'r') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        os.utime(entry_path)
+
+        column_profiles = {}
+        for column_name, cached_column in entry['columns'].items():
+            if column_name not in column_name_to_data_type \
+                    or cached_column['data_type'] != column_name_to_data_type[column_name] \
+                    or cached_column['fingerprint'] != column_name_to_fingerprint.get(column_name) \
+                    or (self.ttl is not None and time.time() - cached_column['profiled_at'] > self.ttl):
+                continue
+            column_profiles[column_name] = cached_column['profile']
+        return column_profiles
+
+    def put_column_profiles(self,
+                            source_table_name_with_schema: str,
+                            sampling_params: dict,
+                            column_name_to_data_type: dict,
+                            column_name_to_fingerprint: dict,
+                            column_profiles: dict,
+                            column_names_profiled_now: list):
+        entry = {
+            'table': source_table_name_with_schema,
+            'sampling_params': sampling_params,
+            'columns': {},
+        }
+        entry_path = self.get_entry_path(source_table_name_with_schema, sampling_params)
+        old_columns = {}
+        if os.path.exists(entry_path):
+            try:
+                with open(entry_path, 'r') as file:
+                    old_columns = json.load(file)['columns']
+            except (OSError, ValueError):
+                pass
+        now = time.time()
+        for column_name, column_profile in column_profiles.items():
+            profiled_at = now if column_name in column_names_profiled_now or column_name not in old_columns \
+                else old_columns[column_name]['profiled_at']
+            entry['columns'][column_name] = {
+                'data_type': column_name_to_data_type[column_name],
+                'fingerprint': column_name_to_fingerprint.get(column_name),
+                'profiled_at': profiled_at,
+                'profile': column_profile,
+            }
+        temporary_path = f'{entry_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as file:
+            json.dump(entry, file, default=str)
+        os.replace(temporary_path, entry_path)
+        self.evict()
+
+    def evict(self):
+        """
+        Function that deletes entries not used for ttl seconds and then least recently used entries
+        until total size of the cache does not exceed max_size.
+        """
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith('.json'):
+                continue
+            entry_path = os.path.join(self.directory, file_name)
+            try:
+                file_stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((file_stat.st_mtime, file_stat.st_size, entry_path))
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        now = time.time()
+        for last_used_at, size, entry_path in entries:
+            expired = self.ttl is not None and now - last_used_at > self.ttl
+            if not expired and (self.max_size is None or total_size <= self.max_size):
+                continue
+            try:
+                os.remove(entry_path)
+                total_size -= size
+                logger.info(f'Profile cache entry {entry_path} was evicted.')
+            except OSError:
+                pass
@@ -0,0 +1,158 @@
+import json
+import struct
+from numpy import array, asarray, memmap, zeros, cumsum, concatenate, frombuffer, float64, int64, uint8
+from pandas import to_datetime
+from fake_data_generator.columns_generator.batch import get_dictionary_and_null_flags
+
+PROFILE_FORMATS = ('json', 'binary')
+BINARY_PROFILE_MAGIC = b'FDGPROF1'
+BINARY_PROFILE_ALIGNMENT = 64
+ARRAY_FIELDS_TO_DTYPES = {
+    'probabilities': float64,
+    'intervals': float64,
+    'lengths': int64,
+    'length_probabilities': float64,
+}
+
+
+class LazyStrings:
+    """
+    Array of strings stored as concatenated UTF-8 bytes and offsets (both memory-mapped).
+    Strings are decoded into numpy array of objects when the array is used for the first time.
+    """
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+        self.strings = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __array__(self, dtype=None, copy=None):
+        if self.strings is None:
+            data = self.data.tobytes()
+            offsets = self.offsets.tolist()
+            self.strings = array([data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])], dtype=object)
+        return self.strings if dtype is None else self.strings.astype(dtype)
+
+
+def get_typed_categorical_values(values, data_type):
+    if data_type in ('date', 'timestamp') and all(isinstance(value, str) or value is None for value in values):
+        datetime_index = to_datetime(values, format='%Y-%m-%d' if data_type == 'date' else '%Y-%m-%d %H:%M:%S')
+        values = list(datetime_index.date) if data_type == 'date' else list(datetime_index.to_pydatetime())
+    return get_dictionary_and_null_flags(values)
+
+
+class BinaryProfileWriter:
+    def __init__(self):
+        self.arrays = []
+        self.size_of_data = 0
+
+    def add_array(self, values):
+        values = asarray(values)
+        if values.dtype.kind == 'U':
+            encoded_strings = [value.encode('utf-8') for value in values.tolist()]
+            offsets = concatenate([[0], cumsum([len(encoded_string) for encoded_string in encoded_strings], dtype=int64)]).astype(int64)
+            return {'utf8': {'data': self.add_array(frombuffer(b''.join(encoded_strings), dtype=uint8)),
+                             'offsets': self.add_array(offsets)}}
+        offset = -(-self.size_of_data // BINARY_PROFILE_ALIGNMENT) * BINARY_PROFILE_ALIGNMENT
+        self.arrays.append((offset, values))
+        self.size_of_data = offset + values.nbytes
+        return {'dtype': values.dtype.str, 'shape': list(values.shape), 'offset': offset}
+
+    def get_column_header(self, column_info_dict):
+        column_header = {}
+        for field_name, field_value in column_info_dict.items():
+            if field_value is None:
+                column_header[field_name] = None
+            elif field_name == 'null_flags':
+                continue
+            elif field_name == 'values' and column_info_dict.get('type') == 'CATEGORICAL':
+                typed_values, null_flags = get_typed_categorical_values(list(field_value), column_info_dict.get('data_type'))
+                if typed_values.dtype.kind == 'O':
+                    column_header[field_name] = field_value
+                    continue
+                column_header[field_name] = self.add_array(typed_values)
+                column_header['null_flags'] = self.add_array(null_flags)
+            elif field_name in ARRAY_FIELDS_TO_DTYPES:
+                column_header[field_name] = self.add_array(asarray(field_value, dtype=ARRAY_FIELDS_TO_DTYPES[field_name]))
+            else:
+                column_header[field_name] = field_value
+        return column_header
+
+    def write(self, path, rich_columns_info_dict):
+        header = {'columns': {column_name: self.get_column_header(column_info_dict)
+                              for column_name, column_info_dict in rich_columns_info_dict.items()}}
+        encoded_header = json.dumps(header, default=str).encode('utf-8')
+        start_of_data = get_start_of_data(len(encoded_header))
+        with open(path, 'wb') as file:
+            file.write(BINARY_PROFILE_MAGIC)
+            file.write(struct.pack('<Q', len(encoded_header)))
+            file.write(encoded_header)
+            for offset, values in self.arrays:
+                file.seek(start_of_data + offset)
+                file.write(values.tobytes())
+
+
+def get_start_of_data(size_of_header):
+    size_of_prefix = len(BINARY_PROFILE_MAGIC) + 8 + size_of_header
+    return -(-size_of_prefix // BINARY_PROFILE_ALIGNMENT) * BINARY_PROFILE_ALIGNMENT
+
+
+def get_array_from_reference(path, start_of_data, reference):
+    if 'utf8' in reference:
+        return LazyStrings(get_array_from_reference(path, start_of_data, reference['utf8']['data']),
+                           get_array_from_reference(path, start_of_data, reference['utf8']['offsets']))
+    shape = tuple(reference['shape'])
+    if 0 in shape:
+        return zeros(shape, dtype=reference['dtype'])
+    return memmap(path, dtype=reference['dtype'], mode='r', offset=start_of_data + reference['offset'], shape=shape)
+
+
+def read_binary_profile(path):
+    with open(path, 'rb') as file:
+        file.read(len(BINARY_PROFILE_MAGIC))
+        size_of_header = struct.unpack('<Q', file.read(8))[0]
+        header = json.loads(file.read(size_of_header).decode('utf-8'))
+    start_of_data = get_start_of_data(size_of_header)
+    rich_columns_info_dict = {}
+    for column_name, column_header in header['columns'].items():
+        rich_columns_info_dict[column_name] = {
+            field_name: get_array_from_reference(path, start_of_data, field_value)
+            if isinstance(field_value, dict) and ('offset' in field_value or 'utf8' in field_value) else field_value
+            for field_name, field_value in column_header.items()
+        }
+    return rich_columns_info_dict
+
+
+def write_table_profile(path, rich_columns_info_dict, profile_format: str = 'json'):
+    """
+    Function that writes profile of the table (dict of get_as_dict of columns) into a file.
+
+    Parameters
+    ----------
+     path: Path of the profile file
+     rich_columns_info_dict: Dict of column names and dicts describing their generation
+     profile_format: 'json' or 'binary'. Binary profile consists of JSON header followed by aligned arrays of values,
+     probabilities, intervals and lengths; categorical values are stored as typed arrays (strings as UTF-8 with offsets)
+    """
+    if profile_format == 'json':
+        with open(path, 'w') as file:
+            json.dump(rich_columns_info_dict, file)
+    elif profile_format == 'binary':
+        BinaryProfileWriter().write(path, rich_columns_info_dict)
+    else:
+        raise ValueError(f'Unknown profile format {profile_format}, expected one of {PROFILE_FORMATS}.')
+
+
+def read_table_profile(path):
+    """
+    Function that reads profile of the table written by write_table_profile, the format is detected by the file.
+    Arrays of binary profile are memory-mapped, so they are read from disk only when generators use them.
+    """
+    with open(path, 'rb') as file:
+        is_binary = file.read(len(BINARY_PROFILE_MAGIC)) == BINARY_PROFILE_MAGIC
+    if is_binary:
+        return read_binary_profile(path)
+    with open(path, 'r') as file:
+        return json.load(file)
@@ -0,0 +1,104 @@
+from numpy import arange, nonzero, unique
+from pandas import concat
+from fake_data_generator.sources_formats.backends import get_backend_function
+
+SAMPLING_STRATEGIES = ('order_by_random', 'tablesample', 'reservoir')
+
+TABLESAMPLE_CLAUSES_FOR_DIALECTS = {
+    'postgresql': 'TABLESAMPLE SYSTEM ({percent})',
+    'mssql': 'TABLESAMPLE ({percent} PERCENT)',
+    'hive': 'TABLESAMPLE ({percent} PERCENT)',
+    'impala': 'TABLESAMPLE SYSTEM ({percent})',
+    'oracle': 'SAMPLE ({percent})',
+}
+
+OVERSAMPLING_FACTOR = 1.2
+RESERVOIR_CHUNK_SIZE = 100000
+
+
+def get_string_for_column_names(columns_to_include):
+    return ','.join(map(lambda x: '`' + x + '`', columns_to_include)) if columns_to_include is not None else '*'
+
+
+def get_fraction_to_sample(number_of_rows_to_sample, number_of_rows_in_table):
+    if number_of_rows_to_sample is None or number_of_rows_in_table == 0:
+        return 1.0
+    return min(1.0, OVERSAMPLING_FACTOR * number_of_rows_to_sample / number_of_rows_in_table)
+
+
+def get_where_clause(stratify_by):
+    return f'WHERE {stratify_by} = :stratum_value' if stratify_by is not None else ''
+
+
+def get_reservoir_sample(chunks_of_rows, number_of_rows_to_sample, random_generator):
+    """
+    Function that draws a uniform sample without replacement from a stream of DataFrames (algorithm R).
+    Only the reservoir and the current chunk are kept in memory, rows of a chunk are processed with vectorized operations.
+
+    Parameters
+    ----------
+     chunks_of_rows: Iterator of DataFrames with the same columns
+     number_of_rows_to_sample: Size of the reservoir
+     random_generator: numpy Generator
+
+    Returns
+    -------
+     DataFrame with min(number_of_rows_to_sample, total number of rows) rows
+    """
+    reservoir = None
+    number_of_rows_seen = 0
+    for chunk_of_rows in chunks_of_rows:
+        chunk_of_rows = chunk_of_rows.reset_index(drop=True)
+        if reservoir is None:
+            reservoir = chunk_of_rows.iloc[:0]
+        number_of_rows_to_fill = max(0, min(number_of_rows_to_sample - reservoir.shape[0], chunk_of_rows.shape[0]))
+        if number_of_rows_to_fill > 0:
+            reservoir = concat([reservoir, chunk_of_rows.iloc[:number_of_rows_to_fill]], ignore_index=True)
+        rest_of_chunk = chunk_of_rows.iloc[number_of_rows_to_fill:]
+        if rest_of_chunk.shape[0] > 0:
+            row_numbers = arange(number_of_rows_seen + number_of_rows_to_fill, number_of_rows_seen + chunk_of_rows.shape[0])
+            positions_in_reservoir = random_generator.integers(0, row_numbers + 1)
+            indexes_of_replacing_rows = nonzero(positions_in_reservoir < number_of_rows_to_sample)[0]
+            # a later row replacing the same position wins, as in the sequential algorithm
+            replaced_positions, indexes_in_reversed = unique(positions_in_reservoir[indexes_of_replacing_rows][::-1], return_index=True)
+            indexes_of_replacing_rows = indexes_of_replacing_rows[::-1][indexes_in_reversed]
+            indexes_to_take = arange(reservoir.shape[0])
+            indexes_to_take[replaced_positions] = reservoir.shape[0] + arange(indexes_of_replacing_rows.shape[0])
+            reservoir = concat([reservoir, rest_of_chunk.iloc[indexes_of_replacing_rows]], ignore_index=True) \
+                .take(indexes_to_take).reset_index(drop=True)
+        number_of_rows_seen += chunk_of_rows.shape[0]
+    return reservoir
+
+
+def get_sample_of_table(conn,
+                        source_table_name_with_schema: str,
+                        number_of_rows_to_sample: int,
+                        columns_to_include: list = None,
+                        sampling_strategy: str = 'order_by_random',
+                        sample_fraction: float = None,
+                        stratify_by: str = None,
+                        seed: int = None):
+    """
+    Function that fetches a random sample of rows of the table into DataFrame.
+
+    Parameters
+    ----------
+     conn: Spark session, sqlalchemy engine or connection of a registered backend
+     source_table_name_with_schema: Name of the table with schema
+     number_of_rows_to_sample: Number of rows in the sample, the whole table is fetched if it is None
+     columns_to_include: Names of columns to fetch, all columns are fetched if it is None
+     sampling_strategy: 'order_by_random' (ORDER BY RANDOM() LIMIT n, full scan and sort),
+     'tablesample' (TABLESAMPLE clause of the dialect or DataFrame.sample for Spark, reads a fraction of the table)
+     or 'reservoir' (single pass over the table read in chunks, only the sample is kept in memory)
+     sample_fraction: Fraction of the table read by 'tablesample' strategy, it is computed from COUNT(*) if not specified
+     stratify_by: Column (usually partition column) by which the sample is stratified, every its value gets
+     the number of rows proportional to the number of its rows in the table
+     seed: Seed of the random choice of rows made on the client side (and of DataFrame.sample for Spark)
+
+    Returns
+    -------
+     DataFrame with sampled rows
+    """
+    return get_backend_function(conn, 'get_sample_of_table')(conn, source_table_name_with_schema, number_of_rows_to_sample,
+                                                             columns_to_include, sampling_strategy, sample_fraction,
+                                                             stratify_by, seed)
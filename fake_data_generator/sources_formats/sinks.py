@@ -0,0 +1,188 @@
+import re
+import gzip
+from abc import ABC, abstractmethod
+from threading import Lock
+
+
+def get_arrow_data_type(column_data_type):
+    import pyarrow as pa
+    column_data_type = column_data_type or ''
+    if 'int' in column_data_type:
+        return pa.int64()
+    elif 'decimal' in column_data_type:
+        precision, scale = re.search(r'decimal\((\d+),(\d+)\)', column_data_type).groups()
+        return pa.decimal128(int(precision), int(scale))
+    elif column_data_type == 'timestamp':
+        return pa.timestamp('us')
+    elif column_data_type == 'date':
+        return pa.date32()
+    else:
+        return pa.string()
+
+
+class Sink(ABC):
+    """
+    Base class of file sinks. A sink can be passed instead of a connection as a destination of generated data,
+    it writes batches one after another to a single file, so memory usage does not depend on the number of rows.
+    Several writer threads can share a sink, the file is opened by the first of them and closed by the last one.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.columns_info_with_set_generators = None
+        self.lock = Lock()
+        self.number_of_openings = 0
+
+    def set_columns_info_with_set_generators(self, columns_info_with_set_generators):
+        self.columns_info_with_set_generators = columns_info_with_set_generators
+
+    def get_arrow_schema(self):
+        import pyarrow as pa
+        return pa.schema([(column_info.get_column_name(), get_arrow_data_type(column_info.get_data_type()))
+                          for column_info in self.columns_info_with_set_generators])
+
+    def __enter__(self):
+        with self.lock:
+            if self.number_of_openings == 0:
+                self.open()
+            self.number_of_openings += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self.lock:
+            self.number_of_openings -= 1
+            if self.number_of_openings == 0:
+                self.close()
+
+    def insert(self, batch_of_fake_data):
+        with self.lock:
+            self.write(batch_of_fake_data)
+
+    @abstractmethod
+    def open(self):
+        pass
+
+    @abstractmethod
+    def write(self, batch_of_fake_data):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class ParquetSink(Sink):
+    """
+    Sink writing every batch as row groups of a Parquet file.
+
+    Parameters
+    ----------
+     path: Path of the Parquet file
+     compression: Compression codec ('snappy', 'gzip', 'zstd', 'lz4', 'brotli' or 'none')
+     row_group_size: Maximum number of rows in a row group, every batch is a row group if not specified
+    """
+    def __init__(self,
+                 path: str,
+                 compression: str = 'snappy',
+                 row_group_size: int = None):
+        super().__init__(path)
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.arrow_schema = None
+        self.writer = None
+
+    def open(self):
+        import pyarrow.parquet as pq
+        self.arrow_schema = self.get_arrow_schema()
+        self.writer = pq.ParquetWriter(self.path, self.arrow_schema, compression=self.compression)
+
+    def write(self, batch_of_fake_data):
+        self.writer.write_table(batch_of_fake_data.to_arrow(self.arrow_schema), row_group_size=self.row_group_size)
+
+    def close(self):
+        self.writer.close()
+
+
+class ArrowSink(Sink):
+    """
+    Sink writing every batch as record batches of an Arrow IPC file.
+
+    Parameters
+    ----------
+     path: Path of the Arrow IPC file
+     compression: Compression codec of record batches ('lz4', 'zstd' or None)
+    """
+    def __init__(self,
+                 path: str,
+                 compression: str = None):
+        super().__init__(path)
+        self.compression = compression
+        self.arrow_schema = None
+        self.writer = None
+
+    def open(self):
+        import pyarrow as pa
+        self.arrow_schema = self.get_arrow_schema()
+        self.writer = pa.ipc.new_file(self.path, self.arrow_schema, options=pa.ipc.IpcWriteOptions(compression=self.compression))
+
+    def write(self, batch_of_fake_data):
+        self.writer.write_table(batch_of_fake_data.to_arrow(self.arrow_schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class CsvSink(Sink):
+    """
+    Sink appending every batch to a CSV file.
+
+    Parameters
+    ----------
+     path: Path of the CSV file
+     compression: 'gzip' or None
+     separator: Field delimiter
+     header: Whether to write column names in the first line
+    """
+    def __init__(self,
+                 path: str,
+                 compression: str = None,
+                 separator: str = ',',
+                 header: bool = True):
+        super().__init__(path)
+        self.compression = compression
+        self.separator = separator
+        self.header = header
+        self.file = None
+        self.header_is_written = False
+
+    def open(self):
+        if self.compression == 'gzip':
+            self.file = gzip.open(self.path, 'wt', newline='')
+        else:
+            self.file = open(self.path, 'w', newline='')
+        self.header_is_written = False
+
+    def write(self, batch_of_fake_data):
+        batch_of_fake_data.to_pandas().to_csv(self.file, sep=self.separator, header=self.header and not self.header_is_written, index=False)
+        self.header_is_written = True
+
+    def close(self):
+        self.file.close()
+
+
+def execute_query(sink, query):
+    """
+    Function that skips queries (e.g. creating the destination table) sent to a file sink.
+    """
+    pass
+
+
+def get_loader(sink,
+               dest_table_name_with_schema: str,
+               columns_info_with_set_generators: list,
+               loader=None,
+               transaction_size: int = None,
+               max_retries: int = 0,
+               retry_backoff: float = 1.0,
+               number_of_writers: int = 1):
+    sink.set_columns_info_with_set_generators(columns_info_with_set_generators)
+    return sink
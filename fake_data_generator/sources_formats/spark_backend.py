@@ -0,0 +1,230 @@
+import re
+import pandas as pd
+from decimal import Decimal
+from itertools import islice
+from numpy.random import SeedSequence
+from pandas import Series
+from pandas.api.types import is_datetime64_any_dtype, is_float_dtype
+from pyspark.sql.types import \
+    StructType, StructField, StringType, ByteType, ShortType, IntegerType, LongType, DateType, TimestampType, DecimalType
+from fake_data_generator.columns_generator import get_columns_info_with_set_generators, merge_column_profiles
+from fake_data_generator.columns_generator.batch_generation import \
+    get_generator_spec, get_batch_sizes, get_fake_data_for_batch
+from fake_data_generator.sources_formats.helper_functions import get_column_profiles_of_chunks
+from fake_data_generator.sources_formats.sampling import \
+    SAMPLING_STRATEGIES, RESERVOIR_CHUNK_SIZE, get_string_for_column_names, get_fraction_to_sample
+
+INTEGER_TYPES = {
+    'tinyint': ByteType,
+    'smallint': ShortType,
+    'int': IntegerType,
+    'bigint': LongType,
+}
+
+
+def get_query_result_in_df(spark, query):
+    return spark.sql(query).toPandas()
+
+
+def execute_query(spark, query):
+    spark.sql(query)
+
+
+def get_inferred_data_type(column_data_type):
+    if column_data_type == 'string':
+        return StringType()
+    elif column_data_type in INTEGER_TYPES:
+        return INTEGER_TYPES[column_data_type]()
+    elif 'int' in column_data_type:
+        return IntegerType()
+    elif 'decimal' in column_data_type:
+        precision, scale = re.search(r'decimal\((\d+),(\d+)\)', column_data_type).groups()
+        return DecimalType(int(precision), int(scale))
+    elif column_data_type == 'timestamp':
+        return TimestampType()
+    elif column_data_type == 'date':
+        return DateType()
+    else:
+        return StringType()
+
+
+def get_column_values_with_python_objects(column_values: Series,
+                                          column_data_type: str):
+    if 'decimal' in column_data_type and is_float_dtype(column_values):
+        return Series([Decimal(str(value)) if value == value else None for value in column_values.values],
+                      name=column_values.name, index=column_values.index, dtype=object)
+    elif column_data_type == 'date' and is_datetime64_any_dtype(column_values):
+        return Series(column_values.dt.date, name=column_values.name, index=column_values.index, dtype=object)
+    elif column_data_type == 'timestamp' and is_datetime64_any_dtype(column_values):
+        return Series(list(column_values.dt.to_pydatetime()), name=column_values.name, index=column_values.index, dtype=object)
+    else:
+        return column_values
+
+
+def get_fake_data_with_python_objects(fake_data_in_df,
+                                      columns_info_with_set_generators):
+    fake_data_in_df = fake_data_in_df.copy(deep=False)
+    for column_info in columns_info_with_set_generators:
+        column_name = column_info.get_column_name()
+        if column_name in fake_data_in_df.columns:
+            fake_data_in_df[column_name] = get_column_values_with_python_objects(fake_data_in_df[column_name],
+                                                                                 column_info.get_data_type() or '')
+    return fake_data_in_df
+
+
+def get_spark_schema(columns_info_with_set_generators):
+    return StructType([StructField(column_info.get_column_name(), get_inferred_data_type(column_info.get_data_type()), True)
+                       for column_info in columns_info_with_set_generators])
+
+
+class SparkLoader:
+    """
+    Loader appending batches of fake data to a Hive table through a Spark session.
+    Every batch is written by its own job, on_commit (see set_on_commit) is called with the row offset of the batch after the job.
+    """
+    def __init__(self,
+                 conn,
+                 dest_table_name_with_schema: str,
+                 columns_info_with_set_generators: list):
+        self.conn = conn
+        self.dest_table_name_with_schema = dest_table_name_with_schema
+        self.columns_info_with_set_generators = columns_info_with_set_generators
+        self.schema = get_spark_schema(columns_info_with_set_generators)
+        self.on_commit = None
+
+    def set_on_commit(self, on_commit):
+        self.on_commit = on_commit
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def insert(self, batch_of_fake_data):
+        fake_data_in_df_with_python_objects = get_fake_data_with_python_objects(batch_of_fake_data.to_pandas(),
+                                                                                self.columns_info_with_set_generators)
+        fake_data_in_df_spark = self.conn.createDataFrame(fake_data_in_df_with_python_objects, schema=self.schema)
+        fake_data_in_df_spark.write.format('hive').mode('append').saveAsTable(self.dest_table_name_with_schema)
+        if self.on_commit is not None:
+            self.on_commit([batch_of_fake_data.row_offset])
+
+
+def get_loader(conn,
+               dest_table_name_with_schema: str,
+               columns_info_with_set_generators: list,
+               loader=None,
+               transaction_size: int = None,
+               max_retries: int = 0,
+               retry_backoff: float = 1.0,
+               number_of_writers: int = 1):
+    return SparkLoader(conn, dest_table_name_with_schema, columns_info_with_set_generators)
+
+
+def get_sample_of_table(spark,
+                        source_table_name_with_schema,
+                        number_of_rows_to_sample,
+                        columns_to_include=None,
+                        sampling_strategy='order_by_random',
+                        sample_fraction=None,
+                        stratify_by=None,
+                        seed=None):
+    if sampling_strategy == 'order_by_random' and stratify_by is None:
+        limit_clause = f"LIMIT {number_of_rows_to_sample}" if number_of_rows_to_sample is not None else ''
+        select_query = f"SELECT {get_string_for_column_names(columns_to_include)} " \
+                       f"FROM {source_table_name_with_schema} " \
+                       f"ORDER BY RANDOM() {limit_clause};"
+        return spark.sql(select_query).toPandas()
+    if sampling_strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(f'Unknown sampling strategy {sampling_strategy}, expected one of {SAMPLING_STRATEGIES}.')
+
+    table_df = spark.table(source_table_name_with_schema)
+    if columns_to_include is not None:
+        table_df = table_df.select(*columns_to_include) if stratify_by is None or stratify_by in columns_to_include \
+            else table_df.select(*columns_to_include, stratify_by)
+    if number_of_rows_to_sample is None:
+        sampled_df = table_df
+    else:
+        if sample_fraction is None:
+            sample_fraction = get_fraction_to_sample(number_of_rows_to_sample, table_df.count())
+        if stratify_by is not None:
+            stratum_values = [row[0] for row in table_df.select(stratify_by).distinct().collect()]
+            sampled_df = table_df.sampleBy(stratify_by, fractions={value: sample_fraction for value in stratum_values}, seed=seed)
+        else:
+            sampled_df = table_df.sample(withReplacement=False, fraction=sample_fraction, seed=seed)
+        sampled_df = sampled_df.limit(number_of_rows_to_sample)
+    sample_in_df = sampled_df.toPandas()
+    if columns_to_include is not None:
+        sample_in_df = sample_in_df[columns_to_include]
+    return sample_in_df
+
+
+def get_function_profiling_partition(column_name_to_data_type, chunk_size):
+    def profile_partition(rows):
+        column_names = list(column_name_to_data_type.keys())
+        rows = iter(rows)
+
+        def get_chunks_of_rows():
+            chunk_of_rows = list(islice(rows, chunk_size))
+            while chunk_of_rows:
+                yield pd.DataFrame.from_records(chunk_of_rows, columns=column_names)
+                chunk_of_rows = list(islice(rows, chunk_size))
+
+        yield get_column_profiles_of_chunks(get_chunks_of_rows(), column_name_to_data_type)
+    return profile_partition
+
+
+def get_column_profiles_of_table(spark,
+                                 source_table_name_with_schema: str,
+                                 column_name_to_data_type: dict,
+                                 columns_to_include: list = None):
+    """
+    Function that profiles partitions of the table in parallel on Spark executors and merges their profiles.
+    """
+    return spark.table(source_table_name_with_schema) \
+        .select(*column_name_to_data_type.keys()).rdd \
+        .mapPartitions(get_function_profiling_partition(column_name_to_data_type, RESERVOIR_CHUNK_SIZE)) \
+        .treeReduce(merge_column_profiles)
+
+
+def get_function_generating_fake_data_on_executors(broadcast_generator_spec, batch_size, seed):
+    def generate_fake_data(iterator_of_ids_in_df):
+        columns_info_with_set_generators = get_columns_info_with_set_generators(broadcast_generator_spec.value)
+        for ids_in_df in iterator_of_ids_in_df:
+            if ids_in_df.shape[0] == 0:
+                continue
+            first_id = int(ids_in_df['id'].iloc[0])
+            for offset, output_size in zip(range(0, ids_in_df.shape[0], batch_size), get_batch_sizes(ids_in_df.shape[0], batch_size)):
+                batch_of_fake_data = get_fake_data_for_batch(output_size, columns_info_with_set_generators, seed, first_id + offset)
+                yield get_fake_data_with_python_objects(batch_of_fake_data.to_pandas(), columns_info_with_set_generators)
+    return generate_fake_data
+
+
+def execute_insertion_on_executors(spark,
+                                   dest_table_name_with_schema,
+                                   number_of_rows_to_insert,
+                                   columns_info_with_set_generators,
+                                   batch_size,
+                                   seed: int = None,
+                                   number_of_partitions: int = None):
+    """
+    Function that generates fake data on Spark executors and appends it to the table in one job.
+
+    Parameters
+    ----------
+     spark: Spark session
+     dest_table_name_with_schema: Name of the table with schema in which rows will be inserted
+     number_of_rows_to_insert: Number of rows to generate
+     columns_info_with_set_generators: List of Column objects, the generator spec built from them is broadcast to executors
+     batch_size: Maximum number of rows generated at once on an executor
+     seed: Seed from which random state of every batch is derived, a batch is identified by the number of its first row
+     number_of_partitions: Number of partitions (and written files) of generated data, default parallelism of Spark if not specified
+    """
+    if seed is None:
+        seed = SeedSequence().entropy
+    broadcast_generator_spec = spark.sparkContext.broadcast(get_generator_spec(columns_info_with_set_generators))
+    ids = spark.range(0, number_of_rows_to_insert, 1, number_of_partitions)
+    fake_data = ids.mapInPandas(get_function_generating_fake_data_on_executors(broadcast_generator_spec, batch_size, seed),
+                                schema=get_spark_schema(columns_info_with_set_generators))
+    fake_data.write.format('hive').mode('append').saveAsTable(dest_table_name_with_schema)
+    broadcast_generator_spec.unpersist()
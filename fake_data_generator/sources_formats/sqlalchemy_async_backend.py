@@ -0,0 +1,65 @@
+import sqlalchemy
+
+
+async def execute_query_async(async_engine, query):
+    async with async_engine.begin() as c:
+        await c.execute(sqlalchemy.text(query))
+
+
+class AsyncLoader:
+    """
+    Loader inserting batches of fake data into a table through a SQLAlchemy AsyncEngine.
+    Rows are inserted with executemany of a single-row INSERT and committed every transaction_size rows
+    (after every batch if transaction_size is not specified). Rows of a batch can be prepared by get_rows beforehand
+    outside of the event loop (e.g. in an executor), so the event loop only awaits the insertion.
+    """
+    def __init__(self,
+                 async_engine,
+                 dest_table_name_with_schema: str,
+                 columns_info_with_set_generators: list = None,
+                 transaction_size: int = None):
+        self.async_engine = async_engine
+        self.column_name_to_data_type = {column_info.get_column_name(): column_info.get_data_type()
+                                         for column_info in columns_info_with_set_generators or []}
+        self.schema_name, self.table_name = dest_table_name_with_schema.split('.')
+        self.transaction_size = transaction_size
+        self.connection = None
+        self.transaction = None
+        self.number_of_rows_in_transaction = 0
+
+    async def __aenter__(self):
+        self.connection = await self.async_engine.connect()
+        self.transaction = await self.connection.begin()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                await self.transaction.commit()
+            else:
+                await self.transaction.rollback()
+        finally:
+            await self.connection.close()
+
+    def get_rows(self, batch_of_fake_data):
+        column_names = batch_of_fake_data.get_column_names()
+        return [dict(zip(column_names, row)) for row in batch_of_fake_data.get_rows(self.column_name_to_data_type)]
+
+    async def insert(self, batch_of_fake_data, rows=None):
+        rows = self.get_rows(batch_of_fake_data) if rows is None else rows
+        if rows:
+            table = sqlalchemy.table(self.table_name, *map(sqlalchemy.column, batch_of_fake_data.get_column_names()),
+                                     schema=self.schema_name)
+            await self.connection.execute(table.insert(), rows)
+        self.number_of_rows_in_transaction += batch_of_fake_data.number_of_rows
+        if self.transaction_size is None or self.number_of_rows_in_transaction >= self.transaction_size:
+            await self.transaction.commit()
+            self.transaction = await self.connection.begin()
+            self.number_of_rows_in_transaction = 0
+
+
+def get_async_loader(async_engine,
+                     dest_table_name_with_schema: str,
+                     columns_info_with_set_generators: list,
+                     transaction_size: int = None):
+    return AsyncLoader(async_engine, dest_table_name_with_schema, columns_info_with_set_generators, transaction_size=transaction_size)
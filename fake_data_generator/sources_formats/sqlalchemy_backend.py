@@ -0,0 +1,168 @@
+import pandas as pd
+import sqlalchemy
+from loguru import logger
+from numpy.random import default_rng
+from pandas import concat
+from fake_data_generator.sources_formats.loaders import get_loader
+from fake_data_generator.sources_formats.helper_functions import get_column_profiles_of_chunks
+from fake_data_generator.sources_formats.sampling import \
+    SAMPLING_STRATEGIES, TABLESAMPLE_CLAUSES_FOR_DIALECTS, RESERVOIR_CHUNK_SIZE, \
+    get_string_for_column_names, get_fraction_to_sample, get_where_clause, get_reservoir_sample
+
+
+def get_query_result_in_df(conn, query):
+    with conn.begin() as c:
+        return pd.read_sql_query(sqlalchemy.text(query), c)
+
+
+def execute_query(conn, query):
+    with conn.begin() as c:
+        c.execute(sqlalchemy.text(query))
+
+
+def get_number_of_rows_in_table(conn, source_table_name_with_schema, stratify_by=None, stratum_value=None):
+    count_query = f"SELECT COUNT(*) FROM {source_table_name_with_schema} {get_where_clause(stratify_by)}"
+    with conn.connect() as c:
+        return c.execute(sqlalchemy.text(count_query), {'stratum_value': stratum_value} if stratify_by is not None else {}).scalar()
+
+
+def get_sample_of_table_with_sqlalchemy(conn,
+                                        source_table_name_with_schema,
+                                        number_of_rows_to_sample,
+                                        columns_to_include=None,
+                                        sampling_strategy='order_by_random',
+                                        sample_fraction=None,
+                                        stratify_by=None,
+                                        stratum_value=None,
+                                        random_generator=None):
+    string_for_column_names = get_string_for_column_names(columns_to_include)
+    where_clause = get_where_clause(stratify_by)
+    params = {'stratum_value': stratum_value} if stratify_by is not None else {}
+    limit_clause = f"LIMIT {number_of_rows_to_sample}" if number_of_rows_to_sample is not None else ''
+
+    if sampling_strategy == 'tablesample' and conn.dialect.name not in TABLESAMPLE_CLAUSES_FOR_DIALECTS:
+        logger.info(f'Dialect {conn.dialect.name} does not support TABLESAMPLE, reservoir sampling is used instead.')
+        sampling_strategy = 'reservoir'
+
+    if sampling_strategy == 'order_by_random':
+        select_query = f"SELECT {string_for_column_names} FROM {source_table_name_with_schema} {where_clause} " \
+                       f"ORDER BY RANDOM() {limit_clause}"
+        with conn.connect() as c:
+            return pd.read_sql_query(sqlalchemy.text(select_query), c, params=params)
+    elif sampling_strategy == 'tablesample':
+        if sample_fraction is None:
+            sample_fraction = get_fraction_to_sample(number_of_rows_to_sample,
+                                                     get_number_of_rows_in_table(conn, source_table_name_with_schema, stratify_by, stratum_value))
+        tablesample_clause = TABLESAMPLE_CLAUSES_FOR_DIALECTS[conn.dialect.name].format(percent=round(100 * sample_fraction, 6))
+        select_query = f"SELECT {string_for_column_names} FROM {source_table_name_with_schema} {tablesample_clause} {where_clause}"
+        with conn.connect() as c:
+            sample_in_df = pd.read_sql_query(sqlalchemy.text(select_query), c, params=params)
+        if number_of_rows_to_sample is not None and sample_in_df.shape[0] > number_of_rows_to_sample:
+            sample_in_df = sample_in_df.sample(n=number_of_rows_to_sample, random_state=random_generator).reset_index(drop=True)
+        return sample_in_df
+    elif sampling_strategy == 'reservoir':
+        select_query = f"SELECT {string_for_column_names} FROM {source_table_name_with_schema} {where_clause}"
+        with conn.connect() as c:
+            c = c.execution_options(stream_results=True)
+            chunks_of_rows = pd.read_sql_query(sqlalchemy.text(select_query), c, params=params, chunksize=RESERVOIR_CHUNK_SIZE)
+            if number_of_rows_to_sample is None:
+                return concat(chunks_of_rows, ignore_index=True)
+            return get_reservoir_sample(chunks_of_rows, number_of_rows_to_sample, random_generator)
+    raise ValueError(f'Unknown sampling strategy {sampling_strategy}, expected one of {SAMPLING_STRATEGIES}.')
+
+
+def get_sample_of_table(conn,
+                        source_table_name_with_schema: str,
+                        number_of_rows_to_sample: int,
+                        columns_to_include: list = None,
+                        sampling_strategy: str = 'order_by_random',
+                        sample_fraction: float = None,
+                        stratify_by: str = None,
+                        seed: int = None):
+    """
+    Function that fetches a random sample of rows of the table through the engine (see sampling.get_sample_of_table),
+    a stratified sample is made of samples of every value of stratify_by column fetched by separate queries.
+    """
+    random_generator = default_rng(seed)
+    if stratify_by is None:
+        return get_sample_of_table_with_sqlalchemy(conn, source_table_name_with_schema, number_of_rows_to_sample,
+                                                   columns_to_include, sampling_strategy, sample_fraction,
+                                                   random_generator=random_generator)
+
+    strata_query = f"SELECT {stratify_by}, COUNT(*) FROM {source_table_name_with_schema} GROUP BY {stratify_by}"
+    with conn.connect() as c:
+        stratum_value_to_number_of_rows = dict(c.execute(sqlalchemy.text(strata_query)).fetchall())
+    number_of_rows_in_table = sum(stratum_value_to_number_of_rows.values())
+    samples_of_strata = []
+    for stratum_value, number_of_rows_in_stratum in stratum_value_to_number_of_rows.items():
+        number_of_rows_to_sample_from_stratum = None if number_of_rows_to_sample is None \
+            else round(number_of_rows_to_sample * number_of_rows_in_stratum / number_of_rows_in_table)
+        if number_of_rows_to_sample_from_stratum == 0:
+            continue
+        if stratum_value is None:
+            logger.info(f'Rows with NULL in {stratify_by} column are not sampled.')
+            continue
+        fraction_of_stratum = sample_fraction if sample_fraction is not None \
+            else get_fraction_to_sample(number_of_rows_to_sample_from_stratum, number_of_rows_in_stratum)
+        samples_of_strata.append(get_sample_of_table_with_sqlalchemy(conn, source_table_name_with_schema,
+                                                                     number_of_rows_to_sample_from_stratum,
+                                                                     columns_to_include, sampling_strategy,
+                                                                     fraction_of_stratum, stratify_by, stratum_value,
+                                                                     random_generator))
+    return concat(samples_of_strata, ignore_index=True)
+
+
+def get_chunks_of_table(conn,
+                        source_table_name_with_schema: str,
+                        columns_to_include: list = None,
+                        chunk_size: int = RESERVOIR_CHUNK_SIZE):
+    """
+    Generator yielding all rows of the table (sqlalchemy engine) as DataFrames of at most chunk_size rows,
+    the result of the query is streamed and is not kept in memory.
+    """
+    select_query = f"SELECT {get_string_for_column_names(columns_to_include)} FROM {source_table_name_with_schema}"
+    with conn.connect() as c:
+        c = c.execution_options(stream_results=True)
+        for chunk_of_rows in pd.read_sql_query(sqlalchemy.text(select_query), c, chunksize=chunk_size):
+            yield chunk_of_rows
+
+
+def get_column_profiles_of_table(conn,
+                                 source_table_name_with_schema: str,
+                                 column_name_to_data_type: dict,
+                                 columns_to_include: list = None):
+    return get_column_profiles_of_chunks(get_chunks_of_table(conn, source_table_name_with_schema, columns_to_include),
+                                         column_name_to_data_type)
+
+
+def create_staging_table(conn, dest_table_name_with_schema, staging_table_name_with_schema):
+    execute_query(conn, f'CREATE TABLE {staging_table_name_with_schema} AS SELECT * FROM {dest_table_name_with_schema} WHERE 1<>1')
+
+
+def merge_staging_tables(conn, dest_table_name_with_schema, staging_table_names_with_schema, number_of_rows_expected):
+    """
+    Function that inserts rows of all staging tables into the table with one INSERT ... SELECT in one transaction.
+    The transaction is rolled back if the driver reports the number of inserted rows different from number_of_rows_expected.
+
+    Returns
+    -------
+     Number of inserted rows (None if the driver does not report it)
+    """
+    select_query = ' UNION ALL '.join(f'SELECT * FROM {staging_table_name_with_schema}'
+                                      for staging_table_name_with_schema in staging_table_names_with_schema)
+    with conn.begin() as c:
+        number_of_rows_inserted = c.execute(sqlalchemy.text(f'INSERT INTO {dest_table_name_with_schema} {select_query}')).rowcount
+        if number_of_rows_inserted is None or number_of_rows_inserted < 0:
+            return None
+        if number_of_rows_inserted != number_of_rows_expected:
+            raise ValueError(f'{number_of_rows_inserted} rows were merged from staging tables into {dest_table_name_with_schema}, '
+                             f'but {number_of_rows_expected} rows were written into them, the merge is rolled back.')
+    return number_of_rows_inserted
+
+
+def drop_staging_tables(conn, staging_table_names_with_schema):
+    for staging_table_name_with_schema in staging_table_names_with_schema:
+        try:
+            execute_query(conn, f'DROP TABLE IF EXISTS {staging_table_name_with_schema}')
+        except sqlalchemy.exc.SQLAlchemyError as error:
+            logger.warning(f'Staging table {staging_table_name_with_schema} was not dropped: {error}')
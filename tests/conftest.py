@@ -0,0 +1,25 @@
+import pytest
+import threading
+import sqlalchemy
+from tests.helpers import StandInConnection
+
+
+@pytest.fixture
+def stand_in_state():
+    return {'lock': threading.Lock(), 'inserts': [], 'number_of_inserts': 0, 'number_of_commits': 0, 'failing_inserts': set()}
+
+
+@pytest.fixture
+def stand_in_engine(tmp_path, stand_in_state):
+    path = str(tmp_path / 'stand_in.sqlite')
+    engine = sqlalchemy.create_engine('sqlite://', creator=lambda: StandInConnection(path, stand_in_state),
+                                      poolclass=sqlalchemy.pool.QueuePool, pool_size=8)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "test.sqlite"}', poolclass=sqlalchemy.pool.QueuePool, pool_size=8)
+    yield engine
+    engine.dispose()
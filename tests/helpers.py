@@ -0,0 +1,82 @@
+import sqlite3
+import sqlalchemy
+from fake_data_generator.columns_generator import get_columns_info_with_set_generators
+from fake_data_generator.columns_generator.batch_generation import get_fake_data_for_batch
+from fake_data_generator.sources_formats.helper_functions import get_create_query, create_table_if_not_exists
+
+TABLE_PROFILE = {
+    'id': {'data_type': 'bigint', 'type': 'UNIQUE', 'method': 'sequence', 'number_of_keys': None,
+           'min_value': 0, 'stride': 1, 'permutation_seed': 0},
+    'amount': {'data_type': 'bigint', 'type': 'CONTINUES', 'intervals': [[0, 1000]], 'probabilities': [1.0], 'date_flag': False},
+    'category': {'data_type': 'string', 'type': 'CATEGORICAL', 'values': ['a', 'b', None], 'probabilities': [0.5, 0.3, 0.2]},
+}
+
+
+class StandInCursor:
+    """
+    Cursor of the stand-in DBAPI connection recording executed statements and raising injected errors.
+    """
+    def __init__(self, cursor, stand_in_connection):
+        self.cursor = cursor
+        self.stand_in_connection = stand_in_connection
+
+    def execute(self, statement, parameters=()):
+        self.stand_in_connection.record(statement, 1)
+        return self.cursor.execute(statement, parameters)
+
+    def executemany(self, statement, parameters):
+        parameters = list(parameters)
+        self.stand_in_connection.record(statement, len(parameters))
+        return self.cursor.executemany(statement, parameters)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+class StandInConnection:
+    """
+    DBAPI connection wrapping sqlite3 connection: it records INSERT statements and commits in shared state
+    and raises sqlite3.OperationalError on INSERT statements whose numbers are in state['failing_inserts'].
+    """
+    def __init__(self, path, state):
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=60)
+        self.state = state
+
+    def record(self, statement, number_of_rows):
+        if not statement.lstrip().upper().startswith('INSERT'):
+            return
+        with self.state['lock']:
+            self.state['number_of_inserts'] += 1
+            if self.state['number_of_inserts'] in self.state['failing_inserts']:
+                raise sqlite3.OperationalError('database is locked')
+            self.state['inserts'].append((statement, number_of_rows))
+
+    def cursor(self):
+        return StandInCursor(self.connection.cursor(), self)
+
+    def commit(self):
+        with self.state['lock']:
+            self.state['number_of_commits'] += 1
+        return self.connection.commit()
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def get_columns_info(table_profile=None):
+    return get_columns_info_with_set_generators(table_profile or TABLE_PROFILE)
+
+
+def create_table(conn, table_name_with_schema, table_profile=None):
+    create_table_if_not_exists(conn, dest_table_name_with_schema=table_name_with_schema,
+                               create_query=get_create_query(table_name_with_schema, table_profile or TABLE_PROFILE))
+
+
+def get_batches(columns_info, number_of_rows, batch_size, seed=0):
+    return [get_fake_data_for_batch(min(batch_size, number_of_rows - row_offset), columns_info, seed, row_offset)
+            for row_offset in range(0, number_of_rows, batch_size)]
+
+
+def read_table(conn, table_name_with_schema, order_by='id'):
+    with conn.connect() as connection:
+        return connection.execute(sqlalchemy.text(f'SELECT * FROM {table_name_with_schema} ORDER BY {order_by}')).fetchall()
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from fake_data_generator.columns_generator.alias_table import get_alias_table, get_codes_from_alias_table
+
+
+def get_probabilities_of_alias_table(thresholds, aliases):
+    probabilities = thresholds.copy()
+    np.add.at(probabilities, aliases, 1 - thresholds)
+    return probabilities / len(thresholds)
+
+
+@pytest.mark.parametrize('probabilities', [
+    [0.5, 0.375, 0.125, 0],
+    [1.0],
+    [0.25, 0.25, 0.25, 0.25],
+    np.random.default_rng(0).dirichlet(np.full(1000, 0.1)),
+    np.random.default_rng(1).pareto(1.1, 5000),
+])
+def test_alias_table_keeps_probabilities(probabilities):
+    thresholds, aliases = get_alias_table(probabilities)
+    assert ((thresholds >= 0) & (thresholds <= 1)).all()
+    assert get_probabilities_of_alias_table(thresholds, aliases) == \
+        pytest.approx(np.asarray(probabilities) / np.sum(probabilities), abs=1e-12)
+
+
+def test_empirical_distribution_of_codes_matches_probabilities():
+    probabilities = np.array([0.4, 0.25, 0.2, 0.1, 0.04, 0.01, 0.0])
+    thresholds, aliases = get_alias_table(probabilities)
+    codes = get_codes_from_alias_table(thresholds, aliases, 10 ** 6, np.random.default_rng(2))
+    frequencies = np.bincount(codes, minlength=len(probabilities)) / len(codes)
+    assert frequencies[-1] == 0
+    assert frequencies == pytest.approx(probabilities, abs=5 * np.sqrt(probabilities.max() / len(codes)))
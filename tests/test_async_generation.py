@@ -0,0 +1,96 @@
+import json
+import asyncio
+import pytest
+import sqlalchemy
+from fake_data_generator import ForeignKeyColumn, InsertionCallback, generate_table_from_profile, generate_tables_from_profiles
+from fake_data_generator.sources_formats.async_generation import \
+    generate_table_from_profile_async, generate_tables_from_profiles_async
+from tests.helpers import TABLE_PROFILE, read_table
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('greenlet')
+
+CHILD_TABLE_PROFILE = {
+    'customer_id': {'data_type': 'bigint', 'type': 'CONTINUES', 'intervals': [[0, 100]], 'probabilities': [1.0], 'date_flag': False},
+    'quantity': {'data_type': 'bigint', 'type': 'CONTINUES', 'intervals': [[1, 10]], 'probabilities': [1.0], 'date_flag': False},
+}
+
+
+class RecordingCallback(InsertionCallback):
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, metrics):
+        self.events.append(('start', metrics.table_name))
+
+    def on_finish(self, metrics):
+        self.events.append(('finish', metrics.table_name))
+
+
+@pytest.fixture
+def profile_paths(tmp_path):
+    profile_paths = {}
+    for name, table_profile in (('customers', TABLE_PROFILE), ('orders', CHILD_TABLE_PROFILE)):
+        profile_paths[name] = str(tmp_path / f'{name}.json')
+        with open(profile_paths[name], 'w') as file:
+            json.dump(table_profile, file)
+    return profile_paths
+
+
+def get_tables(profile_paths, referenced_table_name='main.customers'):
+    return [{'source_table_profile_path': profile_paths['orders'], 'dest_table_name_with_schema': 'main.orders',
+             'number_of_rows_to_insert': 3000,
+             'columns_info': [ForeignKeyColumn('customer_id', referenced_table_name_with_schema=referenced_table_name,
+                                               referenced_column_name='id')]},
+            {'source_table_profile_path': profile_paths['customers'], 'dest_table_name_with_schema': 'main.customers',
+             'number_of_rows_to_insert': 500}]
+
+
+async def run_with_async_engine(path, get_coroutine):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    async_engine = create_async_engine(f'sqlite+aiosqlite:///{path}')
+    try:
+        return await get_coroutine(async_engine)
+    finally:
+        await async_engine.dispose()
+
+
+def test_table_from_profile_async_equals_sync(tmp_path, engine, profile_paths):
+    number_of_rows_inserted = asyncio.run(run_with_async_engine(
+        tmp_path / 'async.sqlite',
+        lambda async_engine: generate_table_from_profile_async(async_engine, profile_paths['customers'], 'main.customers', 2500,
+                                                               batch_size=300, seed=4, callbacks=[])))
+    generate_table_from_profile(engine, profile_paths['customers'], 'main.customers', 2500, batch_size=300, seed=4, callbacks=[])
+    engine_of_async_database = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "async.sqlite"}')
+    assert number_of_rows_inserted == 2500
+    assert read_table(engine_of_async_database, 'main.customers') == read_table(engine, 'main.customers')
+
+
+def test_child_table_waits_for_referenced_table(tmp_path, engine, profile_paths):
+    recording_callback = RecordingCallback()
+    table_name_to_number_of_rows = asyncio.run(run_with_async_engine(
+        tmp_path / 'async.sqlite',
+        lambda async_engine: generate_tables_from_profiles_async(async_engine, get_tables(profile_paths), str(tmp_path / 'async_keys'),
+                                                                 seed=5, max_concurrency=2, batch_size=200,
+                                                                 callbacks=[recording_callback])))
+    assert table_name_to_number_of_rows == {'main.orders': 3000, 'main.customers': 500}
+    assert recording_callback.events.index(('finish', 'main.customers')) < recording_callback.events.index(('start', 'main.orders'))
+    engine_of_async_database = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "async.sqlite"}')
+    with engine_of_async_database.connect() as connection:
+        assert connection.execute(sqlalchemy.text('SELECT COUNT(*) FROM orders WHERE customer_id NOT IN '
+                                                  '(SELECT id FROM customers)')).scalar() == 0
+    generate_tables_from_profiles(engine, get_tables(profile_paths), str(tmp_path / 'keys'), seed=5, batch_size=200, callbacks=[])
+    for table_name, order_by in (('main.customers', 'id'), ('main.orders', 'rowid')):
+        assert read_table(engine_of_async_database, table_name, order_by) == read_table(engine, table_name, order_by)
+
+
+def test_error_of_referenced_table_cancels_child_table(tmp_path, profile_paths):
+    tables = get_tables(profile_paths)
+    tables[1]['source_table_profile_path'] = str(tmp_path / 'missing.json')
+    recording_callback = RecordingCallback()
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(run_with_async_engine(
+            tmp_path / 'async.sqlite',
+            lambda async_engine: generate_tables_from_profiles_async(async_engine, tables, str(tmp_path / 'async_keys'),
+                                                                     seed=5, callbacks=[recording_callback])))
+    assert recording_callback.events == []
@@ -0,0 +1,77 @@
+import os
+import numpy as np
+import pytest
+import sqlalchemy
+from fake_data_generator import generate_table_from_profile
+from fake_data_generator.columns_generator import get_columns_info_with_set_generators
+from fake_data_generator.columns_generator.batch_generation import get_generator_spec
+from fake_data_generator.sources_formats.checkpoint import get_hash_of_generator_spec
+from fake_data_generator.sources_formats.profile_files import write_table_profile, read_table_profile
+from tests.helpers import TABLE_PROFILE, read_table
+
+
+@pytest.fixture
+def binary_profile_path(tmp_path):
+    write_table_profile(str(tmp_path / 'profile.bin'), TABLE_PROFILE, profile_format='binary')
+    return str(tmp_path / 'profile.bin')
+
+
+def get_hash_of_profile(profile_path):
+    return get_hash_of_generator_spec(get_generator_spec(get_columns_info_with_set_generators(read_table_profile(profile_path))))
+
+
+def test_hash_of_binary_profile_does_not_change_between_reads(binary_profile_path):
+    assert get_hash_of_profile(binary_profile_path) == get_hash_of_profile(binary_profile_path)
+
+
+def test_hash_depends_on_every_value_of_arrays():
+    probabilities = np.full(10000, 1 / 10000)
+    changed_probabilities = probabilities.copy()
+    changed_probabilities[5000] *= 2
+    assert get_hash_of_generator_spec({'c': {'probabilities': probabilities}}) != \
+        get_hash_of_generator_spec({'c': {'probabilities': changed_probabilities}})
+    assert get_hash_of_generator_spec({'c': {'probabilities': probabilities}}) == \
+        get_hash_of_generator_spec({'c': {'probabilities': probabilities.copy()}})
+
+
+def test_interrupted_insertion_is_resumed(stand_in_engine, stand_in_state, binary_profile_path, tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    insertion_params = {'number_of_rows_to_insert': 1000, 'batch_size': 100, 'seed': 5, 'loader': 'executemany', 'callbacks': []}
+    stand_in_state['failing_inserts'] = {4}
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        generate_table_from_profile(stand_in_engine, binary_profile_path, 'main.resumed', checkpoint_path=checkpoint_path,
+                                    **insertion_params)
+    assert len(read_table(stand_in_engine, 'main.resumed')) == 300
+    assert os.path.exists(checkpoint_path)
+    stand_in_state['failing_inserts'] = set()
+    stand_in_state['inserts'] = []
+    assert generate_table_from_profile(stand_in_engine, binary_profile_path, 'main.resumed', checkpoint_path=checkpoint_path,
+                                       **insertion_params) == 700
+    assert len(stand_in_state['inserts']) == 7
+    assert not os.path.exists(checkpoint_path)
+    generate_table_from_profile(stand_in_engine, binary_profile_path, 'main.uninterrupted', **insertion_params)
+    assert read_table(stand_in_engine, 'main.resumed') == read_table(stand_in_engine, 'main.uninterrupted')
+
+
+def test_insertion_is_not_resumed_with_another_profile(stand_in_engine, stand_in_state, binary_profile_path, tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    stand_in_state['failing_inserts'] = {2}
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        generate_table_from_profile(stand_in_engine, binary_profile_path, 'main.t', 500, batch_size=100,
+                                    loader='executemany', checkpoint_path=checkpoint_path, callbacks=[])
+    write_table_profile(binary_profile_path, {**TABLE_PROFILE, 'category': {**TABLE_PROFILE['category'], 'probabilities': [0.4, 0.4, 0.2]}},
+                        profile_format='binary')
+    with pytest.raises(ValueError, match='generator_spec_hash'):
+        generate_table_from_profile(stand_in_engine, binary_profile_path, 'main.t', 500, batch_size=100,
+                                    loader='executemany', checkpoint_path=checkpoint_path, callbacks=[])
+
+
+def test_insertion_is_not_resumed_with_another_batch_size(stand_in_engine, stand_in_state, binary_profile_path, tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    stand_in_state['failing_inserts'] = {2}
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        generate_table_from_profile(stand_in_engine, binary_profile_path, 'main.t', 500, batch_size=100,
+                                    loader='executemany', checkpoint_path=checkpoint_path, callbacks=[])
+    with pytest.raises(ValueError, match='batch_size'):
+        generate_table_from_profile(stand_in_engine, binary_profile_path, 'main.t', 500, batch_size=50,
+                                    loader='executemany', checkpoint_path=checkpoint_path, callbacks=[])
@@ -0,0 +1,79 @@
+import json
+import pytest
+import sqlalchemy
+from fake_data_generator import InsertionCallback, generate_tables_from_manifest
+from tests.helpers import TABLE_PROFILE, read_table
+
+CHILD_TABLE_PROFILE = {
+    'customer_id': {'data_type': 'bigint', 'type': 'CONTINUES', 'intervals': [[0, 100]], 'probabilities': [1.0], 'date_flag': False},
+}
+
+
+class RecordingCallback(InsertionCallback):
+    instances = []
+
+    def __init__(self):
+        self.table_names = []
+        RecordingCallback.instances.append(self)
+
+    def on_start(self, metrics):
+        self.table_names.append(metrics.table_name)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    for name, table_profile in (('customers', TABLE_PROFILE), ('orders', CHILD_TABLE_PROFILE)):
+        with open(tmp_path / f'{name}.json', 'w') as file:
+            json.dump(table_profile, file)
+    return {'seed': 3,
+            'key_index_directory': str(tmp_path / 'keys'),
+            'defaults': {'batch_size': 100},
+            'tables': [{'source_table_profile_path': str(tmp_path / 'orders.json'), 'dest_table_name_with_schema': 'main.orders',
+                        'number_of_rows_to_insert': 1000, 'number_of_writers': 2,
+                        'columns_info': {'customer_id': {'type': 'FOREIGN_KEY', 'referenced_table_name_with_schema': 'main.customers',
+                                                         'referenced_column_name': 'id'}}},
+                       {'source_table_profile_path': str(tmp_path / 'customers.json'), 'dest_table_name_with_schema': 'main.customers',
+                        'number_of_rows_to_insert': 300},
+                       {'source_table_profile_path': str(tmp_path / 'customers.json'), 'dest_table_name_with_schema': 'main.others',
+                        'number_of_rows_to_insert': 200}]}
+
+
+def test_tables_of_manifest_are_generated(engine, manifest, tmp_path):
+    shared_callback = RecordingCallback()
+    RecordingCallback.instances = []
+    table_name_to_summary = generate_tables_from_manifest(engine, manifest, max_workers=3, max_memory=2 ** 24,
+                                                          summary_path=str(tmp_path / 'summary.json'),
+                                                          callbacks=[shared_callback, RecordingCallback])
+    assert {table_name: summary['number_of_rows_inserted'] for table_name, summary in table_name_to_summary.items()} == \
+        {'main.orders': 1000, 'main.customers': 300, 'main.others': 200}
+    with open(tmp_path / 'summary.json') as file:
+        assert set(json.load(file)['tables']) == set(table_name_to_summary)
+    with engine.connect() as connection:
+        assert connection.execute(sqlalchemy.text('SELECT COUNT(*) FROM orders WHERE customer_id NOT IN '
+                                                  '(SELECT id FROM customers)')).scalar() == 0
+    assert len(read_table(engine, 'main.orders', 'rowid')) == 1000
+    assert sorted(shared_callback.table_names) == ['main.customers', 'main.orders', 'main.others']
+    assert sorted(callback.table_names for callback in RecordingCallback.instances) == \
+        [['main.customers'], ['main.orders'], ['main.others']]
+
+
+def test_manifest_without_tables_is_rejected(engine):
+    with pytest.raises(ValueError, match='no tables'):
+        generate_tables_from_manifest(engine, {'tables': []})
+
+
+def test_table_without_source_is_rejected(engine):
+    with pytest.raises(ValueError, match='Neither source_table_profile_path nor source_table_name_with_schema'):
+        generate_tables_from_manifest(engine, {'tables': [{'dest_table_name_with_schema': 'main.t', 'number_of_rows_to_insert': 1}]})
+
+
+def test_error_of_referenced_table_is_raised(engine, manifest, tmp_path):
+    manifest['tables'][1]['source_table_profile_path'] = str(tmp_path / 'missing.json')
+    with pytest.raises(FileNotFoundError):
+        generate_tables_from_manifest(engine, manifest, max_workers=1, callbacks=[])
+
+
+def test_error_before_insertion_is_raised(engine, manifest):
+    manifest['tables'][2]['number_of_processes'] = 'two'
+    with pytest.raises(TypeError):
+        generate_tables_from_manifest(engine, manifest, callbacks=[])
@@ -0,0 +1,46 @@
+import json
+import pytest
+import sqlalchemy
+from fake_data_generator import ForeignKeyColumn, generate_tables_from_profiles
+from tests.helpers import TABLE_PROFILE, read_table
+
+CHILD_TABLE_PROFILE = {
+    'customer_id': {'data_type': 'bigint', 'type': 'CONTINUES', 'intervals': [[0, 100]], 'probabilities': [1.0], 'date_flag': False},
+}
+
+
+@pytest.fixture
+def tables(tmp_path):
+    for name, table_profile in (('customers', TABLE_PROFILE), ('orders', CHILD_TABLE_PROFILE)):
+        with open(tmp_path / f'{name}.json', 'w') as file:
+            json.dump(table_profile, file)
+    return [{'source_table_profile_path': str(tmp_path / 'orders.json'), 'dest_table_name_with_schema': 'main.orders',
+             'number_of_rows_to_insert': 1500,
+             'columns_info': [ForeignKeyColumn('customer_id', referenced_table_name_with_schema='main.customers',
+                                               referenced_column_name='id')]},
+            {'source_table_profile_path': str(tmp_path / 'customers.json'), 'dest_table_name_with_schema': 'main.customers',
+             'number_of_rows_to_insert': 200}]
+
+
+def test_numbers_of_inserted_rows_are_returned(engine, tables, tmp_path):
+    table_name_to_number_of_rows = generate_tables_from_profiles(engine, tables, str(tmp_path / 'keys'), seed=1,
+                                                                 batch_size=100, callbacks=[])
+    assert table_name_to_number_of_rows == {'main.customers': 200, 'main.orders': 1500}
+    assert len(read_table(engine, 'main.orders', 'rowid')) == 1500
+    with engine.connect() as connection:
+        assert connection.execute(sqlalchemy.text('SELECT COUNT(*) FROM orders WHERE customer_id NOT IN '
+                                                  '(SELECT id FROM customers)')).scalar() == 0
+
+
+def test_tables_of_caller_are_not_changed(engine, tables, tmp_path):
+    foreign_key_column = tables[0]['columns_info'][0]
+    columns_info = tables[0]['columns_info']
+    generate_tables_from_profiles(engine, tables, str(tmp_path / 'keys'), seed=1, batch_size=100, callbacks=[])
+    assert tables[0]['columns_info'] is columns_info and columns_info[0] is foreign_key_column
+    assert foreign_key_column.get_key_index_path() is None
+    assert 'key_index_paths' not in tables[1]
+
+
+def test_reference_to_table_without_key_index_is_rejected(engine, tables, tmp_path):
+    with pytest.raises(ValueError, match='key index path of the column is not specified'):
+        generate_tables_from_profiles(engine, tables[:1], str(tmp_path / 'keys'), callbacks=[])
@@ -0,0 +1,92 @@
+import re
+import numpy as np
+import pytest
+from collections import Counter
+from pandas import Series
+from fake_data_generator.columns_generator.compiled_regex import get_alphabets_for_common_regex
+from fake_data_generator.columns_generator.info_for_columns import get_info_for_string_column
+from fake_data_generator.columns_generator.generators import get_generator_for_continuous_column, get_generator_for_string_column
+
+INTERVALS = [[0, 10], [100, 110], [1000, 1001]]
+PROBABILITIES = [0.6, 0.4, 0.0]
+
+
+def get_values(generator, output_size):
+    next(generator)
+    return generator.send(output_size).get_decoded_values()
+
+
+def get_continuous_values(output_data_type, params=None, intervals=INTERVALS, probabilities=PROBABILITIES, output_size=100000):
+    return get_values(get_generator_for_continuous_column('c', intervals, probabilities, output_data_type, params,
+                                                          np.random.default_rng(0)), output_size)
+
+
+def test_continuous_values_stay_within_intervals_with_their_probabilities():
+    values = get_continuous_values('decimal', {'precision': 6})
+    in_first_interval, in_second_interval = (values >= 0) & (values <= 10), (values >= 100) & (values <= 110)
+    assert (in_first_interval | in_second_interval).all()
+    assert in_first_interval.mean() == pytest.approx(0.6, abs=0.01)
+    assert np.histogram(values[in_first_interval], bins=5, range=(0, 10))[0] / in_first_interval.sum() == \
+        pytest.approx([0.2] * 5, abs=0.01)
+
+
+def test_continuous_values_are_converted_to_output_data_types():
+    int_values = get_continuous_values('int')
+    assert int_values.dtype == np.int64 and set(np.unique(int_values)) <= set(range(0, 11)) | set(range(100, 111))
+    decimal_values = get_continuous_values('decimal', {'precision': 2})
+    assert (np.round(decimal_values, 2) == decimal_values).all()
+    date_values = get_continuous_values('date', intervals=[[738000, 738010]], probabilities=[1.0])
+    assert date_values.dtype == np.dtype('datetime64[D]')
+    assert date_values.min() >= np.datetime64('2021-07-29') and date_values.max() <= np.datetime64('2021-08-08')
+    datetime_values = get_continuous_values('datetime', intervals=[[1.6e9, 1.6e9 + 86400]], probabilities=[1.0])
+    assert datetime_values.dtype == np.dtype('datetime64[s]')
+    assert datetime_values.min() >= np.datetime64('2020-09-13T12:26:40') and datetime_values.max() <= np.datetime64('2020-09-14T12:26:40')
+    midnights = get_continuous_values('datetime', {'date_flag': True}, intervals=[[1.6e9, 1.6e9 + 10 * 86400]], probabilities=[1.0])
+    assert (midnights == midnights.astype('datetime64[D]')).all()
+
+
+def test_degenerate_interval_gives_its_value():
+    assert set(get_continuous_values('int', intervals=[[5, 5]], probabilities=[1.0], output_size=100).tolist()) == {5}
+
+
+def get_string_values(common_regex, lengths=None, length_probabilities=None, output_size=20000):
+    return get_values(get_generator_for_string_column('c', common_regex, lengths, length_probabilities, np.random.default_rng(1)),
+                      output_size).tolist()
+
+
+def test_examples_of_compiled_regex_docstring():
+    alphabets = get_alphabets_for_common_regex('[0-1][-]')
+    assert [alphabet.tolist() for alphabet in alphabets] == [[48, 49], [45]]
+    assert get_alphabets_for_common_regex('[0-9]+') is None
+    assert [len(alphabet) for alphabet in get_alphabets_for_common_regex('[0-9A-Za-zА-Яа-я][\\-\\]_]x\\.')] == [10 + 52 + 64, 3, 1, 1]
+
+
+@pytest.mark.parametrize('common_regex', ['[^a]', '[a-', 'a|b', '(ab)', '\\d', '[z-a]', '[]'])
+def test_regexes_which_are_not_sequences_of_classes_are_not_compiled(common_regex):
+    assert get_alphabets_for_common_regex(common_regex) is None
+
+
+@pytest.mark.parametrize('strings', [['123', '32314', '131'], ['abc', 'a0c', 'xyz'], ['1234-2314', '1241-1234', '2514-2141']])
+def test_strings_generated_from_profile_match_regex_and_lengths(strings):
+    common_regex, lengths, length_probabilities = get_info_for_string_column(Series(strings))
+    fake_strings = get_string_values(common_regex, lengths, length_probabilities)
+    character_classes = re.findall(r'\[(?:\\.|[^\]])*\]', common_regex)
+    assert ''.join(character_classes) == common_regex
+    assert all(re.fullmatch(''.join(character_classes[:len(fake_string)]), fake_string) for fake_string in fake_strings)
+    length_frequencies = Counter(map(len, fake_strings))
+    assert sorted(length_frequencies) == lengths
+    assert [length_frequencies[length] / len(fake_strings) for length in lengths] == pytest.approx(length_probabilities, abs=0.02)
+
+
+def test_characters_of_every_position_are_uniform():
+    fake_strings = get_string_values('[0-9][a-c][-]')
+    assert all(re.fullmatch('[0-9][a-c]-', fake_string) for fake_string in fake_strings)
+    assert [count / len(fake_strings) for _, count in sorted(Counter(fake_string[1] for fake_string in fake_strings).items())] == \
+        pytest.approx([1 / 3] * 3, abs=0.02)
+
+
+def test_general_regex_falls_back_to_xeger():
+    pytest.importorskip('rstr')
+    fake_strings = get_string_values('(ab|cd)[0-9]{2,3}', output_size=200)
+    assert all(re.fullmatch('(ab|cd)[0-9]{2,3}', fake_string) for fake_string in fake_strings)
+    assert len(set(fake_strings)) > 100
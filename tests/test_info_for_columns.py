@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from pandas import Series
+from fake_data_generator.columns_generator import info_for_columns
+from fake_data_generator.columns_generator.info_for_columns import \
+    get_info_for_string_column, get_character_classes_info_for_strings, get_character_classes_info_for_strings_chunk, \
+    get_row_ranges_of_chunks_of_strings, get_info_for_continuous_column, DENSITY_ESTIMATIONS
+
+
+def test_chunks_of_strings_are_bounded_by_number_of_characters(monkeypatch):
+    monkeypatch.setattr(info_for_columns, 'STRINGS_CHUNK_NUMBER_OF_CHARACTERS', 100)
+    sorted_string_lengths = np.array([0, 1, 1, 3, 5, 5, 5, 10, 10, 60, 250])
+    row_ranges = list(get_row_ranges_of_chunks_of_strings(sorted_string_lengths))
+    assert row_ranges[0][0] == 0 and row_ranges[-1][1] == len(sorted_string_lengths)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(row_ranges, row_ranges[1:]))
+    assert all((end - start) * max(1, sorted_string_lengths[end - 1]) <= 100 for start, end in row_ranges if end - start > 1)
+    assert row_ranges[-1] == (10, 11)
+
+
+def test_chunked_character_classes_equal_classes_of_all_strings(monkeypatch):
+    random_generator = np.random.default_rng(0)
+    strings = Series([''.join(random_generator.choice(list('aZ9я-_'), size=length))
+                      for length in random_generator.integers(0, 12, 3000)] + ['x' * 500])
+    class_bitmasks, other_characters = get_character_classes_info_for_strings_chunk(strings.values)
+    monkeypatch.setattr(info_for_columns, 'STRINGS_CHUNK_NUMBER_OF_CHARACTERS', 1000)
+    chunked_class_bitmasks, chunked_other_characters = get_character_classes_info_for_strings(strings.values, strings.str.len().values)
+    assert chunked_class_bitmasks.dtype == np.uint8
+    assert chunked_class_bitmasks.tolist() == class_bitmasks.tolist()
+    assert chunked_other_characters == other_characters
+    common_regex = get_info_for_string_column(strings)[0]
+    assert common_regex.startswith('[0-9A-Za-zа-я\\-_]' * 11 + '[a-z]')
+    assert common_regex.count('[') == 500
+
+
+def test_histogram_example_of_docstring():
+    assert get_info_for_continuous_column(Series([1, 2, 2, 3]), 'int', density_estimation='histogram', number_of_bins=2) == \
+        ([(1.0, 2.0), (2.0, 3.0)], [0.25, 0.75])
+
+
+@pytest.mark.parametrize('density_estimation', DENSITY_ESTIMATIONS)
+@pytest.mark.parametrize('number_of_bins', [10, 50])
+def test_intervals_cover_values_with_probabilities(density_estimation, number_of_bins):
+    float_values = Series(np.random.default_rng(0).lognormal(0, 1, 20000))
+    intervals, probabilities = get_info_for_continuous_column(float_values, 'float', density_estimation=density_estimation,
+                                                              number_of_bins=number_of_bins)
+    assert len(intervals) == len(probabilities) <= number_of_bins + number_of_bins // 2
+    assert (intervals[0][0], intervals[-1][1]) == (float_values.min(), float_values.max())
+    assert all(end == next_start for (_, end), (next_start, _) in zip(intervals, intervals[1:]))
+    bin_edges = np.array([start for start, _ in intervals] + [intervals[-1][1]])
+    counts, _ = np.histogram(float_values, bins=bin_edges)
+    if density_estimation == 'kde':
+        # as integrals of scipy's gaussian_kde over bins, mass of kernels beyond the range of values is not counted
+        assert 0.9 < sum(probabilities) <= 1
+        assert np.array(probabilities) / sum(probabilities) == pytest.approx(counts / len(float_values), abs=0.05)
+    else:
+        assert probabilities == pytest.approx(counts / len(float_values))
+
+
+def test_quantile_bins_are_narrow_in_tails():
+    float_values = Series(np.random.default_rng(1).lognormal(0, 1, 20000))
+    intervals, probabilities = get_info_for_continuous_column(float_values, 'float', density_estimation='quantile', number_of_bins=40)
+    widths = [end - start for start, end in intervals]
+    assert widths[-1] < (float_values.max() - float_values.min()) / 2
+    assert min(probabilities) < 1 / 40 / 10
+    assert max(probabilities) == pytest.approx(1 / 20, rel=0.1)
+    histogram_intervals, _ = get_info_for_continuous_column(float_values, 'float', density_estimation='histogram', number_of_bins=40)
+    assert histogram_intervals[-1][1] - histogram_intervals[-1][0] > widths[-1] / 10
+
+
+def test_dates_and_constant_values_are_profiled():
+    dates = Series(['2024-01-01', '2024-01-11', None, '2024-01-21'])
+    intervals, probabilities = get_info_for_continuous_column(dates, 'date', density_estimation='histogram', number_of_bins=2)
+    assert intervals[0][0] == 738886.0 and intervals[-1][1] == 738906.0
+    assert get_info_for_continuous_column(Series([7, 7, 7]), 'int') == ([(7.0, 7.0)], [1.0])
+    with pytest.raises(ValueError, match='Unknown density estimation'):
+        get_info_for_continuous_column(Series([1, 2]), 'int', density_estimation='spline')
+
+
+def test_examples_of_string_column_docstring():
+    assert get_info_for_string_column(Series(['123', '32314', '131'])) == \
+        ('[0-9][0-9][0-9][0-9][0-9]', [3, 5], [0.6666666666666666, 0.3333333333333333])
+    assert get_info_for_string_column(Series(['abc', 'a0c', 'xyz']))[0] == '[a-z][0-9a-z][a-z]'
+    assert get_info_for_string_column(Series(['1234-2314', '1241-1234', '2514-2141']))[0] == \
+        '[0-9][0-9][0-9][0-9][\\-][0-9][0-9][0-9][0-9]'
@@ -0,0 +1,124 @@
+import pytest
+from types import SimpleNamespace
+from fake_data_generator.sources_formats.loaders import \
+    get_loader, Loader, SQLiteLoader, MultiRowValuesLoader, PostgresCopyLoader
+from tests.helpers import get_columns_info, create_table, get_batches, read_table
+
+
+def get_conn_of_dialect(dialect_name):
+    return SimpleNamespace(dialect=SimpleNamespace(name=dialect_name))
+
+
+@pytest.mark.parametrize('dialect_name, loader_class', [
+    ('sqlite', SQLiteLoader),
+    ('postgresql', PostgresCopyLoader),
+    ('mysql', MultiRowValuesLoader),
+    ('mssql', MultiRowValuesLoader),
+    ('oracle', MultiRowValuesLoader),
+])
+def test_loader_is_selected_by_dialect(dialect_name, loader_class):
+    loader = get_loader(get_conn_of_dialect(dialect_name), 'main.t', get_columns_info())
+    assert type(loader) is loader_class
+
+
+def test_loader_is_selected_by_name_or_class():
+    conn = get_conn_of_dialect('postgresql')
+    assert type(get_loader(conn, 'main.t', get_columns_info(), loader='executemany')) is Loader
+    assert type(get_loader(conn, 'main.t', get_columns_info(), loader='multi_values')) is MultiRowValuesLoader
+    assert type(get_loader(conn, 'main.t', get_columns_info(), loader=SQLiteLoader)) is SQLiteLoader
+
+
+def test_sqlite_loader_commits_large_transactions_only_for_one_writer():
+    conn = get_conn_of_dialect('sqlite')
+    assert get_loader(conn, 'main.t', get_columns_info()).transaction_size == SQLiteLoader.default_transaction_size
+    assert get_loader(conn, 'main.t', get_columns_info(), transaction_size=500).transaction_size == 500
+    several_writers_loader = get_loader(conn, 'main.t', get_columns_info(), number_of_writers=2)
+    assert type(several_writers_loader) is Loader and several_writers_loader.transaction_size is None
+
+
+def test_multi_row_values_loader_splits_rows_into_statements(stand_in_engine, stand_in_state):
+    columns_info = get_columns_info()
+    create_table(stand_in_engine, 'main.t')
+    batches = get_batches(columns_info, number_of_rows=50, batch_size=25)
+    with MultiRowValuesLoader(stand_in_engine, 'main.t', columns_info, rows_per_statement=10) as loader:
+        for batch in batches:
+            loader.insert(batch)
+    assert [number_of_rows for _, number_of_rows in stand_in_state['inserts']] == [1] * 6
+    assert [statement.count('(?, ?, ?)') for statement, _ in stand_in_state['inserts']] == [10, 10, 5, 10, 10, 5]
+    assert len(read_table(stand_in_engine, 'main.t')) == 50
+
+
+def test_multi_row_values_loader_limits_parameters_per_statement(stand_in_engine, stand_in_state):
+    class SmallMultiRowValuesLoader(MultiRowValuesLoader):
+        max_parameters_per_statement = 12
+
+    columns_info = get_columns_info()
+    create_table(stand_in_engine, 'main.t')
+    with SmallMultiRowValuesLoader(stand_in_engine, 'main.t', columns_info, rows_per_statement=1000) as loader:
+        loader.insert(get_batches(columns_info, number_of_rows=10, batch_size=10)[0])
+    assert [statement.count('(?, ?, ?)') for statement, _ in stand_in_state['inserts']] == [4, 4, 2]
+
+
+def test_executemany_loader_commits_every_transaction_size_rows(stand_in_engine, stand_in_state):
+    columns_info = get_columns_info()
+    create_table(stand_in_engine, 'main.t')
+    stand_in_state['number_of_commits'] = 0
+    committed_batches = []
+    with Loader(stand_in_engine, 'main.t', columns_info, transaction_size=250) as loader:
+        loader.set_on_commit(lambda row_offsets: committed_batches.append(list(row_offsets)))
+        for batch in get_batches(columns_info, number_of_rows=1000, batch_size=100):
+            loader.insert(batch)
+    assert committed_batches == [[0, 100, 200], [300, 400, 500], [600, 700, 800], [900]]
+    assert stand_in_state['number_of_commits'] == 4
+    assert [number_of_rows for _, number_of_rows in stand_in_state['inserts']] == [100] * 10
+    assert loader.number_of_rows_committed == 1000
+    assert [row[0] for row in read_table(stand_in_engine, 'main.t')] == list(range(1000))
+
+
+def test_sqlite_loader_commits_every_default_transaction_size_rows(stand_in_engine, stand_in_state, monkeypatch):
+    monkeypatch.setattr(SQLiteLoader, 'default_transaction_size', 400)
+    columns_info = get_columns_info()
+    create_table(stand_in_engine, 'main.t')
+    stand_in_state['number_of_commits'] = 0
+    with get_loader(stand_in_engine, 'main.t', columns_info) as loader:
+        for batch in get_batches(columns_info, number_of_rows=1000, batch_size=100):
+            loader.insert(batch)
+    assert stand_in_state['number_of_commits'] == 3
+    assert len(read_table(stand_in_engine, 'main.t')) == 1000
+
+
+@pytest.mark.parametrize('max_retries, max_number_of_kept_batches', [(0, 0), (2, 3)])
+def test_batches_are_kept_until_commit_only_for_retries(stand_in_engine, max_retries, max_number_of_kept_batches):
+    columns_info = get_columns_info()
+    create_table(stand_in_engine, 'main.t')
+    numbers_of_kept_batches = []
+    with SQLiteLoader(stand_in_engine, 'main.t', columns_info, transaction_size=400, max_retries=max_retries) as loader:
+        for batch in get_batches(columns_info, number_of_rows=2000, batch_size=100):
+            loader.insert(batch)
+            numbers_of_kept_batches.append(len(loader.batches_in_transaction))
+    assert max(numbers_of_kept_batches) == max_number_of_kept_batches
+    assert len(read_table(stand_in_engine, 'main.t')) == 2000
+
+
+def test_failed_load_is_rolled_back(stand_in_engine):
+    columns_info = get_columns_info()
+    create_table(stand_in_engine, 'main.t')
+    with pytest.raises(RuntimeError):
+        with Loader(stand_in_engine, 'main.t', columns_info, transaction_size=500) as loader:
+            for batch in get_batches(columns_info, number_of_rows=700, batch_size=100):
+                loader.insert(batch)
+            raise RuntimeError('failure after the first transaction')
+    assert len(read_table(stand_in_engine, 'main.t')) == 500
+
+
+def test_copy_loader_writes_nulls_as_unquoted_empty_fields():
+    copies = []
+    cursor = SimpleNamespace(copy_expert=lambda query, buffer: copies.append((query, buffer.read())), close=lambda: None)
+    loader = PostgresCopyLoader(None, 'main.t')
+    loader.connection = SimpleNamespace(dialect=SimpleNamespace(identifier_preparer=SimpleNamespace(quote=lambda name: f'"{name}"')),
+                                        connection=SimpleNamespace(dbapi_connection=SimpleNamespace(cursor=lambda: cursor)))
+    rows = [['\\N', 1], ['', None], [None, 2], ['say "a,b"', 3]]
+    loader.insert_rows(SimpleNamespace(get_column_names=lambda: ['s', 'i'], get_rows=lambda column_name_to_data_type: rows))
+    query, csv_text = copies[0]
+    assert query == 'COPY "main"."t" ("s", "i") FROM STDIN WITH (FORMAT csv)'
+    assert csv_text == '"\\N","1"\n"",\n,"2"\n"say ""a,b""","3"\n'
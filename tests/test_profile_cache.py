@@ -0,0 +1,74 @@
+import os
+import time
+import pytest
+from fake_data_generator.columns_generator import CategoricalColumn
+from fake_data_generator.sources_formats.profile_cache import ProfileCache, get_fingerprint_of_column_info
+
+SAMPLING_PARAMS = {'number_of_rows': 1000, 'sampling_strategy': 'order_by_random'}
+COLUMN_NAME_TO_DATA_TYPE = {'id': 'bigint', 'category': 'string'}
+COLUMN_PROFILES = {'id': {'data_type': 'bigint', 'type': 'CONTINUES', 'intervals': [[0, 10]], 'probabilities': [1.0]},
+                   'category': {'data_type': 'string', 'type': 'CATEGORICAL', 'values': ['a'], 'probabilities': [1.0]}}
+
+
+def put_column_profiles(profile_cache, column_name_to_fingerprint=None):
+    profile_cache.put_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, column_name_to_fingerprint or {},
+                                      COLUMN_PROFILES, list(COLUMN_PROFILES))
+
+
+def test_cached_profiles_are_returned(tmp_path):
+    profile_cache = ProfileCache(str(tmp_path))
+    assert profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {}) == {}
+    put_column_profiles(profile_cache)
+    assert profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {}) == COLUMN_PROFILES
+    assert profile_cache.get_column_profiles('db.t', {**SAMPLING_PARAMS, 'number_of_rows': 10}, COLUMN_NAME_TO_DATA_TYPE, {}) == {}
+    assert profile_cache.get_column_profiles('db.other', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {}) == {}
+
+
+def test_profiles_expire_after_ttl(tmp_path, monkeypatch):
+    profile_cache = ProfileCache(str(tmp_path), ttl=60)
+    put_column_profiles(profile_cache)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 30)
+    assert set(profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {})) == {'id', 'category'}
+    monkeypatch.setattr(time, 'time', lambda: now + 90)
+    assert profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {}) == {}
+
+
+def test_only_changed_columns_are_invalidated(tmp_path):
+    profile_cache = ProfileCache(str(tmp_path))
+    put_column_profiles(profile_cache)
+    assert set(profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, {'id': 'int', 'category': 'string'}, {})) == {'category'}
+    assert set(profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, {'id': 'bigint'}, {})) == {'id'}
+    fingerprint = get_fingerprint_of_column_info(CategoricalColumn('category', values=['b'], probabilities=[1.0]))
+    assert set(profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {'category': fingerprint})) == {'id'}
+
+
+def test_profiling_time_is_kept_for_reused_columns(tmp_path, monkeypatch):
+    profile_cache = ProfileCache(str(tmp_path), ttl=60)
+    put_column_profiles(profile_cache)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 40)
+    profile_cache.put_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {}, COLUMN_PROFILES, ['category'])
+    monkeypatch.setattr(time, 'time', lambda: now + 80)
+    assert set(profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {})) == {'category'}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    profile_cache = ProfileCache(str(tmp_path))
+    for table_name in ('db.first', 'db.second'):
+        profile_cache.put_column_profiles(table_name, SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {}, COLUMN_PROFILES, list(COLUMN_PROFILES))
+    first_entry_path, second_entry_path = (profile_cache.get_entry_path(table_name, SAMPLING_PARAMS) for table_name in ('db.first', 'db.second'))
+    os.utime(first_entry_path, (time.time() - 100, time.time() - 100))
+    profile_cache.max_size = os.path.getsize(second_entry_path)
+    profile_cache.evict()
+    assert not os.path.exists(first_entry_path)
+    assert os.path.exists(second_entry_path)
+
+
+def test_broken_entry_is_ignored(tmp_path):
+    profile_cache = ProfileCache(str(tmp_path))
+    with open(profile_cache.get_entry_path('db.t', SAMPLING_PARAMS), 'w') as file:
+        file.write('{')
+    assert profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {}) == {}
+    put_column_profiles(profile_cache)
+    assert profile_cache.get_column_profiles('db.t', SAMPLING_PARAMS, COLUMN_NAME_TO_DATA_TYPE, {}) == COLUMN_PROFILES
@@ -0,0 +1,62 @@
+import json
+import numpy as np
+import pytest
+from fake_data_generator import generate_table_from_profile
+from fake_data_generator.sources_formats.profile_files import LazyStrings, write_table_profile, read_table_profile
+from tests.helpers import read_table
+
+TABLE_PROFILE = {
+    'id': {'data_type': 'bigint', 'type': 'UNIQUE', 'method': 'sequence', 'number_of_keys': None,
+           'min_value': 0, 'stride': 1, 'permutation_seed': 0},
+    'city': {'data_type': 'string', 'type': 'CATEGORICAL', 'values': ['Москва', '', 'New York', None],
+             'probabilities': [0.4, 0.1, 0.3, 0.2]},
+    'quantity': {'data_type': 'int', 'type': 'CATEGORICAL', 'values': [1, 5, None], 'probabilities': [0.5, 0.3, 0.2]},
+    'day': {'data_type': 'date', 'type': 'CATEGORICAL', 'values': ['2023-01-01', '2024-02-29'], 'probabilities': [0.5, 0.5]},
+    'amount': {'data_type': 'decimal(10,2)', 'type': 'CONTINUES', 'intervals': [[0, 10], [10, 1000]],
+               'probabilities': [0.9, 0.1], 'date_flag': False},
+    'code': {'data_type': 'string', 'type': 'STRING', 'common_regex': '[A-Z][0-9][0-9]', 'string_copy_of': None,
+             'lengths': [2, 3], 'length_probabilities': [0.5, 0.5]},
+}
+
+
+@pytest.fixture
+def profile_paths(tmp_path):
+    profile_paths = {}
+    for profile_format in ('json', 'binary'):
+        profile_paths[profile_format] = str(tmp_path / f'profile.{profile_format}')
+        write_table_profile(profile_paths[profile_format], TABLE_PROFILE, profile_format=profile_format)
+    return profile_paths
+
+
+def test_binary_profile_is_read_as_written(profile_paths):
+    profile = read_table_profile(profile_paths['binary'])
+    assert profile['id'] == TABLE_PROFILE['id']
+    assert isinstance(profile['city']['values'], LazyStrings)
+    assert np.asarray(profile['city']['values']).tolist()[:3] == ['Москва', '', 'New York']
+    assert np.asarray(profile['city']['null_flags']).tolist() == [False, False, False, True]
+    assert np.asarray(profile['quantity']['values'])[:2].tolist() == [1, 5]
+    assert np.asarray(profile['day']['values']).astype(str).tolist() == ['2023-01-01', '2024-02-29']
+    assert isinstance(profile['amount']['intervals'], np.memmap)
+    assert profile['amount']['intervals'].tolist() == [[0, 10], [10, 1000]]
+    assert profile['amount']['probabilities'].tolist() == [0.9, 0.1]
+    assert profile['code']['lengths'].dtype == np.int64 and profile['code']['lengths'].tolist() == [2, 3]
+    assert profile['code']['common_regex'] == '[A-Z][0-9][0-9]'
+
+
+def test_json_profile_is_read_as_written(profile_paths):
+    with open(profile_paths['json']) as file:
+        assert json.load(file) == read_table_profile(profile_paths['json']) == TABLE_PROFILE
+
+
+def test_unknown_profile_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unknown profile format'):
+        write_table_profile(str(tmp_path / 'profile.xml'), TABLE_PROFILE, profile_format='xml')
+
+
+def test_tables_generated_from_binary_and_json_profiles_are_equal(engine, profile_paths):
+    for profile_format, profile_path in profile_paths.items():
+        generate_table_from_profile(engine, profile_path, f'main.from_{profile_format}', 2000, batch_size=300, seed=8, callbacks=[])
+    rows = read_table(engine, 'main.from_binary')
+    assert len(rows) == 2000
+    assert rows == read_table(engine, 'main.from_json')
+    assert {row[1] for row in rows} == {'Москва', '', 'New York', None}
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fake_data_generator.sources_formats import sampling
+from fake_data_generator.sources_formats.sampling import get_sample_of_table, get_reservoir_sample, SAMPLING_STRATEGIES
+
+NUMBER_OF_ROWS = 5000
+
+
+@pytest.fixture
+def source_engine(engine):
+    pd.DataFrame({'id': np.arange(NUMBER_OF_ROWS),
+                  'region': np.repeat(['north', 'south', 'west', None], [3000, 1500, 450, 50])}) \
+        .to_sql('source', engine, index=False)
+    return engine
+
+
+@pytest.mark.parametrize('sampling_strategy', SAMPLING_STRATEGIES)
+def test_sample_has_requested_number_of_distinct_rows(source_engine, sampling_strategy):
+    sample_in_df = get_sample_of_table(source_engine, 'main.source', 700, sampling_strategy=sampling_strategy, seed=1)
+    assert list(sample_in_df.columns) == ['id', 'region']
+    assert sample_in_df.shape[0] == 700
+    assert sample_in_df['id'].is_unique and sample_in_df['id'].between(0, NUMBER_OF_ROWS - 1).all()
+
+
+@pytest.mark.parametrize('sampling_strategy', SAMPLING_STRATEGIES)
+def test_whole_table_is_fetched_without_number_of_rows(source_engine, sampling_strategy):
+    sample_in_df = get_sample_of_table(source_engine, 'main.source', None, columns_to_include=['id'], sampling_strategy=sampling_strategy)
+    assert sorted(sample_in_df['id'].tolist()) == list(range(NUMBER_OF_ROWS))
+
+
+def test_tablesample_reads_fraction_of_table(source_engine, monkeypatch):
+    # SQLite has no TABLESAMPLE, an empty clause reads the whole table and the sample is cut on the client
+    monkeypatch.setitem(sampling.TABLESAMPLE_CLAUSES_FOR_DIALECTS, 'sqlite', '')
+    sample_in_df = get_sample_of_table(source_engine, 'main.source', 300, sampling_strategy='tablesample', seed=2)
+    assert sample_in_df.shape[0] == 300 and sample_in_df['id'].is_unique
+    assert sample_in_df['id'].tolist() != sorted(sample_in_df['id'].tolist())
+
+
+@pytest.mark.parametrize('sampling_strategy', SAMPLING_STRATEGIES)
+def test_stratified_sample_keeps_shares_of_strata(source_engine, sampling_strategy):
+    sample_in_df = get_sample_of_table(source_engine, 'main.source', 1000, sampling_strategy=sampling_strategy,
+                                       stratify_by='region', seed=3)
+    assert sample_in_df['region'].value_counts().to_dict() == {'north': 600, 'south': 300, 'west': 90}
+    assert sample_in_df['id'].is_unique
+
+
+def test_sample_is_reproducible_with_seed(source_engine):
+    first_sample, second_sample = (get_sample_of_table(source_engine, 'main.source', 100, sampling_strategy='reservoir', seed=4)
+                                   for _ in range(2))
+    assert first_sample['id'].tolist() == second_sample['id'].tolist()
+
+
+def test_reservoir_sample_is_uniform():
+    number_of_rows, number_of_rows_to_sample, number_of_samples = 200, 40, 500
+    chunks_of_rows = [pd.DataFrame({'id': np.arange(start, min(start + 30, number_of_rows))}) for start in range(0, number_of_rows, 30)]
+    random_generator = np.random.default_rng(5)
+    inclusion_counts = np.zeros(number_of_rows)
+    for _ in range(number_of_samples):
+        reservoir = get_reservoir_sample(iter(chunks_of_rows), number_of_rows_to_sample, random_generator)
+        assert reservoir['id'].is_unique and reservoir.shape[0] == number_of_rows_to_sample
+        inclusion_counts[reservoir['id'].to_numpy()] += 1
+    expected_count = number_of_samples * number_of_rows_to_sample / number_of_rows
+    assert np.abs(inclusion_counts - expected_count).max() < 5 * np.sqrt(expected_count)
+    assert inclusion_counts[:100].mean() == pytest.approx(inclusion_counts[100:].mean(), rel=0.05)
+
+
+def test_unknown_sampling_strategy_is_rejected(source_engine):
+    with pytest.raises(ValueError, match='Unknown sampling strategy'):
+        get_sample_of_table(source_engine, 'main.source', 10, sampling_strategy='systematic')
@@ -0,0 +1,90 @@
+import csv
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from fake_data_generator import generate_table_from_profile, ParquetSink, ArrowSink, CsvSink
+from fake_data_generator.columns_generator import get_columns_info_with_set_generators
+from fake_data_generator.columns_generator.batch_generation import get_batches_of_fake_data
+from fake_data_generator.sources_formats.sinks import Sink
+
+TABLE_PROFILE = {
+    'id': {'data_type': 'bigint', 'type': 'UNIQUE', 'method': 'sequence', 'number_of_keys': None,
+           'min_value': 0, 'stride': 1, 'permutation_seed': 0},
+    'amount': {'data_type': 'decimal(10,2)', 'type': 'CONTINUES', 'intervals': [[0, 1000]], 'probabilities': [1.0], 'date_flag': False},
+    'day': {'data_type': 'date', 'type': 'CONTINUES', 'intervals': [[737000, 738000]], 'probabilities': [1.0], 'date_flag': False},
+    'created_at': {'data_type': 'timestamp', 'type': 'CONTINUES', 'intervals': [[1.6e9, 1.7e9]], 'probabilities': [1.0], 'date_flag': False},
+    'category': {'data_type': 'string', 'type': 'CATEGORICAL', 'values': ['a', 'b,c', None], 'probabilities': [0.5, 0.3, 0.2]},
+}
+NUMBER_OF_ROWS = 2500
+
+
+@pytest.fixture
+def profile_path(tmp_path):
+    with open(tmp_path / 'profile.json', 'w') as file:
+        json.dump(TABLE_PROFILE, file)
+    return str(tmp_path / 'profile.json')
+
+
+def get_expected_rows():
+    columns_info = get_columns_info_with_set_generators(TABLE_PROFILE)
+    column_name_to_data_type = {column_info.get_column_name(): column_info.get_data_type() for column_info in columns_info}
+    return [row for batch in get_batches_of_fake_data(NUMBER_OF_ROWS, 400, columns_info, seed=9)
+            for row in batch.get_rows(column_name_to_data_type)]
+
+
+def generate_into_sink(sink, profile_path, **insertion_params):
+    return generate_table_from_profile(sink, profile_path, 'main.t', NUMBER_OF_ROWS, batch_size=400, seed=9, callbacks=[],
+                                       **insertion_params)
+
+
+def read_parquet_file(path):
+    import pyarrow.parquet as pq
+    return pq.read_table(path)
+
+
+def read_arrow_file(path):
+    import pyarrow as pa
+    return pa.ipc.open_file(path).read_all()
+
+
+@pytest.mark.parametrize('sink_class, read_table', [(ParquetSink, read_parquet_file), (ArrowSink, read_arrow_file)])
+def test_arrow_sinks_keep_rows_and_types(tmp_path, profile_path, sink_class, read_table):
+    pa = pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'table')
+    assert generate_into_sink(sink_class(path), profile_path, number_of_writers=2) == NUMBER_OF_ROWS
+    arrow_table = read_table(path)
+    assert arrow_table.schema == pa.schema([('id', pa.int64()), ('amount', pa.decimal128(10, 2)), ('day', pa.date32()),
+                                            ('created_at', pa.timestamp('us')), ('category', pa.string())])
+    rows = sorted(tuple(row.values()) for row in arrow_table.to_pylist())
+    assert isinstance(rows[0][1], Decimal) and isinstance(rows[0][2], date) and isinstance(rows[0][3], datetime)
+    assert [(row[0], float(row[1]), *row[2:]) for row in rows] == get_expected_rows()
+
+
+@pytest.mark.parametrize('compression, open_file', [(None, open), ('gzip', gzip.open)])
+def test_csv_sink_keeps_rows(tmp_path, profile_path, compression, open_file):
+    path = str(tmp_path / 'table.csv')
+    assert generate_into_sink(CsvSink(path, compression=compression), profile_path) == NUMBER_OF_ROWS
+    with open_file(path, 'rt', newline='') as file:
+        header, *rows = list(csv.reader(file))
+    assert header == list(TABLE_PROFILE)
+    expected_rows = get_expected_rows()
+    assert len(rows) == NUMBER_OF_ROWS
+    for row, expected_row in zip(rows, expected_rows):
+        row_id, amount, day, created_at, category = row
+        assert (int(row_id), float(amount), date.fromisoformat(day), category) == \
+            (expected_row[0], expected_row[1], expected_row[2], expected_row[4] or '')
+        assert datetime.fromisoformat(created_at) == expected_row[3]
+
+
+def test_sink_without_write_fails_on_creation(tmp_path):
+    class SinkWithoutWrite(Sink):
+        def open(self):
+            pass
+
+        def close(self):
+            pass
+
+    with pytest.raises(TypeError):
+        SinkWithoutWrite(str(tmp_path / 'table.txt'))
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from pandas import Series
+from fake_data_generator.columns_generator import Column, ColumnProfile, CategoricalColumn, ContinuousColumn, \
+    get_rich_column_info, get_column_profiles, merge_column_profiles
+from fake_data_generator.columns_generator.info_for_columns import get_info_for_categorical_column, get_info_for_string_column
+
+
+def get_column_values(number_of_rows, number_of_distinct_values, null_fraction, seed=0):
+    random_generator = np.random.default_rng(seed)
+    column_values = Series(random_generator.integers(0, number_of_distinct_values, number_of_rows)).astype(object)
+    column_values[random_generator.random(number_of_rows) < null_fraction] = None
+    return column_values
+
+
+def get_merged_profile(column_values, data_type, number_of_parts=4, **profile_params):
+    part_size = -(-len(column_values) // number_of_parts)
+    column_name_to_profile = {}
+    for part_start in range(0, len(column_values), part_size):
+        part_profile = ColumnProfile(data_type, **profile_params)
+        for chunk_start in range(part_start, part_start + part_size, 1000):
+            part_profile.update(column_values.iloc[chunk_start:min(chunk_start + 1000, part_start + part_size)])
+        merge_column_profiles(column_name_to_profile, {'c': part_profile})
+    return column_name_to_profile['c']
+
+
+def test_merged_profile_of_categorical_column_equals_exact_profile():
+    column_values = get_column_values(20000, 50, 0.1)
+    column_profile = get_merged_profile(column_values, 'bigint')
+    assert (column_profile.number_of_rows, column_profile.number_of_nulls) == (20000, column_values.isna().sum())
+    assert column_profile.get_number_of_distinct_values() == 50
+    assert column_profile.has_exact_frequencies()
+    values, probabilities = column_profile.get_info_for_categorical_column()
+    exact_values, exact_probabilities = get_info_for_categorical_column(column_values, 'int')
+    assert dict(zip(values, probabilities)) == pytest.approx(dict(zip(exact_values, exact_probabilities)))
+
+
+def test_truncated_heavy_hitters_keep_probability_of_nulls():
+    column_values = get_column_values(50000, 5000, 0.1)
+    column_profile = get_merged_profile(column_values, 'bigint', max_number_of_heavy_hitters=500)
+    assert not column_profile.has_exact_frequencies()
+    values, probabilities = column_profile.get_info_for_categorical_column()
+    assert len(values) <= 500
+    assert sum(probabilities) == pytest.approx(1.0)
+    assert probabilities[values.index(None)] == pytest.approx(column_values.isna().mean())
+
+
+def test_column_with_truncated_heavy_hitters_is_not_categorical():
+    column_values = get_column_values(50000, 5000, 0.1)
+    column_profile = get_merged_profile(column_values, 'bigint', max_number_of_heavy_hitters=500)
+    assert isinstance(get_rich_column_info(None, Column('c', 'bigint'), column_profile), ContinuousColumn)
+    exact_column_profile = get_merged_profile(column_values, 'bigint')
+    assert isinstance(get_rich_column_info(None, Column('c', 'bigint'), exact_column_profile), CategoricalColumn)
+
+
+def test_merged_profile_of_string_column_equals_exact_profile():
+    random_generator = np.random.default_rng(1)
+    strings = Series([f'{chr(65 + code % 26)}-{code}' for code in random_generator.integers(0, 10 ** 6, 8000)])
+    column_profile = get_column_profiles(({'s': strings.iloc[start:start + 1500]} for start in range(0, 8000, 1500)), {'s': 'string'})['s']
+    common_regex, lengths, length_probabilities = column_profile.get_info_for_string_column()
+    exact_common_regex, exact_lengths, exact_length_probabilities = get_info_for_string_column(strings)
+    assert (common_regex, lengths) == (exact_common_regex, exact_lengths)
+    assert length_probabilities == pytest.approx(exact_length_probabilities)
+
+
+def test_histogram_of_merged_profile_covers_values():
+    float_values = Series(np.random.default_rng(2).normal(100, 10, 30000))
+    column_profile = get_merged_profile(float_values, 'decimal(10,2)')
+    intervals, probabilities = column_profile.get_info_for_continuous_column()
+    assert (intervals[0][0], intervals[-1][1]) == (float_values.min(), float_values.max())
+    assert sum(probabilities) == pytest.approx(1.0)
+    assert len(intervals) <= 100
+    centers = np.array([(start + end) / 2 for start, end in intervals])
+    assert np.dot(centers, probabilities) == pytest.approx(float_values.mean(), rel=0.01)
@@ -0,0 +1,65 @@
+import os
+import json
+import shutil
+import pytest
+from fake_data_generator import generate_table_from_profile
+
+pytest.importorskip('pyspark')
+if shutil.which('java') is None and 'JAVA_HOME' not in os.environ:
+    pytest.skip('Java is not installed', allow_module_level=True)
+
+TABLE_PROFILE = {
+    'id': {'data_type': 'bigint', 'type': 'UNIQUE', 'method': 'permutation', 'number_of_keys': 10 ** 6,
+           'min_value': 2 ** 40, 'stride': 1, 'permutation_seed': 3},
+    'number': {'data_type': 'int', 'type': 'UNIQUE', 'method': 'sequence', 'number_of_keys': None,
+               'min_value': 100, 'stride': 2, 'permutation_seed': 0},
+    'quantity': {'data_type': 'smallint', 'type': 'CONTINUES', 'intervals': [[0, 1000]], 'probabilities': [1.0], 'date_flag': False},
+    'amount': {'data_type': 'decimal(10,2)', 'type': 'CONTINUES', 'intervals': [[0, 1000]], 'probabilities': [1.0], 'date_flag': False},
+    'day': {'data_type': 'date', 'type': 'CONTINUES', 'intervals': [[737000, 738000]], 'probabilities': [1.0], 'date_flag': False},
+    'created_at': {'data_type': 'timestamp', 'type': 'CONTINUES', 'intervals': [[1.6e9, 1.7e9]], 'probabilities': [1.0], 'date_flag': False},
+    'category': {'data_type': 'string', 'type': 'CATEGORICAL', 'values': ['a', 'b', None], 'probabilities': [0.5, 0.3, 0.2]},
+    'code': {'data_type': 'string', 'type': 'STRING', 'common_regex': '[A-Z][0-9][0-9]', 'string_copy_of': None,
+             'lengths': [3], 'length_probabilities': [1.0]},
+}
+
+
+@pytest.fixture(scope='module')
+def spark(tmp_path_factory):
+    from pyspark.sql import SparkSession
+    directory = tmp_path_factory.mktemp('spark')
+    spark = SparkSession.builder.master('local[2]') \
+        .config('spark.sql.warehouse.dir', str(directory / 'warehouse')) \
+        .config('spark.driver.extraJavaOptions', f'-Dderby.system.home={directory}') \
+        .enableHiveSupport().getOrCreate()
+    yield spark
+    spark.stop()
+
+
+@pytest.fixture
+def profile_path(tmp_path):
+    with open(tmp_path / 'profile.json', 'w') as file:
+        json.dump(TABLE_PROFILE, file)
+    return str(tmp_path / 'profile.json')
+
+
+def test_data_generated_on_executors_equals_data_generated_on_driver(spark, profile_path):
+    generate_table_from_profile(spark, profile_path, 'default.on_executors', 4000, batch_size=500, seed=1,
+                                use_spark_executors=True, number_of_partitions=4, callbacks=[])
+    generate_table_from_profile(spark, profile_path, 'default.on_driver', 4000, batch_size=500, seed=1, callbacks=[])
+    on_executors, on_driver = spark.table('default.on_executors'), spark.table('default.on_driver')
+    assert on_executors.schema.simpleString() == on_driver.schema.simpleString() == \
+        'struct<id:bigint,number:int,quantity:smallint,amount:decimal(10,2),day:date,created_at:timestamp,category:string,code:string>'
+    assert sorted(on_executors.collect()) == sorted(on_driver.collect())
+    assert on_executors.filter('category IS NULL').count() > 0
+    assert on_executors.filter("category NOT IN ('a', 'b')").count() == 0
+
+
+def test_unique_keys_are_distinct_across_partitions(spark, profile_path):
+    generate_table_from_profile(spark, profile_path, 'default.unique_keys', 10000, batch_size=700, seed=2,
+                                use_spark_executors=True, number_of_partitions=8, callbacks=[])
+    number_of_rows, number_of_ids, number_of_numbers, min_id, min_number, max_number = \
+        spark.sql('SELECT COUNT(*), COUNT(DISTINCT id), COUNT(DISTINCT number), MIN(id), MIN(number), MAX(number) '
+                  'FROM default.unique_keys').collect()[0]
+    assert number_of_rows == number_of_ids == number_of_numbers == 10000
+    assert min_id >= 2 ** 40
+    assert (min_number, max_number) == (100, 100 + 2 * 9999)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from fake_data_generator.columns_generator.unique_keys import get_unique_keys, get_permuted_indexes
+
+
+@pytest.mark.parametrize('number_of_keys', [1, 2, 7, 1000, 4097])
+def test_permutation_is_bijection_of_range(number_of_keys):
+    permuted_indexes = get_permuted_indexes(np.arange(number_of_keys), number_of_keys, permutation_seed=3)
+    assert sorted(permuted_indexes.tolist()) == list(range(number_of_keys))
+
+
+def test_permuted_keys_are_unique_and_in_range_across_batches_and_offsets():
+    number_of_keys, min_value = 10 ** 5, 2 ** 40
+    keys_by_batches = np.concatenate([get_unique_keys(first_row_index, 700, 'bigint', number_of_keys=number_of_keys,
+                                                      min_value=min_value, permutation_seed=5)
+                                      for first_row_index in range(0, 70000, 700)])
+    assert len(np.unique(keys_by_batches)) == 70000
+    assert keys_by_batches.min() >= min_value and keys_by_batches.max() < min_value + number_of_keys
+    keys_from_offset = get_unique_keys(12345, 1000, 'bigint', number_of_keys=number_of_keys, min_value=min_value, permutation_seed=5)
+    assert keys_from_offset.tolist() == keys_by_batches[12345:13345].tolist()
+    assert get_unique_keys(0, 700, 'bigint', number_of_keys=number_of_keys, min_value=min_value, permutation_seed=6).tolist() != \
+        keys_by_batches[:700].tolist()
+
+
+def test_permuted_keys_of_data_type_range_fit_data_type():
+    keys = np.concatenate([get_unique_keys(first_row_index, 64, 'tinyint', min_value=-128) for first_row_index in range(0, 256, 64)])
+    assert sorted(keys.tolist()) == list(range(-128, 128))
+
+
+def test_exhausted_permutation_keys_raise_error():
+    get_unique_keys(90, 10, 'bigint', number_of_keys=100)
+    with pytest.raises(ValueError, match='All 100 unique keys were used'):
+        get_unique_keys(95, 10, 'bigint', number_of_keys=100)
+    with pytest.raises(ValueError, match='All 128 unique keys were used'):
+        get_unique_keys(100, 50, 'tinyint')
+
+
+def test_keys_of_string_column_are_strings():
+    keys = get_unique_keys(0, 5, 'string', method='sequence', min_value=10, stride=5)
+    assert keys.tolist() == ['10', '15', '20', '25', '30']
+
+
+@pytest.mark.parametrize('data_type, min_value, stride, number_of_keys', [
+    ('bigint', 2 ** 62, 2 ** 60, 4),
+    ('int', 0, 1000, 2147484),
+    ('smallint', 100, -1000, 33),
+    ('tinyint', 0, 1, 128),
+])
+def test_sequence_keys_do_not_overflow_data_type(data_type, min_value, stride, number_of_keys):
+    keys = get_unique_keys(number_of_keys - 1, 1, data_type, method='sequence', min_value=min_value, stride=stride)
+    assert keys.tolist() == [min_value + stride * (number_of_keys - 1)]
+    with pytest.raises(ValueError, match=f'All {number_of_keys} unique keys were used'):
+        get_unique_keys(number_of_keys - 1, 2, data_type, method='sequence', min_value=min_value, stride=stride)
+
+
+def test_sequence_keys_are_limited_by_number_of_keys():
+    assert get_unique_keys(0, 10, 'bigint', method='sequence', number_of_keys=10, stride=3).tolist() == list(range(0, 30, 3))
+    with pytest.raises(ValueError, match='All 10 unique keys were used'):
+        get_unique_keys(5, 10, 'bigint', method='sequence', number_of_keys=10)
+    with pytest.raises(ValueError, match='Stride'):
+        get_unique_keys(0, 10, 'bigint', method='sequence', stride=0)
@@ -0,0 +1,86 @@
+import pytest
+import sqlalchemy
+from fake_data_generator.sources_formats.loaders import Loader
+from fake_data_generator.sources_formats.helper_functions import execute_insertion
+from tests.helpers import get_columns_info, create_table, get_batches, read_table
+
+
+def get_loader_recording_commits(committed_row_offsets):
+    class LoaderRecordingCommits(Loader):
+        def commit_transaction(self):
+            row_offsets = list(self.row_offsets_in_transaction)
+            super().commit_transaction()
+            committed_row_offsets.extend(row_offsets)
+
+    return LoaderRecordingCommits
+
+
+def get_table_names(conn):
+    with conn.connect() as connection:
+        return {row[0] for row in connection.execute(sqlalchemy.text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+
+
+def test_transaction_is_replayed_after_retriable_error(stand_in_engine, stand_in_state):
+    columns_info = get_columns_info()
+    create_table(stand_in_engine, 'main.t')
+    stand_in_state['failing_inserts'] = {3, 4, 8}
+    committed_row_offsets = []
+    with get_loader_recording_commits(committed_row_offsets)(stand_in_engine, 'main.t', columns_info,
+                                                             transaction_size=300, max_retries=2, retry_backoff=0) as loader:
+        for batch in get_batches(columns_info, number_of_rows=1000, batch_size=100):
+            loader.insert(batch)
+    assert committed_row_offsets == list(range(0, 1000, 100))
+    assert [row[0] for row in read_table(stand_in_engine, 'main.t')] == list(range(1000))
+
+
+def test_insertion_fails_after_max_retries(stand_in_engine, stand_in_state):
+    columns_info = get_columns_info()
+    create_table(stand_in_engine, 'main.t')
+    stand_in_state['failing_inserts'] = {2, 3, 4}
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        with Loader(stand_in_engine, 'main.t', columns_info, max_retries=2, retry_backoff=0) as loader:
+            for batch in get_batches(columns_info, number_of_rows=500, batch_size=100):
+                loader.insert(batch)
+    assert [row[0] for row in read_table(stand_in_engine, 'main.t')] == list(range(100))
+
+
+def test_non_retriable_error_is_not_retried(stand_in_engine):
+    columns_info = get_columns_info()
+    with pytest.raises(sqlalchemy.exc.OperationalError, match='no such table'):
+        with Loader(stand_in_engine, 'main.missing', columns_info, max_retries=3, retry_backoff=0) as loader:
+            loader.insert(get_batches(columns_info, number_of_rows=10, batch_size=10)[0])
+
+
+@pytest.mark.parametrize('number_of_writers', [1, 4])
+def test_every_batch_is_committed_once_with_retries(stand_in_engine, stand_in_state, number_of_writers):
+    create_table(stand_in_engine, 'main.t')
+    stand_in_state['failing_inserts'] = {2, 5, 6, 11}
+    committed_row_offsets = []
+    number_of_rows_inserted = execute_insertion(stand_in_engine, 'main.t', 2000, get_columns_info(), 100, seed=3,
+                                                number_of_writers=number_of_writers, transaction_size=200,
+                                                loader=get_loader_recording_commits(committed_row_offsets),
+                                                max_retries=3, retry_backoff=0, callbacks=[])
+    assert number_of_rows_inserted == 2000
+    assert sorted(committed_row_offsets) == list(range(0, 2000, 100))
+    assert [row[0] for row in read_table(stand_in_engine, 'main.t')] == list(range(2000))
+
+
+@pytest.mark.parametrize('use_staging_tables', [False, True])
+def test_several_writers_insert_the_same_rows_as_one_writer(stand_in_engine, use_staging_tables):
+    create_table(stand_in_engine, 'main.one_writer')
+    create_table(stand_in_engine, 'main.several_writers')
+    assert execute_insertion(stand_in_engine, 'main.one_writer', 3000, get_columns_info(), 100, seed=7, callbacks=[]) == 3000
+    assert execute_insertion(stand_in_engine, 'main.several_writers', 3000, get_columns_info(), 100, seed=7,
+                             number_of_writers=4, use_staging_tables=use_staging_tables, callbacks=[]) == 3000
+    assert read_table(stand_in_engine, 'main.several_writers') == read_table(stand_in_engine, 'main.one_writer')
+    assert get_table_names(stand_in_engine) == {'one_writer', 'several_writers'}
+
+
+def test_staging_tables_are_dropped_if_insertion_fails(stand_in_engine, stand_in_state):
+    create_table(stand_in_engine, 'main.t')
+    stand_in_state['failing_inserts'] = {4}
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        execute_insertion(stand_in_engine, 'main.t', 1000, get_columns_info(), 100, seed=7,
+                          number_of_writers=3, use_staging_tables=True, callbacks=[])
+    assert read_table(stand_in_engine, 'main.t') == []
+    assert get_table_names(stand_in_engine) == {'t'}